@@ -8,6 +8,7 @@ setup(
         "numpy",
         "nmrPype",
         "dearpygui",
+        "scipy",
     ],
     entry_points={
         "console_scripts": [
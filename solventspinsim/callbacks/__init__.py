@@ -43,6 +43,7 @@ from .plot import (
     update_simulation_plot,
     zoom_subplots_to_peaks,
 )
+from .scheduler import SimulationScheduler
 
 __all__ = [
     "test_callback",
@@ -83,4 +84,5 @@ __all__ = [
     "set_nmr_plot_values",
     "update_simulation_plot",
     "update_plotting_ui",
+    "SimulationScheduler",
 ]
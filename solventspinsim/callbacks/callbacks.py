@@ -2,12 +2,7 @@ from typing import TYPE_CHECKING
 
 import dearpygui.dearpygui as dpg
 
-from .plot import (
-    fit_axes,
-    update_plotting_ui,
-    update_simulation_plot,
-    zoom_subplots_to_peaks,
-)
+from .plot import update_plotting_ui
 
 if TYPE_CHECKING:
     from typing import Literal
@@ -82,13 +77,7 @@ def set_points_callback(sender, app_data, user_data: "UI") -> None:
     user_data.points = app_data
     if not user_data.current_spin.spin_names:
         return
-    update_simulation_plot(
-        user_data.current_spin,
-        user_data.points,
-        user_data.water_sim,
-        user_data.current_spin.half_height_width,
-        user_data.current_spin._nuclei_number,
-    )
+    user_data.simulation_scheduler.request()
 
 
 def set_field_strength_callback(sender, app_data, user_data: "UI") -> None:
@@ -100,16 +89,8 @@ def set_field_strength_callback(sender, app_data, user_data: "UI") -> None:
         user_data.current_spin._ppm_nuclei_frequencies
     )
 
-    update_simulation_plot(
-        user_data.current_spin,
-        user_data.points,
-        user_data.water_sim,
-        user_data.current_spin.half_height_width,
-        user_data.current_spin._nuclei_number,
-    )
     update_plotting_ui(user_data)
-    zoom_subplots_to_peaks(user_data)
-    fit_axes(user_data.plot_tags["main"])
+    user_data.simulation_scheduler.request(zoom=True, fit=True)
 
 
 def set_intensity_callback(sender, app_data, user_data: "UI") -> None:
@@ -119,15 +100,8 @@ def set_intensity_callback(sender, app_data, user_data: "UI") -> None:
         app_data
     ] * user_data.current_spin._nuclei_number
 
-    update_simulation_plot(
-        user_data.current_spin,
-        user_data.points,
-        user_data.water_sim,
-        user_data.current_spin.half_height_width,
-        user_data.current_spin._nuclei_number,
-    )
     update_plotting_ui(user_data)
-    zoom_subplots_to_peaks(user_data)
+    user_data.simulation_scheduler.request(zoom=True)
 
 
 def set_hhw_callback(sender, app_data, user_data: "UI") -> None:
@@ -135,15 +109,8 @@ def set_hhw_callback(sender, app_data, user_data: "UI") -> None:
         return
     user_data.current_spin.half_height_width = app_data
 
-    update_simulation_plot(
-        user_data.current_spin,
-        user_data.points,
-        user_data.water_sim,
-        user_data.current_spin.half_height_width,
-        user_data.current_spin._nuclei_number,
-    )
     update_plotting_ui(user_data)
-    zoom_subplots_to_peaks(user_data)
+    user_data.simulation_scheduler.request(zoom=True)
 
 
 def set_water_range_callback(
@@ -201,6 +201,7 @@ def _load_nmr(sender, app_data, ui: "UI"):
             ui.water_sim,
             ui.current_spin.half_height_width,
             ui.current_spin._nuclei_number,
+            ui.spectrum_cache,
         )
     set_nmr_plot_values(nmr_array)
 
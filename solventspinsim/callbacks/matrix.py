@@ -8,8 +8,6 @@ from solventspinsim.components import DragFloat, Text, Button
 from .plot import (
     COUPLING_DRAG_HEIGHT,
     update_plotting_ui,
-    update_simulation_plot,
-    zoom_subplots_to_peaks,
 )
 
 if TYPE_CHECKING:
@@ -149,12 +147,5 @@ def modify_matrix(sender, app_data, user_data: "tuple[UI, int, int, float]") ->
 
     f"coupling_drag_l_{i}_{j}"
     spin._couplings[i][j] = value
-    update_simulation_plot(
-        spin,
-        user_data[0].points,
-        user_data[0].water_sim,
-        spin.half_height_width,
-        spin._nuclei_number,
-    )
     update_plotting_ui(user_data[0])
-    zoom_subplots_to_peaks(user_data[0])
+    user_data[0].simulation_scheduler.request(zoom=True)
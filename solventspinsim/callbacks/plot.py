@@ -9,7 +9,7 @@ from solventspinsim.themes import Theme
 if TYPE_CHECKING:
     from typing import Any
 
-    from solventspinsim.simulate import Water
+    from solventspinsim.simulate import SpectrumCache, Water
     from solventspinsim.spin import Spin
     from solventspinsim.ui import UI
 
@@ -151,6 +151,7 @@ def update_plot_callback(sender, app_data, user_data: "UI") -> None:
         ui.water_sim,
         ui.current_spin.half_height_width,
         ui.current_spin._nuclei_number,
+        ui.spectrum_cache,
     )
     fit_axes(ui.plot_tags["main"])
     create_drag_lines(ui)
@@ -269,15 +270,8 @@ def update_drag_item(sender, app_data, user_data: tuple["UI", "str", "tuple"]):
                             (new_value + sign * coupling_value, COUPLING_DRAG_HEIGHT),
                         )
 
-        # Simulate and zoom
-        update_simulation_plot(
-            ui.current_spin,
-            ui.sim_settings.points,
-            ui.water_sim,
-            ui.current_spin.half_height_width,
-            ui.current_spin._nuclei_number,
-        )
-        zoom_subplots_to_peaks(ui)
+        # Simulate and zoom on the next frame
+        ui.simulation_scheduler.request(zoom=True)
 
     elif tag.startswith("coupling_drag_"):
         # Drag point update
@@ -320,15 +314,8 @@ def update_drag_item(sender, app_data, user_data: tuple["UI", "str", "tuple"]):
             nuclei_tag = f"nuclei_{p}_{ui.current_spin.spin_names[i]}"
             if dpg.does_item_exist(nuclei_tag):
                 dpg.set_value(nuclei_tag, nuclei_value)
-        # Simulate and zoom
-        update_simulation_plot(
-            ui.current_spin,
-            ui.sim_settings.points,
-            ui.water_sim,
-            ui.current_spin.half_height_width,
-            ui.current_spin._nuclei_number,
-        )
-        zoom_subplots_to_peaks(ui)
+        # Simulate and zoom on the next frame
+        ui.simulation_scheduler.request(zoom=True)
 
 
 def fit_axes(plot_dict: dict) -> None:
@@ -399,16 +386,22 @@ def update_simulation_plot(
     water: "Water",
     hhw: list[float | int] | float | int,
     peak_count: int,
+    cache: "SpectrumCache | None" = None,
 ) -> None:
     from solventspinsim.simulate import simulate_peaklist
 
     """
     Simulates the spectrum and updates the plot for the given UI object.    
+    With a `cache`, only the nuclei whose lines changed since its last call are
+    simulated again.
     """
     if not spin._spin_names:
         return
 
-    simulation = simulate_peaklist(spin.peaklist(), points, hhw)
+    if cache is not None:
+        simulation = cache.simulate(spin.peaklist(), points, hhw)
+    else:
+        simulation = simulate_peaklist(spin.peaklist(), points, hhw)
     if water.water_enable:
         from solventspinsim.graphics import WaterSettings
 
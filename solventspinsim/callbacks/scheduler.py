@@ -0,0 +1,93 @@
+from typing import TYPE_CHECKING
+
+from .plot import fit_axes, update_simulation_plot, zoom_subplots_to_peaks
+
+if TYPE_CHECKING:
+    from solventspinsim.ui import UI
+
+
+class SimulationScheduler:
+    """
+    Coalesces the simulation requests of GUI callbacks into at most one simulation
+    per frame. Callbacks only update the spin state and call `request`, and the
+    render loop calls `run_pending` once per frame, which simulates the state the
+    UI holds at that moment. Bursts of events, such as the dozens a drag fires per
+    second, therefore cost one simulation per frame and always display the latest
+    state.
+
+    Attributes
+    ----------
+    pending : bool
+        Whether a simulation has been requested since the last run
+    zoom : bool
+        Whether the pending run also zooms the subplots to their peaks
+    fit : bool
+        Whether the pending run also fits the main plot axes to the data
+    requests : int
+        Number of requests received
+    runs : int
+        Number of simulations run
+    """
+
+    def __init__(self) -> None:
+        self.pending: bool = False
+        self.zoom: bool = False
+        self.fit: bool = False
+        self.requests: int = 0
+        self.runs: int = 0
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def request(self, zoom: bool = False, fit: bool = False) -> None:
+        """
+        Schedules a simulation of the current state for the next frame
+
+        Parameters
+        ----------
+        zoom : bool, optional
+            Zoom the subplots to their peaks after simulating, by default False
+        fit : bool, optional
+            Fit the main plot axes to the data after simulating, by default False
+        """
+        self.pending = True
+        self.zoom = self.zoom or zoom
+        self.fit = self.fit or fit
+        self.requests += 1
+
+    def run_pending(self, ui: "UI") -> bool:
+        """
+        Runs the pending simulation, called from the render loop once per frame
+
+        Parameters
+        ----------
+        ui : UI
+            UI holding the state to simulate
+
+        Returns
+        -------
+        bool
+            True if a simulation was run
+        """
+        if not self.pending:
+            return False
+        zoom, fit = self.zoom, self.fit
+        self.pending = self.zoom = self.fit = False
+        if not ui.current_spin.spin_names:
+            return False
+
+        update_simulation_plot(
+            ui.current_spin,
+            ui.points,
+            ui.water_sim,
+            ui.current_spin.half_height_width,
+            ui.current_spin._nuclei_number,
+            ui.spectrum_cache,
+        )
+        if zoom:
+            zoom_subplots_to_peaks(ui)
+        if fit:
+            fit_axes(ui.plot_tags["main"])
+        self.runs += 1
+        return True
@@ -1,3 +1,5 @@
+from sys import stderr
+
 from nmrPype import DataFrame, write_to_file
 from numpy import array as nparray
 
@@ -12,6 +14,8 @@ class CommandLine:
         self.settings: Settings = settings
         self.spin = Spin()
         self.water = Water()
+        # (RMSE, spin, water) of every refined start of the last fit, best first
+        self.ranked: list[tuple[float, Spin, Water | None]] = []
 
     def run(self) -> None:
         from solventspinsim.simulate import simulate_peaklist
@@ -92,6 +96,10 @@ class CommandLine:
         )
 
         coupling_strength = spin_dict["coupling_strength"]
+        coupling_tolerance: float = spin_dict.get("coupling_tolerance", 0.0)
+        equivalent_groups: list[list[int]] | str | None = spin_dict.get(
+            "equivalent_groups", None
+        )
 
         self.spin = Spin(
             spin_names,
@@ -101,6 +109,8 @@ class CommandLine:
             field_strength,
             intensities,
             coupling_strength,
+            coupling_tolerance,
+            equivalent_groups,
         )
 
     def _set_water(self) -> None:
@@ -114,24 +124,68 @@ class CommandLine:
 
     def _optimize(self) -> Spin | tuple[Spin, Water]:
         from solventspinsim.optimize import optimize_simulation
+        from solventspinsim.optimize.checkpoint import open_checkpoint
+        from solventspinsim.optimize.telemetry import Telemetry, print_progress
 
         nmr_file: str = self.settings["nmr_file"]
         opt_settings: dict = self.settings["opt_settings"]
 
         self._set_spin()
         self._set_water()
+        self.ranked.clear()
 
         water_range: tuple[float, float] = (
             opt_settings["water_left"],
             opt_settings["water_right"],
         )
+        method: str = opt_settings.get("method", "lbfgsb")
+        workers: int = opt_settings.get("workers", 1)
+        decomposition: str = opt_settings.get("decomposition", "quadrants")
+        levels: int = opt_settings.get("levels", 1)
+        starts: int = opt_settings.get("starts", 1)
+        seed: int | None = opt_settings.get("seed", None)
+        telemetry = Telemetry(
+            opt_settings.get("telemetry_rate", 10.0), [print_progress]
+        )
+        resume: bool = opt_settings.get("resume", False)
+        checkpoint = open_checkpoint(opt_settings.get("checkpoint", None), resume)
 
         if self.water.water_enable:
             optimizations: Spin | tuple[Spin, Water] = optimize_simulation(
-                nmr_file, self.spin, water_range, self.water
+                nmr_file,
+                self.spin,
+                water_range,
+                self.water,
+                method,
+                workers,
+                decomposition,
+                levels,
+                starts,
+                seed,
+                telemetry,
+                checkpoint,
+                resume,
+                self.ranked,
             )
         else:
-            optimizations = optimize_simulation(nmr_file, self.spin, water_range, None)
+            optimizations = optimize_simulation(
+                nmr_file,
+                self.spin,
+                water_range,
+                None,
+                method,
+                workers,
+                decomposition,
+                levels,
+                starts,
+                seed,
+                telemetry,
+                checkpoint,
+                resume,
+                self.ranked,
+            )
+        # Ends the progress line
+        print(file=stderr)
 
         return optimizations
 
@@ -4,7 +4,7 @@ import dearpygui.dearpygui as dpg
 
 from solventspinsim.callbacks import set_water_range_callback
 from solventspinsim.graphics import Graphic
-from solventspinsim.optimize import optimize_callback
+from solventspinsim.optimize import cancel_optimization_callback, optimize_callback
 from solventspinsim.components import Button, DragFloat
 
 if TYPE_CHECKING:
@@ -22,11 +22,29 @@ class OptimizationSettings(Graphic):
         is_enabled: bool = False,
         water_left: float = 0.0,
         water_right: float = 100.0,
+        method: str = "lbfgsb",
+        workers: int = 1,
+        decomposition: str = "quadrants",
+        levels: int = 1,
+        starts: int = 1,
+        seed: int | None = None,
+        telemetry_rate: float = 10.0,
+        checkpoint: str | None = None,
+        resume: bool = False,
     ) -> None:
         self.params = {
             OptimizationSettings.water_left_tag: water_left,
             OptimizationSettings.water_right_tag: water_right,
         }
+        self.method: str = method
+        self.workers: int = workers
+        self.decomposition: str = decomposition
+        self.levels: int = levels
+        self.starts: int = starts
+        self.seed: int | None = seed
+        self.telemetry_rate: float = telemetry_rate
+        self.checkpoint: str | None = checkpoint
+        self.resume: bool = resume
 
         super().__init__(ui, parent, is_enabled)
 
@@ -83,6 +101,14 @@ class OptimizationSettings(Graphic):
             parent=self.parent,
         )
 
+        self.ui.buttons["cancel_optimization"] = Button(
+            label="Cancel Optimization",
+            callback=cancel_optimization_callback,
+            user_data=self.ui,
+            enabled=False,
+            parent=self.parent,
+        )
+
         if self.is_enabled:
             self.enable()
         else:
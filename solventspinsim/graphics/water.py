@@ -13,11 +13,7 @@ if TYPE_CHECKING:
 def set_ui_water_callback(
     sender, app_data, user_data: "tuple[UI, str, WaterSettings]"
 ) -> None:
-    from solventspinsim.callbacks import (
-        update_plotting_ui,
-        update_simulation_plot,
-        zoom_subplots_to_peaks,
-    )
+    from solventspinsim.callbacks import update_plotting_ui
 
     ui = user_data[0]
     attribute = user_data[1]
@@ -32,15 +28,8 @@ def set_ui_water_callback(
         pass
     setattr(ui.water_sim, attribute, app_data)
 
-    update_simulation_plot(
-        ui.current_spin,
-        ui.points,
-        ui.water_sim,
-        ui.current_spin.half_height_width,
-        ui.current_spin._nuclei_number,
-    )
     update_plotting_ui(ui)
-    zoom_subplots_to_peaks(ui)
+    ui.simulation_scheduler.request(zoom=True)
 
 
 class WaterSettings(Graphic):
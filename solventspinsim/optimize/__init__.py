@@ -1,4 +1,16 @@
-from .optimize import optimize_simulation
-from .callback import optimize_callback
+from .optimize import fit_simulation, optimize_simulation
+from .callback import (
+    cancel_optimization_callback,
+    optimize_callback,
+    poll_optimization,
+    stop_optimization,
+)
 
-__all__ = ["optimize_callback", "optimize_simulation"]
+__all__ = [
+    "cancel_optimization_callback",
+    "fit_simulation",
+    "optimize_callback",
+    "optimize_simulation",
+    "poll_optimization",
+    "stop_optimization",
+]
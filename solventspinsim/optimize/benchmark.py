@@ -0,0 +1,103 @@
+"""
+Per-evaluation cost of the section_optimization objective on a synthetic chain of
+coupled nuclei, comparing the previous objective (a new `Spin` and list conversions
+at every call) with the prepared `QuadrantObjective`.
+
+Run with ``python -m solventspinsim.optimize.benchmark``.
+"""
+
+import argparse
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from solventspinsim.simulate import simulate_peaklist
+from solventspinsim.spin import Spin
+
+from .helper import ParameterPacker
+from .objective import QuadrantObjective
+
+
+def chain_spin(nuclei: int, coupling_tolerance: float = 0.0) -> Spin:
+    """Returns a weakly coupled chain of `nuclei` nuclei with 7 Hz neighbour couplings."""
+    couplings = np.zeros((nuclei, nuclei))
+    neighbours = np.arange(nuclei - 1)
+    couplings[neighbours, neighbours + 1] = 7.0
+    couplings[neighbours + 1, neighbours] = 7.0
+    return Spin(
+        [f"H{i}" for i in range(nuclei)],
+        list(np.linspace(1.0, 4.5, nuclei)),
+        couplings,
+        1.0,
+        100,
+        coupling_tolerance=coupling_tolerance,
+    )
+
+
+def legacy_objective(
+    spin: Spin, packer: ParameterPacker, x: np.ndarray, y: np.ndarray
+) -> Callable[[np.ndarray], float]:
+    """Returns the objective as evaluated before `QuadrantObjective`."""
+
+    def objective(params: np.ndarray) -> float:
+        couplings, intensities, hhw, _ = packer.unpack(params)
+        new_spin = Spin(
+            spin.spin_names,
+            list(spin._ppm_nuclei_frequencies),
+            couplings,
+            list(hhw),
+            spin.field_strength,
+            coupling_tolerance=spin.coupling_tolerance,
+        )
+        simulation = simulate_peaklist(
+            new_spin.peaklist(list(intensities)), len(x), list(hhw), (x[0], x[-1])
+        )
+        return float(np.sqrt(np.mean((simulation[1] - y) ** 2)))
+
+    return objective
+
+
+def time_per_call(function: Callable, params: np.ndarray, repeats: int) -> float:
+    """Returns the mean wall time (in seconds) of one call of `function`."""
+    function(params)
+    start = perf_counter()
+    for _ in range(repeats):
+        function(params)
+    return (perf_counter() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nuclei", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'nuclei':>6} {'path':>8} {'legacy':>10} {'prepared':>10} {'speedup':>8}")
+    for nuclei in args.nuclei:
+        # A nonzero tolerance selects the general peaklist path
+        for path, tolerance in (("weak", 0.0), ("general", 1e-9)):
+            spin = chain_spin(nuclei, tolerance)
+            packer = ParameterPacker(spin)
+            params = packer.pack(
+                spin._couplings, [1.0] * nuclei, spin.half_height_width
+            )
+            hz = np.asarray(spin._nuclei_frequencies)
+            x = np.linspace(hz.min() - 20, hz.max() + 20, args.points)
+            y = np.zeros(args.points)
+
+            legacy = time_per_call(
+                legacy_objective(spin, packer, x, y), params, args.repeats
+            )
+            prepared = time_per_call(
+                QuadrantObjective(spin, packer, x, y), params, args.repeats
+            )
+            print(
+                f"{nuclei:>6} {path:>8} {legacy * 1e6:>8.1f}us "
+                f"{prepared * 1e6:>8.1f}us {legacy / prepared:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
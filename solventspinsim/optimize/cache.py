@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Default number of evaluations kept by an EvaluationCache
+EVALUATION_CACHE_SIZE: int = 64
+
+# Decimals parameter vectors are rounded to in cache keys. Finite-difference steps of
+# scipy (at least 1e-8) stay far above the rounding, so probes never alias their center
+EVALUATION_CACHE_DECIMALS: int = 9
+
+
+class EvaluationCache:
+    """
+    Bounded least-recently-used store of objective evaluations shared by the
+    objectives of one fit. Keys identify the fit region and the parameter vector
+    rounded to EVALUATION_CACHE_DECIMALS, so repeated evaluations of the same point of
+    the same region, such as the start of a window that did not change since the
+    previous sweep or the tiny steps of a converging line search, skip the
+    simulation entirely.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of stored evaluations
+    hits, misses : int
+        Number of lookups that found or did not find an evaluation
+    """
+
+    def __init__(self, maxsize: int = EVALUATION_CACHE_SIZE) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be at least 1, got {maxsize}")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found an evaluation"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the evaluation stored under `key`, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: Hashable) -> Any:
+        """Returns the evaluation stored under `key`, or None, without counting it."""
+        return self._entries.get(key)
+
+    def put(self, key: Hashable, entry: Any) -> None:
+        """Stores an evaluation, evicting the least recently used one when full."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every stored evaluation and resets the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def summary(self) -> str:
+        """Returns the hit and miss statistics as one line."""
+        return (
+            f"Objective cache: {self.hits} hits, {self.misses} misses "
+            f"({100 * self.hit_rate:.1f}% hit rate), "
+            f"{len(self._entries)}/{self.maxsize} entries"
+        )
+
+    # ---------------------------------------------------------------------------- #
+    #                                 Magic Methods                                #
+    # ---------------------------------------------------------------------------- #
+
+    def __len__(self) -> int:
+        return len(self._entries)
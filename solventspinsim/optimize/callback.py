@@ -1,3 +1,4 @@
+from copy import deepcopy
 from sys import stderr
 from typing import TYPE_CHECKING
 
@@ -10,13 +11,20 @@ from solventspinsim.callbacks import (
 )
 from solventspinsim.spin import Spin, loadSpinFromFile
 
-from .optimize import optimize_simulation
+from .checkpoint import open_checkpoint
+from .display import _clear_regions, _optimization_ui, _show_snapshot
+from .optimize import fit_simulation
+from .telemetry import Telemetry
+from .worker import OptimizationWorker
 
 if TYPE_CHECKING:
     from solventspinsim.ui import UI
 
 
 def optimize_callback(sender, app_data, user_data: "UI"):
+    if user_data.optimization_worker is not None:
+        print("Failed to Optimize! An optimization is already running", file=stderr)
+        return
     if not hasattr(user_data, "spin_file") or not user_data.spin_file:
         print("Failed to Optimize! Missing Requirement: spin_file", file=stderr)
         return
@@ -47,7 +55,8 @@ def optimize_callback(sender, app_data, user_data: "UI"):
         dpg.hide_item("water_drag_right")
 
     if user_data.sim_settings["use_settings"]:
-        initial_spin = user_data.current_spin
+        # The fit reads the spin on its own thread while the GUI may edit it
+        initial_spin = deepcopy(user_data.current_spin)
     else:
         spin_names, nuclei_frequencies, couplings = loadSpinFromFile(spin_matrix_file)
         initial_spin = Spin(
@@ -58,31 +67,128 @@ def optimize_callback(sender, app_data, user_data: "UI"):
             field_strength=field_strength,
         )
 
-    if user_data.water_sim.water_enable:
-        optimizations = optimize_simulation(
-            nmr_file, initial_spin, water_range, user_data.water_sim
-        )
-    else:
-        optimizations = optimize_simulation(nmr_file, initial_spin, water_range, None)
+    water = user_data.water_sim
+    worker = OptimizationWorker(
+        fit_simulation,
+        nmr_file,
+        initial_spin,
+        water_range,
+        (water.frequency, water.intensity, water.hhw) if water.water_enable else None,
+        user_data.opt_settings.method,
+        user_data.opt_settings.workers,
+        user_data.opt_settings.decomposition,
+        user_data.opt_settings.levels,
+        user_data.opt_settings.starts,
+        user_data.opt_settings.seed,
+        checkpoint=open_checkpoint(
+            user_data.opt_settings.checkpoint, user_data.opt_settings.resume
+        ),
+        resume=user_data.opt_settings.resume,
+        telemetry=Telemetry(user_data.opt_settings.telemetry_rate),
+    )
+    _optimization_ui(initial_spin)
+    _set_optimizing(user_data, True)
+    user_data.optimization_worker = worker
+    worker.start()
+
+
+def cancel_optimization_callback(sender, app_data, user_data: "UI"):
+    worker = user_data.optimization_worker
+    if worker is not None:
+        worker.cancel()
+
+
+def poll_optimization(ui: "UI") -> None:
+    """
+    Applies the messages posted by the running optimization worker, called from the
+    render loop once per frame. Only the latest progress snapshot is drawn.
+    """
+    worker = ui.optimization_worker
+    if worker is None:
+        return
+
+    snapshot = None
+    for kind, value in worker.drain():
+        match kind:
+            case "progress":
+                snapshot = value
+            case "done":
+                _clear_regions()
+                _apply_optimization(ui, value)
+                _finish_optimization(ui)
+                return
+            case "cancelled":
+                print("Optimization Cancelled!", file=stderr)
+                _clear_regions()
+                _finish_optimization(ui)
+                return
+            case "error":
+                print(f"Optimization Failed! {value}", file=stderr)
+                _clear_regions()
+                _finish_optimization(ui)
+                return
+    if snapshot is not None:
+        _show_snapshot(snapshot)
+
 
-    if isinstance(optimizations, Spin):
-        optimized_spin = optimizations
-        optimized_water = user_data.water_sim
+def stop_optimization(ui: "UI", timeout: float | None = None) -> None:
+    """Cancels the running optimization and waits up to `timeout` seconds for it."""
+    worker = ui.optimization_worker
+    if worker is not None:
+        worker.cancel()
+        worker.join(timeout)
+        ui.optimization_worker = None
+
+
+# ---------------------------------------------------------------------------- #
+#                               Helper Functions                               #
+# ---------------------------------------------------------------------------- #
+
+
+def _apply_optimization(
+    ui: "UI", optimizations: tuple[Spin, tuple[float, float, float] | None]
+) -> None:
+    from solventspinsim.simulate import Water
+
+    # Water is built here, on the render thread, since its setters update the GUI
+    optimized_spin, water = optimizations
+    if water is None:
+        optimized_water = ui.water_sim
     else:
-        optimized_spin = optimizations[0]
-        optimized_water = optimizations[1]
+        optimized_water = Water(*water, True)
 
-    setattr(user_data, "spin", optimized_spin)
-    setattr(user_data, "water_sim", optimized_water)
+    setattr(ui, "spin", optimized_spin)
+    setattr(ui, "water_sim", optimized_water)
 
     update_simulation_plot(
         optimized_spin,
-        user_data.points,
+        ui.points,
         optimized_water,
         optimized_spin.half_height_width,
         optimized_spin._nuclei_number,
+        ui.spectrum_cache,
     )
-    update_plotting_ui(user_data)
-    zoom_subplots_to_peaks(user_data)
+    update_plotting_ui(ui)
+    zoom_subplots_to_peaks(ui)
 
     dpg.enable_item("opt_save")
+
+
+def _finish_optimization(ui: "UI") -> None:
+    ui.optimization_worker = None
+    _set_optimizing(ui, False)
+
+
+def _set_optimizing(ui: "UI", optimizing: bool) -> None:
+    optimize_button = ui.buttons.get("optimize", None)
+    cancel_button = ui.buttons.get("cancel_optimization", None)
+    if optimizing:
+        if optimize_button is not None:
+            optimize_button.disable()
+        if cancel_button is not None:
+            cancel_button.enable()
+    else:
+        if optimize_button is not None:
+            optimize_button.enable()
+        if cancel_button is not None:
+            cancel_button.disable()
@@ -0,0 +1,185 @@
+import hashlib
+import os
+from sys import stderr
+
+import numpy as np
+
+# File a resumed fit reads when no checkpoint file is given
+CHECKPOINT_FILE: str = "checkpoint.npz"
+
+
+class Checkpoint:
+    """
+    State of a fit saved to a compact .npz file after every completed region, window
+    sweep and resolution level, so that an interrupted fit can resume from the last
+    completed step instead of starting over. The file is replaced atomically, and
+    always holds a consistent state even when the process is killed while saving.
+    It is removed once the fit completes, and its signature identifies the data and
+    starting parameters of the fit, so a resumed fit never returns a stale result.
+
+    Attributes
+    ----------
+    path : str
+        Path of the checkpoint file
+    signature : str
+        Description of the fit the state belongs to, a resumed file must match it
+    level : int
+        Index of the resolution level in progress
+    regions : list[np.ndarray]
+        Packed parameters fitted to each completed quadrant of the level in progress
+    sweep : int
+        Number of completed window sweeps of the level in progress
+    params : np.ndarray | None
+        Packed parameters the next fit starts from
+    cost : float
+        RMSE of the latest completed fit over its region
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.signature: str = ""
+        self.level: int = 0
+        self.regions: list[np.ndarray] = []
+        self.sweep: int = 0
+        self.params: np.ndarray | None = None
+        self.cost: float = np.nan
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def reset(self) -> None:
+        """Forgets the saved state, so that the next fit starts from its beginning."""
+        self.level = 0
+        self.regions = []
+        self.sweep = 0
+        self.params = None
+        self.cost = np.nan
+
+    def finish(self) -> None:
+        """
+        Removes the checkpoint file of a completed fit and resets the state, so that
+        resuming never returns the result of a fit that has already finished.
+        """
+        self.reset()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def load(self, signature: str) -> bool:
+        """
+        Reads the saved state of the fit described by `signature`.
+
+        Parameters
+        ----------
+        signature : str
+            Description of the fit to resume, see `fit_signature`
+
+        Returns
+        -------
+        bool
+            True if a state was read, False if the file does not exist yet
+        """
+        self.signature = signature
+        if not os.path.exists(self.path):
+            return False
+        with np.load(self.path) as state:
+            if str(state["signature"]) != signature:
+                raise ValueError(
+                    f"Checkpoint '{self.path}' belongs to a different fit "
+                    f"({state['signature']}), expected {signature}"
+                )
+            self.level = int(state["level"])
+            self.regions = list(state["regions"])
+            self.sweep = int(state["sweep"])
+            self.params = state["params"]
+            self.cost = float(state["cost"])
+        print(
+            f"Resuming from '{self.path}': level {self.level + 1}, "
+            f"{len(self.regions)} regions, {self.sweep} sweeps, RMSE {self.cost:.6g}",
+            file=stderr,
+        )
+        return True
+
+    def save(
+        self,
+        params: np.ndarray,
+        cost: float,
+        regions: list[np.ndarray] | None = None,
+        sweep: int = 0,
+        level: int | None = None,
+    ) -> None:
+        """
+        Records and writes the state reached after a completed step.
+
+        Parameters
+        ----------
+        params : np.ndarray
+            Packed parameters the next fit starts from
+        cost : float
+            RMSE of the completed fit over its region
+        regions : list[np.ndarray] | None, optional
+            Completed quadrant fits of the level, by default None
+        sweep : int, optional
+            Completed window sweeps of the level, by default 0
+        level : int | None, optional
+            Level in progress, by default the current one
+        """
+        self.params = np.array(params, dtype=np.float64)
+        self.cost = float(cost)
+        self.regions = list(regions) if regions is not None else []
+        self.sweep = sweep
+        if level is not None:
+            self.level = level
+
+        # Written next to the target and renamed over it, so that the file is never
+        # left half-written
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as file:
+            np.savez(
+                file,
+                signature=np.array(self.signature),
+                level=self.level,
+                regions=np.array(self.regions, dtype=np.float64).reshape(
+                    len(self.regions), len(self.params)
+                ),
+                sweep=self.sweep,
+                params=self.params,
+                cost=self.cost,
+            )
+        os.replace(temporary, self.path)
+
+
+def open_checkpoint(path: str | None, resume: bool = False) -> Checkpoint | None:
+    """
+    Returns the checkpoint of the `checkpoint` and `resume` optimization settings:
+    one at `path`, or at CHECKPOINT_FILE when resuming without a path, and None when
+    the fit is not checkpointed.
+    """
+    if resume and not path:
+        path = CHECKPOINT_FILE
+    return Checkpoint(path) if path else None
+
+
+def fit_signature(
+    nmr_array: np.ndarray,
+    frequencies: np.ndarray,
+    init_params: np.ndarray,
+    water_range: tuple[float, float],
+    method: str,
+    decomposition: str,
+    levels: int,
+) -> str:
+    """
+    Returns the signature identifying a fit: its settings and a digest of the data,
+    the nuclei frequencies and the starting parameters (which hold the couplings,
+    intensities, widths and water peak), so that a checkpoint is only resumed by the
+    fit that saved it.
+    """
+    digest = hashlib.sha1()
+    for values in (nmr_array, frequencies, init_params):
+        digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return (
+        f"{np.shape(nmr_array)[-1]} points, {len(init_params)} parameters, "
+        f"water range {tuple(water_range)}, {method}, {decomposition}, "
+        f"{levels} levels, data {digest.hexdigest()}"
+    )
@@ -4,6 +4,8 @@ from solventspinsim.callbacks import show_item_callback
 from solventspinsim.spin import Spin
 from solventspinsim.themes import Theme
 
+from .telemetry import OptimizationSnapshot
+
 
 def _optimization_ui(spin: Spin):
     if not dpg.does_item_exist("opt_window"):
@@ -68,10 +70,6 @@ def _optimization_ui(spin: Spin):
 
             dpg.add_text(default_value="Water Half-Height Width", tag="opt_whhw")
 
-            dpg.add_text(default_value="Spectral Width", tag="opt_sw")
-
-            dpg.add_text(default_value="Observation Frequency", tag="opt_obs")
-
             dpg.add_text("Half-Height Width:", tag="opt_hhw_title")
             with dpg.table(
                 tag="opt_hhw_table",
@@ -112,15 +110,13 @@ def _optimization_ui(spin: Spin):
 
 
 def _update_optimization_ui(
-    matrix_shape, couplings, intensities, spec_width, hhw, real_x, real_y, sim_y
+    matrix_shape, couplings, intensities, hhw, real_x, real_y, sim_y
 ):
     for i in range(matrix_shape[0]):
         for j in range(matrix_shape[1]):
             dpg.set_value(f"opt_coupling_{i}_{j}", f"{couplings[i][j]}")
     for i in range(matrix_shape[0]):
         dpg.set_value(f"opt_intensities_{i}", f"{intensities[i]}")
-    dpg.set_value("opt_sw", f"Spectral Width: {spec_width:.03f}")
-    dpg.set_value("opt_obs", f"Observation Frequency: {spec_width:.03f}")
     for i in range(matrix_shape[0]):
         dpg.set_value(f"opt_hhw_{i}", f"{hhw[i]}")
 
@@ -149,3 +145,44 @@ def _update_optimization_ui(
         dpg.set_value("real_opt_series", [real_x, real_y])
 
     dpg.fit_axis_data("opt_x_axis")
+
+
+def _show_snapshot(snapshot: OptimizationSnapshot) -> None:
+    if dpg.does_item_exist("main_x_axis"):
+        _clear_regions()
+        dpg.add_inf_line_series(
+            snapshot.x[0],
+            label="Region Start",
+            parent="main_x_axis",
+            tag="region_line_left",
+        )
+        dpg.add_inf_line_series(
+            snapshot.x[-1],
+            label="Region End",
+            parent="main_x_axis",
+            tag="region_line_right",
+        )
+        dpg.bind_item_theme("region_line_left", Theme.region_plot_theme())
+        dpg.bind_item_theme("region_line_right", Theme.region_plot_theme())
+
+    if snapshot.water is not None:
+        water_freq, water_intensity, water_hhw = snapshot.water
+        dpg.set_value("opt_wf", f"Water Frequency {water_freq}")
+        dpg.set_value("opt_wi", f"Water Intensity: {water_intensity}")
+        dpg.set_value("opt_whhw", f"Water Half-Height Width: {water_hhw}")
+    _update_optimization_ui(
+        snapshot.couplings.shape,
+        snapshot.couplings,
+        snapshot.intensities,
+        snapshot.hhw,
+        list(snapshot.x),
+        list(snapshot.y),
+        list(snapshot.simulation),
+    )
+
+
+def _clear_regions() -> None:
+    if dpg.does_item_exist("region_line_left"):
+        dpg.delete_item("region_line_left")
+    if dpg.does_item_exist("region_line_right"):
+        dpg.delete_item("region_line_right")
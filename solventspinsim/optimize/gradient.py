@@ -0,0 +1,259 @@
+from math import comb
+
+import numpy as np
+from scipy.sparse import csr_array
+
+from solventspinsim.simulate.simulate import (
+    LORENTZ_MEMORY_BUDGET,
+    simulate_lorentzians_batched,
+)
+from solventspinsim.spin import Spin
+
+from .helper import ParameterPacker
+from .solvent import SolventModel
+
+
+class WeakLineModel:
+    """
+    First-order line model of a weakly coupled spin system expressed directly in the
+    packed optimizer parameters, with exact derivatives. Every line of a multiplet is
+    kept separately (no merging), so each line position is linear in the couplings,
+    each line intensity is linear in its group intensity, and each line width is its
+    group half-height width. The line structure only depends on which couplings are
+    packed, so it is built once and reused for every evaluation, and the line arrays
+    are preallocated and overwritten by each evaluation. The water peak, when packed,
+    is added by a `SolventModel`.
+
+    Attributes
+    ----------
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    broadening : float
+        Width (in Hz) added to every half-height width, including the water width
+    solvent : SolventModel | None
+        Model of the water peak, None when water is not packed
+    line_group : np.ndarray
+        Group of equivalent nuclei each line belongs to
+    line_weight : np.ndarray
+        Fraction of its group intensity carried by each line
+    """
+
+    def __init__(
+        self, spin: Spin, packer: ParameterPacker, broadening: float = 0.0
+    ) -> None:
+        self.packer: ParameterPacker = packer
+        self.broadening: float = broadening
+        sizes = np.array([len(group) for group in packer.groups])
+        representatives = [group[0] for group in packer.groups]
+        self._frequencies: np.ndarray = np.asarray(
+            spin._nuclei_frequencies, dtype=np.float64
+        )[representatives]
+        self._sizes: np.ndarray = sizes
+
+        n_couplings = packer.couplings.stop - packer.couplings.start
+        group_i, group_j = packer.coupling_groups
+        line_group, line_weight, coefficients = [], [], []
+        for g in range(len(packer.groups)):
+            offsets = np.zeros((1, n_couplings))
+            weights = np.ones(1)
+            for p in np.flatnonzero((group_i == g) | (group_j == g)):
+                count = sizes[group_j[p] if group_i[p] == g else group_i[p]]
+                # A coupling to n equivalent nuclei splits each line into n + 1 lines
+                splits = np.array([comb(count, m) for m in range(count + 1)])
+                offsets = np.repeat(offsets, count + 1, axis=0)
+                offsets[:, p] = np.tile(np.arange(count + 1) - count / 2, len(weights))
+                weights = np.outer(weights, splits / 2.0**count).ravel()
+            line_group.append(np.full(len(weights), g))
+            line_weight.append(weights)
+            coefficients.append(offsets)
+        self.line_group: np.ndarray = np.concatenate(line_group)
+        self.line_weight: np.ndarray = np.concatenate(line_weight)
+        # d(line position) / d(packed coupling)
+        self._coefficients: csr_array = csr_array(np.concatenate(coefficients))
+        self._line_frequencies: np.ndarray = self._frequencies[self.line_group]
+        self._line_scale: np.ndarray = self._sizes[self.line_group] * self.line_weight
+
+        self.solvent: SolventModel | None = (
+            SolventModel(broadening=broadening) if packer.simulate_water else None
+        )
+
+        n_lines = len(self.line_group)
+        self._centers: np.ndarray = np.empty(n_lines)
+        self._intensities: np.ndarray = np.empty(n_lines)
+        self._widths: np.ndarray = np.empty(n_lines)
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def lines(self, params: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the center, intensity and half-height width of every line of the spin
+        system. The arrays are reused by the next call.
+
+        Parameters
+        ----------
+        params : np.ndarray
+            Packed parameter vector
+
+        Returns
+        -------
+        centers : np.ndarray
+            Line positions (in Hz)
+        intensities : np.ndarray
+            Line intensities
+        widths : np.ndarray
+            Line half-height widths (in Hz)
+        """
+        packer = self.packer
+        params = np.asarray(params, dtype=np.float64)
+        centers, intensities, widths = self._centers, self._intensities, self._widths
+        np.add(
+            self._line_frequencies,
+            self._coefficients @ params[packer.couplings],
+            out=centers,
+        )
+        np.take(params[packer.intensities], self.line_group, out=intensities)
+        intensities *= self._line_scale
+        np.take(params[packer.hhw], self.line_group, out=widths)
+        if self.broadening:
+            widths += self.broadening
+        return centers, intensities, widths
+
+    def simulate(
+        self, params: np.ndarray, x: np.ndarray, out: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Returns the simulated intensity of each point of `x`, written to `out`."""
+        simulation = simulate_lorentzians_batched(x, *self.lines(params), out=out)
+        if self.solvent is not None:
+            self.solvent.add(x, params[self.packer.water], simulation)
+        return simulation
+
+    def evaluate(
+        self,
+        params: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        out: np.ndarray | None = None,
+    ) -> tuple[float, np.ndarray, np.ndarray]:
+        """
+        Computes the RMSE between the simulated and measured spectrum on `x` and its
+        exact gradient with respect to the packed parameters
+
+        Parameters
+        ----------
+        params : np.ndarray
+            Packed parameter vector
+        x : np.ndarray
+            Frequency (in Hz) of each data point
+        y : np.ndarray
+            Measured intensity of each data point
+        out : np.ndarray | None, optional
+            Preallocated array the simulation is written to, by default None
+
+        Returns
+        -------
+        rmse : float
+            Root mean square error of the simulation
+        gradient : np.ndarray
+            Derivative of the RMSE with respect to each packed parameter
+        simulation : np.ndarray
+            Simulated intensity of each data point
+        """
+        packer = self.packer
+        centers, intensities, widths = self.lines(params)
+        simulation = simulate_lorentzians_batched(
+            x, centers, intensities, widths, out=out
+        )
+        if self.solvent is not None:
+            self.solvent.add(x, params[packer.water], simulation)
+        residual = simulation - y
+        rmse = float(np.sqrt(np.mean(residual**2)))
+
+        gradient = np.zeros(packer.size)
+        if rmse == 0.0:
+            return rmse, gradient, simulation
+
+        d_center, d_intensity, d_width = line_gradients(
+            x, residual, centers, intensities, widths
+        )
+        n_groups = len(packer.groups)
+        gradient[packer.couplings] = self._coefficients.T @ d_center
+        gradient[packer.intensities] = (
+            np.bincount(
+                self.line_group,
+                weights=d_intensity * self.line_weight,
+                minlength=n_groups,
+            )
+            * self._sizes
+        )
+        gradient[packer.hhw] = np.bincount(
+            self.line_group, weights=d_width, minlength=n_groups
+        )
+        if self.solvent is not None:
+            gradient[packer.water] = self.solvent.gradient(
+                x, params[packer.water], residual
+            )
+        gradient /= len(x) * rmse
+        return rmse, gradient, simulation
+
+
+def line_gradients(
+    x: np.ndarray,
+    residual: np.ndarray,
+    centers: np.ndarray,
+    intensities: np.ndarray,
+    half_height_widths: np.ndarray,
+    memory_budget: int = LORENTZ_MEMORY_BUDGET,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Projects a residual onto the derivatives of each lorentzian with respect to its
+    center, intensity and half-height width. Lines are processed in blocks of at most
+    `memory_budget` bytes of (lines x points) values.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Frequency (in Hz) of each point
+    residual : np.ndarray
+        Residual at each point
+    centers : np.ndarray
+        Line positions (in Hz)
+    intensities : np.ndarray
+        Line intensities
+    half_height_widths : np.ndarray
+        Line half-height widths (in Hz)
+    memory_budget : int, optional
+        Maximum size (in bytes) of each block, by default 1 MiB
+
+    Returns
+    -------
+    d_center, d_intensity, d_width : np.ndarray
+        sum(residual * dL/dparameter) of each line
+
+    Notes
+    -----
+        With d = x - c and D = w^2 + 4d^2, a line L = I w / (2D) has derivatives
+        dL/dc = 4 I w d / D^2, dL/dI = w / (2D) and dL/dw = I (4d^2 - w^2) / (2D^2).
+    """
+    n = len(centers)
+    d_center = np.empty(n)
+    d_intensity = np.empty(n)
+    d_width = np.empty(n)
+    rows = max(1, memory_budget // (8 * max(len(x), 1)))
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        w = half_height_widths[start:stop, np.newaxis]
+        intensity = intensities[start:stop]
+        distance = x - centers[start:stop, np.newaxis]
+        inverse = 1.0 / (w * w + 4 * distance * distance)
+        weighted = residual * inverse
+        d_intensity[start:stop] = 0.5 * w[:, 0] * weighted.sum(axis=1)
+        weighted *= inverse
+        first = (weighted * distance).sum(axis=1)
+        second = (weighted * distance * distance).sum(axis=1)
+        d_center[start:stop] = 4 * intensity * w[:, 0] * first
+        d_width[start:stop] = 0.5 * intensity * (
+            4 * second - w[:, 0] ** 2 * weighted.sum(axis=1)
+        )
+    return d_center, d_intensity, d_width
@@ -1,37 +1,335 @@
 import numpy as np
+from scipy.sparse import csr_array
 
+from solventspinsim.spin import Spin
 
-def unpack_params(params: np.ndarray | list, matrix_size: int, matrix_shape: tuple):
-    cMatrix_flat = np.array(params[:matrix_size])
-    intensities = np.array(params[matrix_size : matrix_size + matrix_shape[0]])
-
-    sw, obs = params[matrix_size + matrix_shape[0] : matrix_size + matrix_shape[0] + 2]
-    w = params[matrix_size + matrix_shape[0] + 2 :]
-
-    return cMatrix_flat.reshape(matrix_shape), intensities, sw, obs, w
-
-
-def unpack_params_water(
-    params: np.ndarray | list, matrix_size: int, matrix_shape: tuple
-):
-    cMatrix_flat = np.array(params[:matrix_size])
-    intensities = np.array(params[matrix_size : matrix_size + matrix_shape[0]])
-
-    water_freq, water_intensity, water_hhw = params[
-        matrix_size + matrix_shape[0] : matrix_size + matrix_shape[0] + 3
-    ]
-    sw, obs = params[
-        matrix_size + matrix_shape[0] + 3 : matrix_size + matrix_shape[0] + 5
-    ]
-    w = params[matrix_size + matrix_shape[0] + 5 :]
-
-    return (
-        cMatrix_flat.reshape(matrix_shape),
-        intensities,
-        water_freq,
-        water_intensity,
-        water_hhw,
-        sw,
-        obs,
-        w,
-    )
+# Default optimizer bounds of each parameter kind
+COUPLING_BOUNDS: tuple[float, float] = (-100, 100)
+INTENSITY_BOUNDS: tuple[float, float] = (-1000, 1000)
+HHW_BOUNDS: tuple[float, float] = (0.5, 100)
+
+# Half-height widths beyond its multiplet at which a line is considered not to reach a point
+JAC_REACH_WIDTHS: float = 50.0
+
+
+class ParameterPacker:
+    """
+    Maps the parameters of a spin system (and optional water peak) to and from the
+    flat vector optimized by scipy. Only parameters that change the simulation are
+    packed:
+
+        - Couplings between different groups of magnetically equivalent nuclei that are
+          nonzero in the initial matrix, once per pair of groups (upper triangle)
+        - One intensity and one half-height width per group of equivalent nuclei
+        - Water frequency, intensity and half-height width when water is simulated
+
+    Structurally zero couplings, the diagonal, mirrored entries and couplings inside
+    a group keep their initial values when the vector is unpacked.
+
+    Attributes
+    ----------
+    groups : list[list[int]]
+        Groups of magnetically equivalent nuclei sharing parameters
+    coupling_pairs : tuple[np.ndarray, np.ndarray]
+        Representative (i, j) nuclei, i < j, of each packed coupling
+    coupling_groups : tuple[np.ndarray, np.ndarray]
+        Indices of the (i, j) groups of each packed coupling
+    simulate_water : bool
+        Whether the water parameters are packed
+    couplings, intensities, water, hhw : slice
+        Position of each parameter kind in the packed vector
+    size : int
+        Length of the packed vector
+    """
+
+    def __init__(self, spin: Spin, simulate_water: bool = False) -> None:
+        self.groups: list[list[int]] = spin.equivalent_groups
+        self.simulate_water: bool = simulate_water
+        self._nuclei_number: int = spin._nuclei_number
+        self._base_couplings: np.ndarray = np.array(spin._couplings, dtype=np.float64)
+
+        representatives = np.array([group[0] for group in self.groups], dtype=np.intp)
+        group_i, group_j = np.triu_indices(len(self.groups), k=1)
+        nonzero = (
+            self._base_couplings[representatives[group_i], representatives[group_j]]
+            != 0
+        )
+        group_i, group_j = group_i[nonzero], group_j[nonzero]
+        self.coupling_groups: tuple[np.ndarray, np.ndarray] = (group_i, group_j)
+        self.coupling_pairs: tuple[np.ndarray, np.ndarray] = (
+            representatives[group_i],
+            representatives[group_j],
+        )
+
+        # Every (row, column) of the full matrix set by each packed coupling
+        rows, columns, sources = [], [], []
+        for k, (g, h) in enumerate(zip(group_i, group_j)):
+            members_g, members_h = np.meshgrid(self.groups[g], self.groups[h])
+            rows += [members_g.ravel(), members_h.ravel()]
+            columns += [members_h.ravel(), members_g.ravel()]
+            sources += [np.full(2 * members_g.size, k)]
+        self._rows: np.ndarray = np.concatenate(rows or [np.empty(0, np.intp)])
+        self._columns: np.ndarray = np.concatenate(columns or [np.empty(0, np.intp)])
+        self._sources: np.ndarray = np.concatenate(sources or [np.empty(0, np.intp)])
+
+        # Group index of every nucleus, used to broadcast per-group parameters
+        self._membership: np.ndarray = np.empty(self._nuclei_number, dtype=np.intp)
+        for g, group in enumerate(self.groups):
+            self._membership[group] = g
+        self._representatives: np.ndarray = representatives
+
+        n_couplings = len(group_i)
+        n_groups = len(self.groups)
+        n_water = 3 if simulate_water else 0
+        self.couplings: slice = slice(0, n_couplings)
+        self.intensities: slice = slice(n_couplings, n_couplings + n_groups)
+        self.water: slice = slice(
+            self.intensities.stop, self.intensities.stop + n_water
+        )
+        self.hhw: slice = slice(self.water.stop, self.water.stop + n_groups)
+        self.size: int = self.hhw.stop
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def pack(
+        self,
+        couplings: np.ndarray,
+        intensities: list[float] | np.ndarray,
+        hhw: list[float] | np.ndarray,
+        water: tuple[float, float, float] | None = None,
+    ) -> np.ndarray:
+        """
+        Packs full per-nucleus parameters into an optimizer vector, reading each
+        shared parameter from the first member of its group
+
+        Parameters
+        ----------
+        couplings : np.ndarray
+            2D matrix (n x n) of scalar coupling constants (in Hz)
+        intensities : list[float] | np.ndarray
+            Relative intensity of each nucleus
+        hhw : list[float] | np.ndarray
+            Half-height width (in Hz) of each nucleus
+        water : tuple[float, float, float] | None, optional
+            Water frequency, intensity and half-height width, required when water is simulated
+
+        Returns
+        -------
+        np.ndarray
+            Packed parameter vector
+        """
+        params = np.empty(self.size)
+        params[self.couplings] = np.asarray(couplings)[self.coupling_pairs]
+        params[self.intensities] = np.asarray(intensities)[self._representatives]
+        if self.simulate_water:
+            if water is None:
+                raise ValueError("Water parameters are required to pack this vector")
+            params[self.water] = water
+        params[self.hhw] = np.asarray(hhw)[self._representatives]
+        return params
+
+    def unpack(
+        self, params: np.ndarray | list, couplings_out: np.ndarray | None = None
+    ) -> tuple[
+        np.ndarray, np.ndarray, np.ndarray, tuple[float, float, float] | None
+    ]:
+        """
+        Unpacks an optimizer vector into full per-nucleus parameters
+
+        Parameters
+        ----------
+        params : np.ndarray | list
+            Packed parameter vector
+        couplings_out : np.ndarray | None, optional
+            Preallocated (n x n) matrix the couplings are written to, by default a new copy
+
+        Returns
+        -------
+        couplings : np.ndarray
+            Symmetric 2D matrix (n x n) of scalar coupling constants (in Hz)
+        intensities : np.ndarray
+            Relative intensity of each nucleus
+        hhw : np.ndarray
+            Half-height width (in Hz) of each nucleus
+        water : tuple[float, float, float] | None
+            Water frequency, intensity and half-height width, or None without water
+        """
+        params = np.asarray(params, dtype=np.float64)
+        if couplings_out is None:
+            couplings = self._base_couplings.copy()
+        else:
+            couplings = couplings_out
+            couplings[...] = self._base_couplings
+        couplings[self._rows, self._columns] = params[self.couplings][self._sources]
+        intensities = params[self.intensities][self._membership]
+        hhw = params[self.hhw][self._membership]
+        water = None
+        if self.simulate_water:
+            water_freq, water_intensity, water_hhw = params[self.water].tolist()
+            water = (water_freq, water_intensity, water_hhw)
+        return couplings, intensities, hhw, water
+
+    def bounds(
+        self, water_limits: tuple[float, float] | None = None
+    ) -> list[tuple[float, float]]:
+        """
+        Returns the optimizer bounds of every packed parameter
+
+        Parameters
+        ----------
+        water_limits : tuple[float, float] | None, optional
+            Lower and upper bound of the water frequency, required when water is simulated
+
+        Returns
+        -------
+        list[tuple[float, float]]
+            (lower, upper) bound of each parameter
+        """
+        bounds = [COUPLING_BOUNDS] * (self.couplings.stop - self.couplings.start)
+        bounds += [INTENSITY_BOUNDS] * len(self.groups)
+        if self.simulate_water:
+            if water_limits is None:
+                raise ValueError("Water limits are required for water bounds")
+            bounds += [(min(water_limits), max(water_limits)), INTENSITY_BOUNDS]
+            bounds += [HHW_BOUNDS]
+        bounds += [HHW_BOUNDS] * len(self.groups)
+        return bounds
+
+    def group_reach(
+        self,
+        frequencies: list[float] | np.ndarray,
+        params: np.ndarray,
+        reach_widths: float = JAC_REACH_WIDTHS,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the center of each group and the distance its lines reach: the
+        multiplet half-span, sum(n |J| / 2) over its couplings, plus `reach_widths`
+        half-height widths
+
+        Parameters
+        ----------
+        frequencies : list[float] | np.ndarray
+            Resonance frequency (in Hz) of each nucleus
+        params : np.ndarray
+            Packed parameter vector the reach is estimated from
+        reach_widths : float, optional
+            Number of half-height widths a line reaches past its multiplet, by default 50
+
+        Returns
+        -------
+        centers : np.ndarray
+            Resonance frequency (in Hz) of each group
+        reach : np.ndarray
+            Distance (in Hz) from its center within which each group changes the spectrum
+        """
+        params = np.asarray(params, dtype=np.float64)
+        centers = np.asarray(frequencies, dtype=np.float64)[self._representatives]
+        sizes = np.array([len(group) for group in self.groups])
+        group_i, group_j = self.coupling_groups
+        couplings = np.abs(params[self.couplings])
+        span = np.bincount(
+            group_i, weights=couplings * sizes[group_j] / 2, minlength=len(sizes)
+        ) + np.bincount(
+            group_j, weights=couplings * sizes[group_i] / 2, minlength=len(sizes)
+        )
+        return centers, span + reach_widths * params[self.hhw]
+
+    def parameter_indices(
+        self, groups: list[int] | np.ndarray, water: bool = False
+    ) -> np.ndarray:
+        """
+        Returns the sorted positions in the packed vector of every parameter of the
+        given groups: their intensities, half-height widths and every packed coupling
+        involving at least one of them, plus the water parameters when requested
+
+        Parameters
+        ----------
+        groups : list[int] | np.ndarray
+            Indices of groups of equivalent nuclei
+        water : bool, optional
+            Whether to include the water parameters, by default False
+
+        Returns
+        -------
+        np.ndarray
+            Indices into the packed vector
+        """
+        groups = np.asarray(groups, dtype=np.intp)
+        group_i, group_j = self.coupling_groups
+        coupled = np.flatnonzero(np.isin(group_i, groups) | np.isin(group_j, groups))
+        indices = [
+            self.couplings.start + coupled,
+            self.intensities.start + groups,
+            self.hhw.start + groups,
+        ]
+        if water and self.simulate_water:
+            indices.append(np.arange(self.water.start, self.water.stop))
+        return np.sort(np.concatenate(indices))
+
+    def jacobian_sparsity(
+        self,
+        frequencies: list[float] | np.ndarray,
+        params: np.ndarray,
+        x: np.ndarray,
+        water_limits: tuple[float, float] | None = None,
+        reach_widths: float = JAC_REACH_WIDTHS,
+    ) -> csr_array:
+        """
+        Returns which points of `x` each packed parameter can change, for use as the
+        `jac_sparsity` of `scipy.optimize.least_squares`. A group reaches the points
+        within its multiplet half-span, sum(n |J| / 2) over its couplings, plus
+        `reach_widths` half-height widths of its center. Couplings reach the points of
+        both groups they join, and the water parameters reach the water limits widened
+        by `reach_widths` water half-height widths.
+
+        Parameters
+        ----------
+        frequencies : list[float] | np.ndarray
+            Resonance frequency (in Hz) of each nucleus
+        params : np.ndarray
+            Packed parameter vector the reach is estimated from
+        x : np.ndarray
+            Frequency (in Hz) of each point of the residual vector
+        water_limits : tuple[float, float] | None, optional
+            Lower and upper bound of the water frequency, by default the water frequency
+        reach_widths : float, optional
+            Number of half-height widths a line reaches past its multiplet, by default 50
+
+        Returns
+        -------
+        csr_array
+            Boolean (points x parameters) sparsity structure
+        """
+        x = np.asarray(x, dtype=np.float64)
+        params = np.asarray(params, dtype=np.float64)
+        centers, reach = self.group_reach(frequencies, params, reach_widths)
+        group_i, group_j = self.coupling_groups
+        # reaches[g, point] is True when group g can change the point
+        reaches = np.abs(x - centers[:, np.newaxis]) <= reach[:, np.newaxis]
+
+        # Points reached by every column of the parameter vector
+        points: list[np.ndarray] = [np.empty(0, np.intp)] * self.size
+        coupling_columns = range(self.couplings.start, self.couplings.stop)
+        for column, g, h in zip(coupling_columns, group_i, group_j):
+            points[column] = np.flatnonzero(reaches[g] | reaches[h])
+        for g in range(len(self.groups)):
+            points[self.intensities.start + g] = np.flatnonzero(reaches[g])
+            points[self.hhw.start + g] = points[self.intensities.start + g]
+        if self.simulate_water:
+            water_freq, _, water_hhw = params[self.water]
+            low, high = water_limits if water_limits else (water_freq, water_freq)
+            margin = reach_widths * water_hhw
+            water_points = np.flatnonzero(
+                (x >= min(low, high) - margin) & (x <= max(low, high) + margin)
+            )
+            for column in range(self.water.start, self.water.stop):
+                points[column] = water_points
+
+        rows = np.concatenate(points)
+        columns = np.repeat(np.arange(self.size), [len(p) for p in points])
+        return csr_array(
+            (np.ones(len(rows), dtype=bool), (rows, columns)),
+            shape=(len(x), self.size),
+        )
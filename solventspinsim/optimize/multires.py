@@ -0,0 +1,77 @@
+import numpy as np
+from scipy.signal import fftconvolve
+
+# Half-height width of the smoothing kernel of a level, in points of its decimated grid
+MULTIRES_KERNEL_POINTS: float = 2.0
+
+# The smoothing kernel is truncated at this many of its half-height widths
+MULTIRES_KERNEL_REACH: float = 20.0
+
+# Coarse levels are skipped when their grid would hold fewer points than this
+MULTIRES_MIN_POINTS: int = 64
+
+
+def multiresolution_factors(levels: int, points: int) -> list[int]:
+    """
+    Returns the decimation factor of each level of a coarse-to-fine schedule, halving
+    from 2^(levels - 1) down to 1 (the full spectrum) and skipping levels that would
+    leave fewer than MULTIRES_MIN_POINTS points.
+
+    Parameters
+    ----------
+    levels : int
+        Number of levels, 1 fits the full spectrum only
+    points : int
+        Number of points of the full spectrum
+
+    Returns
+    -------
+    list[int]
+        Decimation factors from the coarsest to the finest level
+    """
+    if levels < 1:
+        raise ValueError(f"Level count must be at least 1, got {levels}")
+    return [
+        2**level
+        for level in range(levels - 1, -1, -1)
+        if level == 0 or points // 2**level >= MULTIRES_MIN_POINTS
+    ]
+
+
+def smooth_spectrum(nmr_array: np.ndarray, factor: int) -> tuple[np.ndarray, float]:
+    """
+    Smooths a spectrum with a unit-area lorentzian kernel and keeps every `factor`-th
+    point. Convolving a lorentzian with a lorentzian adds their half-height widths,
+    so the smoothed spectrum is simulated exactly by broadening every line by the
+    kernel width, and the kernel spans MULTIRES_KERNEL_POINTS points of the decimated
+    grid so that no line is narrower than its sampling.
+
+    Parameters
+    ----------
+    nmr_array : np.ndarray
+        (2 x points) frequency (in Hz) and intensity of an evenly spaced spectrum
+    factor : int
+        Decimation factor, 1 returns the spectrum unchanged
+
+    Returns
+    -------
+    level_array : np.ndarray
+        (2 x points / factor) smoothed and decimated spectrum
+    broadening : float
+        Half-height width (in Hz) of the kernel, to add to every simulated line
+    """
+    if factor <= 1:
+        return nmr_array, 0.0
+    x, y = nmr_array[0], nmr_array[1]
+    spacing = abs(x[-1] - x[0]) / (len(x) - 1)
+    broadening = MULTIRES_KERNEL_POINTS * factor * spacing
+
+    reach = min(int(np.ceil(MULTIRES_KERNEL_REACH * broadening / spacing)), len(y) - 1)
+    offsets = np.arange(-reach, reach + 1) * spacing
+    # Unit-area lorentzian sampled on the grid, its truncated tails are not renormalized
+    # into the center so that lines keep their exact broadened height
+    kernel = 2 * broadening * spacing / (np.pi * (broadening**2 + 4 * offsets**2))
+
+    padded = np.pad(y, reach, mode="reflect")
+    smoothed = fftconvolve(padded, kernel, mode="valid")
+    return np.vstack((x[::factor], smoothed[::factor])), broadening
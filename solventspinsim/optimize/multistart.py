@@ -0,0 +1,337 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from sys import stderr
+
+import numpy as np
+from scipy.optimize import minimize
+
+from solventspinsim.spin import Spin
+
+from .helper import ParameterPacker
+from .objective import QuadrantObjective
+from .telemetry import Telemetry
+
+# Half-width (in Hz) of the box around the initial couplings that starts are drawn from
+MULTISTART_COUPLING_SPREAD: float = 2.0
+
+# Half-width, relative to their initial values, of the box the intensities and widths
+# (and relative to half the water range, of the box the water frequency) are drawn from
+MULTISTART_RELATIVE_SPREAD: float = 0.5
+
+# L-BFGS-B iterations each start runs before the unpromising starts are pruned
+MULTISTART_SCREEN_ITERATIONS: int = 10
+
+# Fraction of the screened starts (at least one) that is refined to convergence
+MULTISTART_KEEP_FRACTION: float = 0.25
+
+
+def start_points(
+    packer: ParameterPacker,
+    init_params: np.ndarray,
+    param_bounds: list[tuple[float, float]],
+    starts: int,
+    seed: int | None = None,
+    coupling_spread: float = MULTISTART_COUPLING_SPREAD,
+    relative_spread: float = MULTISTART_RELATIVE_SPREAD,
+) -> np.ndarray:
+    """
+    Returns `starts` starting vectors: `init_params` itself followed by a Latin
+    hypercube sample of a box around it, clipped to `param_bounds`. Couplings vary by
+    up to `coupling_spread` Hz, intensities and widths by up to `relative_spread` of
+    their initial values, and the water frequency by up to `relative_spread` of half
+    its bound width, so starts stay near the initial spin rather than anywhere in the
+    (much wider) bounds.
+
+    Parameters
+    ----------
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    init_params : np.ndarray
+        Packed initial parameters
+    param_bounds : list[tuple[float, float]]
+        (lower, upper) bound of each packed parameter, samples are clipped to them
+    starts : int
+        Number of starting vectors
+    seed : int | None, optional
+        Seed of the sampler, by default None
+    coupling_spread : float, optional
+        Half-width (in Hz) of the sampled coupling box, by default 2
+    relative_spread : float, optional
+        Relative half-width of the other sampled parameters, by default 0.5
+
+    Returns
+    -------
+    np.ndarray
+        (starts x parameters) starting vectors
+    """
+    if starts < 1:
+        raise ValueError(f"Start count must be at least 1, got {starts}")
+    init_params = np.asarray(init_params, dtype=np.float64)
+    points = np.tile(init_params, (starts, 1))
+    lower, upper = np.array(param_bounds, dtype=np.float64).T
+    spread = relative_spread * np.abs(init_params)
+    spread[packer.couplings] = coupling_spread
+    if packer.simulate_water:
+        frequency = packer.water.start
+        spread[frequency] = relative_spread * (upper - lower)[frequency] / 2
+
+    samples = starts - 1
+    dimensions = len(init_params)
+    if samples and dimensions:
+        rng = np.random.default_rng(seed)
+        # One sample per stratum of every dimension, strata shuffled independently
+        strata = rng.permuted(np.tile(np.arange(samples), (dimensions, 1)), axis=1).T
+        unit = (strata + rng.random((samples, dimensions))) / samples
+        points[1:] += (2 * unit - 1) * spread
+        np.clip(points, lower, upper, out=points)
+    return points
+
+
+def multistart_optimization(
+    nmr_array: np.ndarray,
+    spin: Spin,
+    packer: ParameterPacker,
+    init_params: np.ndarray,
+    water_range: tuple[float, float],
+    starts: int,
+    seed: int | None = None,
+    method: str = "lbfgsb",
+    workers: int = 1,
+    decomposition: str = "quadrants",
+    levels: int = 1,
+    telemetry: Telemetry | None = None,
+) -> list[tuple[float, np.ndarray]]:
+    """
+    Fits a spin system from several starting vectors of `start_points`. Every start
+    first runs a few L-BFGS-B iterations on the whole spectrum; only the best
+    MULTISTART_KEEP_FRACTION of them are then refined by the full fitting schedule.
+    Both stages run on `workers` worker processes, falling back to sequential fits
+    when no pool can be used. Sequential fits record every evaluation to `telemetry`,
+    while parallel ones record each start as it completes, so progress is published
+    (and a cancelled fit stops) in both stages either way.
+
+    Parameters
+    ----------
+    nmr_array : np.ndarray
+        (2 x points) frequency (in Hz) and intensity of the measured spectrum
+    spin : Spin
+        Initial spin system
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    init_params : np.ndarray
+        Packed initial parameters
+    water_range : tuple[float, float]
+        Lower and upper bound of the water frequency
+    starts : int
+        Number of starting vectors
+    seed : int | None, optional
+        Seed of the start sampler, by default None
+    method : str, optional
+        Fitting engine of the refinement, by default "lbfgsb"
+    workers : int, optional
+        Number of worker processes, by default 1
+    decomposition : str, optional
+        Decomposition of the refinement, by default "quadrants"
+    levels : int, optional
+        Number of coarse-to-fine levels of the refinement, by default 1
+    telemetry : Telemetry | None, optional
+        Channel the screening and refinement fits are recorded to, by default None
+
+    Returns
+    -------
+    list[tuple[float, np.ndarray]]
+        (RMSE over the whole spectrum, packed parameters) of every refined start,
+        best first
+    """
+    from .optimize import PARALLEL_ERRORS
+
+    water_limits = (min(water_range), max(water_range))
+    param_bounds = packer.bounds(water_limits)
+    points = start_points(packer, init_params, param_bounds, starts, seed)
+    progress = _Progress(nmr_array, spin, packer, telemetry)
+
+    screen_tasks = [
+        (
+            _screen_start,
+            (
+                nmr_array,
+                spin,
+                packer,
+                point,
+                param_bounds,
+                # Telemetry cannot be sent to worker processes
+                telemetry if workers <= 1 or len(points) <= 1 else None,
+            ),
+        )
+        for point in points
+    ]
+    try:
+        screened = _run_tasks(screen_tasks, workers, progress)
+    except PARALLEL_ERRORS as error:
+        print(f"Parallel multi-start unavailable ({error})", file=stderr)
+        workers = 1
+        screen_tasks = [
+            (function, arguments[:-1] + (telemetry,))
+            for function, arguments in screen_tasks
+        ]
+        screened = _run_tasks(screen_tasks, workers)
+
+    keep = max(1, int(np.ceil(MULTISTART_KEEP_FRACTION * len(screened))))
+    survivors = sorted(screened, key=lambda result: result[0])[:keep]
+    refine_tasks = [
+        (
+            _refine_start,
+            (
+                nmr_array,
+                spin,
+                packer,
+                params,
+                water_range,
+                method,
+                decomposition,
+                levels,
+                # Telemetry cannot be sent to worker processes
+                telemetry if workers <= 1 or len(survivors) <= 1 else None,
+            ),
+        )
+        for _, params in survivors
+    ]
+    try:
+        refined = _run_tasks(refine_tasks, workers, progress)
+    except PARALLEL_ERRORS as error:
+        print(f"Parallel multi-start unavailable ({error})", file=stderr)
+        refine_tasks = [
+            (function, arguments[:-1] + (telemetry,))
+            for function, arguments in refine_tasks
+        ]
+        refined = _run_tasks(refine_tasks, 1)
+    # Stable sort, so ties keep the order of their screening rank
+    return sorted(refined, key=lambda result: result[0])
+
+
+# ---------------------------------------------------------------------------- #
+#                               Helper Functions                               #
+# ---------------------------------------------------------------------------- #
+
+
+def _screen_start(
+    nmr_array: np.ndarray,
+    spin: Spin,
+    packer: ParameterPacker,
+    params: np.ndarray,
+    param_bounds: list[tuple[float, float]],
+    telemetry: Telemetry | None = None,
+) -> tuple[float, np.ndarray]:
+    """Runs the screening iterations of one start, returning its RMSE and parameters."""
+    from .optimize import _cost
+
+    objective = QuadrantObjective(spin, packer, nmr_array[0], nmr_array[1])
+    if objective.has_gradient:
+        function, jac = objective.value_and_gradient, True
+    else:
+        function, jac = objective, False
+
+    def observed(params: np.ndarray):
+        value = function(params)
+        telemetry.record(params, _cost(value))
+        return value
+
+    if telemetry is not None:
+        telemetry.begin(objective)
+    result = minimize(
+        function if telemetry is None else observed,
+        params,
+        method="L-BFGS-B",
+        jac=jac,
+        bounds=param_bounds,
+        options={"maxiter": MULTISTART_SCREEN_ITERATIONS},
+    )
+    if telemetry is not None:
+        telemetry.end()
+    return float(objective(result.x)), result.x
+
+
+def _refine_start(
+    nmr_array: np.ndarray,
+    spin: Spin,
+    packer: ParameterPacker,
+    params: np.ndarray,
+    water_range: tuple[float, float],
+    method: str,
+    decomposition: str,
+    levels: int,
+    telemetry: Telemetry | None = None,
+) -> tuple[float, np.ndarray]:
+    """Refines one screened start and returns its RMSE and parameters."""
+    from .optimize import _fit_schedule
+
+    params = _fit_schedule(
+        nmr_array,
+        spin,
+        packer,
+        params,
+        water_range,
+        method,
+        1,
+        decomposition,
+        levels,
+        report=False,
+        telemetry=telemetry,
+    )
+    objective = QuadrantObjective(spin, packer, nmr_array[0], nmr_array[1])
+    return float(objective(params)), params
+
+
+def _run_tasks(
+    tasks: list[tuple], workers: int, progress: "_Progress | None" = None
+) -> list:
+    """
+    Runs (function, arguments) tasks, returning their results in task order. Results
+    of parallel tasks are passed to `progress` as they are collected, and tasks that
+    have not started are cancelled when it raises (e.g. a cancelled fit).
+    """
+    if workers <= 1 or len(tasks) <= 1:
+        return [function(*arguments) for function, arguments in tasks]
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)), mp_context=get_context("spawn")
+    )
+    try:
+        futures = [
+            executor.submit(function, *arguments) for function, arguments in tasks
+        ]
+        results = []
+        for future in futures:
+            results.append(future.result())
+            if progress is not None:
+                progress(*results[-1])
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Progress:
+    """
+    Records the (RMSE, parameters) result of every start fitted in a worker process
+    to the telemetry of the fit, as one evaluation of the whole spectrum.
+    """
+
+    def __init__(
+        self,
+        nmr_array: np.ndarray,
+        spin: Spin,
+        packer: ParameterPacker,
+        telemetry: Telemetry | None,
+    ) -> None:
+        self.telemetry: Telemetry | None = telemetry
+        self._objective: QuadrantObjective | None = None
+        if telemetry is not None:
+            self._objective = QuadrantObjective(
+                spin, packer, nmr_array[0], nmr_array[1]
+            )
+
+    def __call__(self, cost: float, params: np.ndarray) -> None:
+        if self.telemetry is None:
+            return
+        self.telemetry.begin(self._objective)
+        self.telemetry.record(params, cost)
+        self.telemetry.end()
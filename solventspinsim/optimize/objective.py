@@ -0,0 +1,305 @@
+import numpy as np
+from scipy.sparse import csr_array
+
+from solventspinsim.simulate.simulate import simulate_lorentzians_batched
+from solventspinsim.spin import Spin
+from solventspinsim.spin.peak import gen_peaklist
+from solventspinsim.spin.spin import CouplingStrength
+
+from .cache import EVALUATION_CACHE_DECIMALS, EvaluationCache
+from .gradient import WeakLineModel
+from .helper import ParameterPacker
+from .solvent import SolventModel
+from .telemetry import OptimizationSnapshot
+
+
+class QuadrantObjective:
+    """
+    Prepared objective of one fit region. The data axis, the coupling matrix, the
+    simulation and residual buffers, and the line structure are built once, so each
+    evaluation maps a packed parameter vector straight into preallocated arrays
+    without constructing `Spin` or `Water` objects, running property validators,
+    converting to lists, or touching the GUI.
+
+    Weakly coupled systems with a zero coupling tolerance are evaluated with the
+    `WeakLineModel` (which also provides the exact gradient), every other system with
+    `gen_peaklist`. The water peak, when packed, is added in place by a `SolventModel`
+    evaluated directly on the data axis.
+    A nonzero `broadening` widens every line, matching data smoothed by a lorentzian
+    kernel of that half-height width. With a `cache`, the simulation (and gradient)
+    of every evaluated parameter vector is stored, and evaluating the same vector
+    (to EVALUATION_CACHE_DECIMALS) over the same region again copies it instead of
+    simulating.
+
+    Attributes
+    ----------
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    x : np.ndarray
+        Frequency (in Hz) of each data point
+    y : np.ndarray
+        Measured intensity of each data point
+    broadening : float
+        Width (in Hz) added to every half-height width
+    simulation : np.ndarray
+        Simulated intensity of each data point from the latest evaluation
+    evaluations : int
+        Number of simulations computed so far
+    solvent : SolventModel | None
+        Model of the water peak, None when water is not packed
+    cache : EvaluationCache | None
+        Store of evaluations shared with the other objectives of the fit
+    """
+
+    def __init__(
+        self,
+        spin: Spin,
+        packer: ParameterPacker,
+        x: np.ndarray,
+        y: np.ndarray,
+        broadening: float = 0.0,
+        cache: EvaluationCache | None = None,
+    ) -> None:
+        self.packer: ParameterPacker = packer
+        self.broadening: float = broadening
+        self.x: np.ndarray = np.ascontiguousarray(x, dtype=np.float64)
+        self.y: np.ndarray = np.ascontiguousarray(y, dtype=np.float64)
+        if self.x.shape != self.y.shape:
+            raise ValueError("Objective x and y must have the same shape")
+
+        self._frequencies: np.ndarray = np.asarray(
+            spin._nuclei_frequencies, dtype=np.float64
+        )
+        self._strong: bool = spin.coupling_strength == CouplingStrength.STRONG
+        self._coupling_tolerance: float = spin.coupling_tolerance
+        self.line_model: WeakLineModel | None = None
+        if not self._strong and self._coupling_tolerance == 0.0:
+            self.line_model = WeakLineModel(spin, packer, broadening)
+
+        self.solvent: SolventModel | None = None
+        if self.line_model is not None:
+            self.solvent = self.line_model.solvent
+        elif packer.simulate_water:
+            self.solvent = SolventModel(broadening=broadening)
+
+        self._couplings: np.ndarray = np.empty(np.shape(spin._couplings))
+        self.simulation: np.ndarray = np.zeros(len(self.x))
+        self._residual: np.ndarray = np.empty(len(self.x))
+        self.evaluations: int = 0
+        self.cache: EvaluationCache | None = cache
+        # Simulations only depend on the axis and broadening of the region
+        self._region: tuple = (len(self.x), self.x[0], self.x[-1], broadening)
+
+    @property
+    def has_gradient(self) -> bool:
+        """Whether `value_and_gradient` is available for this spin system"""
+        return self.line_model is not None
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def simulate(self, params: np.ndarray) -> np.ndarray:
+        """
+        Simulates the spectrum of a packed parameter vector on the data axis
+
+        Parameters
+        ----------
+        params : np.ndarray
+            Packed parameter vector
+
+        Returns
+        -------
+        np.ndarray
+            The `simulation` buffer, overwritten by the next evaluation
+        """
+        key, entry = self._lookup(params)
+        if entry is not None:
+            np.copyto(self.simulation, entry[0])
+            return self.simulation
+        self.evaluations += 1
+        simulation = self._simulate(params, self.simulation)
+        if key is not None:
+            self.cache.put(key, [simulation.copy(), None])
+        return simulation
+
+    def residuals(self, params: np.ndarray) -> np.ndarray:
+        """Returns a new array of simulated minus measured intensity at each point."""
+        return self.simulate(params) - self.y
+
+    def value_and_gradient(self, params: np.ndarray) -> tuple[float, np.ndarray]:
+        """
+        Returns the RMSE of a packed parameter vector and its exact gradient
+
+        Parameters
+        ----------
+        params : np.ndarray
+            Packed parameter vector
+
+        Returns
+        -------
+        rmse : float
+            Root mean square error of the simulation
+        gradient : np.ndarray
+            Derivative of the RMSE with respect to each packed parameter
+        """
+        if self.line_model is None:
+            raise ValueError("Analytic gradients require weak coupling")
+        key, entry = self._lookup(params)
+        if entry is not None and entry[1] is not None:
+            np.copyto(self.simulation, entry[0])
+            rmse, gradient = entry[1]
+            return rmse, gradient.copy()
+        self.evaluations += 1
+        rmse, gradient, _ = self.line_model.evaluate(
+            params, self.x, self.y, out=self.simulation
+        )
+        if key is not None:
+            self.cache.put(key, [self.simulation.copy(), (rmse, gradient.copy())])
+        return rmse, gradient
+
+    def snapshot(self, params: np.ndarray) -> OptimizationSnapshot:
+        """
+        Returns the simulation of `params` with its unpacked parameters. The spectrum
+        is copied from the cache when stored there, and otherwise simulated into a new
+        array, so the `simulation` buffer, the evaluation count and the cache
+        statistics of the fit are left untouched.
+        """
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.peek(self._key(params))
+        if entry is not None:
+            simulation = entry[0].copy()
+        else:
+            simulation = self._simulate(params, np.empty(len(self.x)))
+        return OptimizationSnapshot(
+            self.x, self.y, simulation, *self.packer.unpack(params)
+        )
+
+    def jacobian_sparsity(
+        self, params: np.ndarray, water_limits: tuple[float, float] | None = None
+    ) -> csr_array:
+        """Returns which data points each packed parameter can change."""
+        return self.packer.jacobian_sparsity(
+            self._frequencies, params, self.x, water_limits
+        )
+
+    # ---------------------------------------------------------------------------- #
+    #                               Helper Functions                               #
+    # ---------------------------------------------------------------------------- #
+
+    def _lookup(self, params: np.ndarray) -> tuple[tuple | None, list | None]:
+        """Returns the cache key of `params` and its stored [simulation, gradient]."""
+        if self.cache is None:
+            return None, None
+        key = self._key(params)
+        return key, self.cache.get(key)
+
+    def _key(self, params: np.ndarray) -> tuple:
+        """Returns the cache key of `params` over this region."""
+        params = np.asarray(params, dtype=np.float64)
+        rounded = np.round(params, EVALUATION_CACHE_DECIMALS)
+        # Adding 0.0 turns -0.0 into 0.0, so both round to the same key
+        return (self._region, (rounded + 0.0).tobytes())
+
+    def _simulate(self, params: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Simulates `params` into `out`."""
+        if self.line_model is not None:
+            return self.line_model.simulate(params, self.x, out=out)
+
+        couplings, intensities, hhw, water = self.packer.unpack(
+            params, self._couplings
+        )
+        table = gen_peaklist(
+            self._frequencies,
+            couplings,
+            intensities,
+            self.packer.groups,
+            self._strong,
+            self._coupling_tolerance,
+        )
+        widths = hhw[table.nucleus]
+        if self.broadening:
+            widths += self.broadening
+        simulation = simulate_lorentzians_batched(
+            self.x, table.freq, table.intensity, widths, out=out
+        )
+        if water is not None:
+            self.solvent.add(self.x, water, simulation)
+        return simulation
+
+    # ---------------------------------------------------------------------------- #
+    #                                 Magic Methods                                #
+    # ---------------------------------------------------------------------------- #
+
+    def __call__(self, params: np.ndarray) -> float:
+        np.subtract(self.simulate(params), self.y, out=self._residual)
+        return float(np.sqrt(np.dot(self._residual, self._residual) / len(self.y)))
+
+
+class SubsetObjective:
+    """
+    View of a `QuadrantObjective` that only varies some packed parameters. The other
+    parameters stay at their values in `base`, so an optimizer sees a smaller problem
+    over the `free` positions of the packed vector.
+
+    Attributes
+    ----------
+    objective : QuadrantObjective
+        Objective of the full parameter vector
+    free : np.ndarray
+        Positions in the packed vector of the varied parameters
+    """
+
+    def __init__(
+        self, objective: QuadrantObjective, base: np.ndarray, free: np.ndarray
+    ) -> None:
+        self.objective: QuadrantObjective = objective
+        self.free: np.ndarray = np.asarray(free, dtype=np.intp)
+        self._params: np.ndarray = np.array(base, dtype=np.float64)
+
+    @property
+    def has_gradient(self) -> bool:
+        """Whether `value_and_gradient` is available for this spin system"""
+        return self.objective.has_gradient
+
+    @property
+    def simulation(self) -> np.ndarray:
+        """Simulated intensity of each data point from the latest evaluation"""
+        return self.objective.simulation
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def expand(self, params: np.ndarray) -> np.ndarray:
+        """Returns the full packed vector with the free parameters set to `params`."""
+        self._params[self.free] = params
+        return self._params
+
+    def residuals(self, params: np.ndarray) -> np.ndarray:
+        """Returns a new array of simulated minus measured intensity at each point."""
+        return self.objective.residuals(self.expand(params))
+
+    def value_and_gradient(self, params: np.ndarray) -> tuple[float, np.ndarray]:
+        """Returns the RMSE and its gradient with respect to the free parameters."""
+        rmse, gradient = self.objective.value_and_gradient(self.expand(params))
+        return rmse, gradient[self.free]
+
+    def snapshot(self, params: np.ndarray) -> OptimizationSnapshot:
+        """Returns the simulation of `params` with its expanded parameters."""
+        return self.objective.snapshot(self.expand(params))
+
+    def jacobian_sparsity(
+        self, params: np.ndarray, water_limits: tuple[float, float] | None = None
+    ) -> csr_array:
+        """Returns which data points each free parameter can change."""
+        sparsity = self.objective.jacobian_sparsity(self.expand(params), water_limits)
+        return csr_array(sparsity[:, self.free])
+
+    # ---------------------------------------------------------------------------- #
+    #                                 Magic Methods                                #
+    # ---------------------------------------------------------------------------- #
+
+    def __call__(self, params: np.ndarray) -> float:
+        return self.objective(self.expand(params))
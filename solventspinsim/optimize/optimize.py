@@ -1,39 +1,74 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pickle import PicklingError
 from sys import stderr
+from time import perf_counter
 from typing import TYPE_CHECKING
 
-import dearpygui.dearpygui as dpg
 import nmrPype
 import numpy as np
-from scipy.optimize import minimize
+from scipy.optimize import OptimizeResult, least_squares, minimize
 
-from solventspinsim.simulate import simulate_peaklist
 from solventspinsim.spin import Spin
-from solventspinsim.themes import Theme
 
-from .display import _optimization_ui, _update_optimization_ui
-from .helper import unpack_params, unpack_params_water
+from .cache import EvaluationCache
+from .checkpoint import Checkpoint, fit_signature
+from .helper import ParameterPacker
+from .multires import multiresolution_factors, smooth_spectrum
+from .multistart import multistart_optimization
+from .objective import QuadrantObjective, SubsetObjective
+from .window import fit_windows
+from .telemetry import Telemetry
 
 if TYPE_CHECKING:
     from solventspinsim.simulate import Water
 
+# Fitting engines of section_optimization: L-BFGS-B on the RMSE, or trust region
+# reflective least squares on the residual vector with a sparse jacobian
+OPTIMIZATION_METHODS: tuple[str, ...] = ("lbfgsb", "least_squares")
+
+# Ways of splitting the spectrum into fits: the four regions delimited by the water
+# bounds, or one window per cluster of overlapping multiplets (see fit_windows)
+DECOMPOSITIONS: tuple[str, ...] = ("quadrants", "windows")
+
+# Errors raised when the quadrant fits cannot run in worker processes, in which case
+# they are fitted sequentially instead
+PARALLEL_ERRORS: tuple[type[Exception], ...] = (
+    OSError,
+    BrokenProcessPool,
+    PicklingError,
+)
+
 
 def section_optimization(
     nmr_array: np.ndarray,
     spin: Spin,
-    matrix_shape: tuple,
-    matrix_size: int,
+    packer: ParameterPacker,
     init_params: np.ndarray,
     water_range: tuple[float, float],
-    simulate_water: bool = False,
+    method: str = "lbfgsb",
+    workers: int = 1,
+    decomposition: str = "quadrants",
+    broadening: float = 0.0,
+    history: list[OptimizeResult] | None = None,
+    telemetry: Telemetry | None = None,
+    checkpoint: Checkpoint | None = None,
+    cache: EvaluationCache | None = None,
 ) -> np.ndarray:
-    from solventspinsim.main import DPGStatus
-    from solventspinsim.simulate import Water
-
-    if DPGStatus.is_context_enabled():
-        _optimization_ui(spin)
+    if method not in OPTIMIZATION_METHODS:
+        raise ValueError(
+            f"Unknown optimization method '{method}', "
+            f"expected one of {OPTIMIZATION_METHODS}"
+        )
+    if decomposition not in DECOMPOSITIONS:
+        raise ValueError(
+            f"Unknown decomposition '{decomposition}', expected one of {DECOMPOSITIONS}"
+        )
+    if workers < 1:
+        raise ValueError(f"Worker count must be at least 1, got {workers}")
 
     optimized_params_list: list = []
-    spin_names = spin.spin_names
 
     # Define water peak bounds
     water_left: float = min(water_range)
@@ -53,27 +88,57 @@ def section_optimization(
         (indices[0], len(nmr_array[0])),
     )
 
-    if simulate_water:
-        param_bounds: list[tuple[float, float]] = (
-            [(-100, 100)] * len(spin._couplings.flatten())
-            + [(-1000, 1000)] * spin._nuclei_number
-            + [(water_left, water_right)]
-            + [(-1000, 1000)]
-            + [(0.5, 100)]
-            + [(1e-6, 1e6)]
-            + [(1e-6, 1e6)]
-            + [(0.5, 100)] * spin._nuclei_number
-        )
-    else:
-        param_bounds: list[tuple[float, float]] = (
-            [(-100, 100)] * len(spin._couplings.flatten())
-            + [(-1000, 1000)] * spin._nuclei_number
-            + [(1e-6, 1e6)]
-            + [(1e-6, 1e6)]
-            + [(0.5, 100)] * spin._nuclei_number
+    water_limits = (water_left, water_right)
+    param_bounds = packer.bounds(water_limits)
+
+    if decomposition == "windows":
+        return fit_windows(
+            nmr_array,
+            spin,
+            packer,
+            init_params,
+            param_bounds,
+            method,
+            water_limits,
+            broadening,
+            history,
+            telemetry,
+            checkpoint,
+            cache,
         )
 
-    for quadrant in quadrants:
+    # A resumed level continues after its last completed quadrant
+    if checkpoint is not None:
+        optimized_params_list = list(checkpoint.regions)
+
+    # Independent quadrants start from the same parameters and run concurrently,
+    # the sequential loop seeds each quadrant with the result of the previous one
+    if workers > 1 and not optimized_params_list:
+        try:
+            results = _fit_quadrants_parallel(
+                spin,
+                packer,
+                [nmr_array[:, start:end] for start, end in quadrants],
+                init_params,
+                param_bounds,
+                method,
+                water_limits,
+                workers,
+                broadening,
+                telemetry,
+            )
+            optimized_params_list = [result.x for result in results]
+            if history is not None:
+                history.extend(results)
+        except PARALLEL_ERRORS as error:
+            print(
+                f"Parallel optimization unavailable ({error}), "
+                "fitting quadrants sequentially",
+                file=stderr,
+            )
+
+    # Quadrants already fitted in parallel are skipped
+    for quadrant in quadrants[len(optimized_params_list) :]:
         start: int = quadrant[0]
         end: int = quadrant[1]
 
@@ -82,112 +147,21 @@ def section_optimization(
 
         # print(f"({start}, {end}) -> ({real_x[0]}, {real_x[-1]})", file=stderr)
 
-        if DPGStatus.is_context_enabled():
-            if dpg.does_item_exist("main_x_axis"):
-                if dpg.does_item_exist("region_line_left"):
-                    dpg.delete_item("region_line_left")
-                if dpg.does_item_exist("region_line_right"):
-                    dpg.delete_item("region_line_right")
-                # Draw new region lines
-                dpg.add_inf_line_series(
-                    real_x[0],
-                    label="Region Start",
-                    parent="main_x_axis",
-                    tag="region_line_left",
-                )
-                dpg.add_inf_line_series(
-                    real_x[-1],
-                    label="Region End",
-                    parent="main_x_axis",
-                    tag="region_line_right",
-                )
-                dpg.bind_item_theme("region_line_left", Theme.region_plot_theme())
-                dpg.bind_item_theme("region_line_right", Theme.region_plot_theme())
-
-        full_x = nmr_array[0]
-
-        def quadrant_objective(params):
-            if simulate_water:
-                (
-                    couplings,
-                    intensities,
-                    water_freq,
-                    water_intensity,
-                    water_hhw,
-                    spec_width,
-                    obs,
-                    hhw,
-                ) = unpack_params_water(params, matrix_size, matrix_shape)
-                new_spin = Spin(
-                    spin_names,
-                    list(spin._ppm_nuclei_frequencies),
-                    couplings,
-                    list(hhw),
-                    spin.field_strength,
-                )
-                simulation = simulate_peaklist(
-                    new_spin.peaklist(list(intensities)),
-                    len(real_x),
-                    list(hhw),
-                    (real_x[0], real_x[-1]),
-                )
-                new_water = Water(
-                    water_freq, water_intensity, water_hhw, water_enable=True
-                )
-                water_simulation_full = simulate_peaklist(
-                    new_water.peaklist,
-                    len(full_x),
-                    new_water.hhw,
-                    (full_x[0], full_x[-1]),
-                )
-                water_y_quadrant = np.interp(
-                    real_x, full_x, water_simulation_full[1][::-1]
-                )
-                sim_y = list(
-                    np.ascontiguousarray(simulation[1][::-1] + water_y_quadrant)
-                )
-
-                if DPGStatus.is_context_enabled():
-                    dpg.set_value("opt_wf", f"Water Frequency {water_freq}")
-                    dpg.set_value("opt_wi", f"Water Intensity: {water_intensity}")
-                    dpg.set_value("opt_whhw", f"Water Half-Height Width: {water_hhw}")
-            else:
-                couplings, intensities, spec_width, obs, hhw = unpack_params(
-                    params, matrix_size, matrix_shape
-                )
-                new_spin = Spin(
-                    spin_names,
-                    list(spin._ppm_nuclei_frequencies),
-                    couplings,
-                    list(hhw),
-                    spin.field_strength,
-                )
-                simulation = simulate_peaklist(
-                    new_spin.peaklist(list(intensities)),
-                    len(real_x),
-                    list(hhw),
-                    (real_x[0], real_x[-1]),
-                )
-                sim_y = list(np.ascontiguousarray(simulation[1][::-1]))
-
-            if DPGStatus.is_context_enabled():
-                _update_optimization_ui(
-                    matrix_shape,
-                    couplings,
-                    intensities,
-                    spec_width,
-                    hhw,
-                    real_x,
-                    real_y,
-                    sim_y,
-                )
+        objective = QuadrantObjective(spin, packer, real_x, real_y, broadening, cache)
 
-            return np.sqrt(np.mean((sim_y - real_y) ** 2))
-
-        result = minimize(
-            quadrant_objective, init_params, method="L-BFGS-B", bounds=param_bounds
+        result = _fit_quadrant(
+            objective,
+            init_params,
+            param_bounds,
+            method,
+            water_limits,
+            telemetry,
         )
         optimized_params_list.append(result.x)
+        if history is not None:
+            history.append(result)
+        if checkpoint is not None:
+            checkpoint.save(result.x, _cost(result.fun), optimized_params_list)
         init_params = result.x
 
     nuclei_quadrant_indices = []
@@ -207,86 +181,299 @@ def section_optimization(
     #         print(f"{quadrant[j]}", file=stderr, end=" ")
     #     print("", file=stderr)
 
-    if simulate_water:
-        couplings_list = []
-        intensities_list = []
-        hhw_list = []
+    couplings_list = []
+    intensities_list = []
+    hhw_list = []
 
-        for opt_param in optimized_params_list:
-            c, i, _, _, _, _, _, hhw = unpack_params_water(
-                opt_param, matrix_size, matrix_shape
-            )
-            couplings_list.append(c)
-            intensities_list.append(i)
-            hhw_list.append(hhw)
-
-        # Combine couplings and intensities from each quadrant using nuclei_quadrant_indices
-        new_couplings = np.zeros_like(spin._couplings)
-        new_intensities = np.zeros(spin._nuclei_number)
-        new_hhw = np.zeros(spin._nuclei_number)
-
-        for q_idx, indices in enumerate(nuclei_quadrant_indices):
-            for i in indices:
-                # For couplings, copy the row and column for each nucleus in this quadrant
-                new_couplings[i, :] = couplings_list[q_idx][i, :]
-                # For intensities, copy the value for each nucleus in this quadrant
-                new_intensities[i] = intensities_list[q_idx][i]
-                # For half_height_widths, copy the value for each nucleus in this quadrant
-                new_hhw[i] = hhw_list[q_idx][i]
-
-        _, _, new_water_freq, new_water_intensity, new_water_hhw, new_sw, new_obs, _ = (
-            unpack_params_water(optimized_params_list[0], matrix_size, matrix_shape)
-        )
+    for opt_param in optimized_params_list:
+        c, i, hhw, _ = packer.unpack(opt_param)
+        couplings_list.append(c)
+        intensities_list.append(i)
+        hhw_list.append(hhw)
+
+    # Combine couplings and intensities from each quadrant using nuclei_quadrant_indices
+    new_couplings = np.zeros_like(spin._couplings)
+    new_intensities = np.zeros(spin._nuclei_number)
+    new_hhw = np.zeros(spin._nuclei_number)
+
+    for q_idx, indices in enumerate(nuclei_quadrant_indices):
+        for i in indices:
+            # For couplings, copy the row and column for each nucleus in this quadrant
+            new_couplings[i, :] = couplings_list[q_idx][i, :]
+            # For intensities, copy the value for each nucleus in this quadrant
+            new_intensities[i] = intensities_list[q_idx][i]
+            # For half_height_widths, copy the value for each nucleus in this quadrant
+            new_hhw[i] = hhw_list[q_idx][i]
 
-        optimized_params = np.concatenate(
-            (
-                new_couplings.flatten(),
-                new_intensities,
-                [new_water_freq, new_water_intensity, new_water_hhw, new_sw, new_obs],
-                new_hhw,
+    # Water parameters are taken from the first quadrant
+    _, _, _, new_water = packer.unpack(optimized_params_list[0])
+
+    optimized_params = packer.pack(new_couplings, new_intensities, new_hhw, new_water)
+
+    return optimized_params
+
+
+def _fit_quadrant(
+    objective: QuadrantObjective | SubsetObjective,
+    init_params: np.ndarray,
+    param_bounds: list[tuple[float, float]],
+    method: str,
+    water_limits: tuple[float, float],
+    telemetry: Telemetry | None = None,
+) -> OptimizeResult:
+    """
+    Fits the parameters of one prepared objective with the selected engine.
+    L-BFGS-B uses the exact gradient when the objective provides one, and least
+    squares uses the packer's jacobian sparsity estimated from `init_params`.
+
+    Parameters
+    ----------
+    objective : QuadrantObjective | SubsetObjective
+        Prepared objective of the region to fit
+    init_params : np.ndarray
+        Packed starting parameters
+    param_bounds : list[tuple[float, float]]
+        (lower, upper) bound of each packed parameter
+    method : str
+        Fitting engine, one of OPTIMIZATION_METHODS
+    water_limits : tuple[float, float]
+        Lower and upper bound of the water frequency
+    telemetry : Telemetry | None, optional
+        Channel every evaluation is recorded to, by default None
+
+    Returns
+    -------
+    OptimizeResult
+        Result of the scipy optimizer
+    """
+
+    def observed(function):
+        if telemetry is None:
+            return function
+
+        def wrapper(params):
+            value = function(params)
+            telemetry.record(params, _cost(value))
+            return value
+
+        return wrapper
+
+    if telemetry is not None:
+        telemetry.begin(objective)
+
+    match method:
+        case "lbfgsb":
+            if objective.has_gradient:
+                function, jac = objective.value_and_gradient, True
+            else:
+                function, jac = objective, False
+            result = minimize(
+                observed(function),
+                init_params,
+                method="L-BFGS-B",
+                jac=jac,
+                bounds=param_bounds,
             )
-        )
+        case "least_squares":
+            lower, upper = np.array(param_bounds).T
+            x0 = np.clip(init_params, lower, upper)
+            sparsity = objective.jacobian_sparsity(x0, water_limits)
+            result = least_squares(
+                observed(objective.residuals),
+                x0,
+                jac_sparsity=sparsity,
+                bounds=(lower, upper),
+                method="trf",
+            )
+        case _:
+            raise ValueError(f"Unknown optimization method '{method}'")
 
-    else:
-        couplings_list = []
-        intensities_list = []
-        hhw_list = []
-
-        for opt_param in optimized_params_list:
-            c, i, _, _, hhw = unpack_params(opt_param, matrix_size, matrix_shape)
-            couplings_list.append(c)
-            intensities_list.append(i)
-            hhw_list.append(hhw)
-
-        # Combine couplings and intensities from each quadrant using nuclei_quadrant_indices
-        new_couplings = np.zeros_like(spin._couplings)
-        new_intensities = np.zeros(spin._nuclei_number)
-        new_hhw = np.zeros(spin._nuclei_number)
-
-        for q_idx, indices in enumerate(nuclei_quadrant_indices):
-            for i in indices:
-                # For couplings, copy the row and column for each nucleus in this quadrant
-                new_couplings[i, :] = couplings_list[q_idx][i, :]
-                # For intensities, copy the value for each nucleus in this quadrant
-                new_intensities[i] = intensities_list[q_idx][i]
-                # For half_height_widths, copy the value for each nucleus in this quadrant
-                new_hhw[i] = hhw_list[q_idx][i]
-
-        _, _, new_sw, new_obs, _ = unpack_params(
-            optimized_params_list[0], matrix_size, matrix_shape
-        )
+    if telemetry is not None:
+        telemetry.end()
+    return result
 
-        # Use the last optimized parameters for other values
-        optimized_params = np.concatenate(
-            (new_couplings.flatten(), new_intensities, [new_sw, new_obs], new_hhw)
-        )
 
-    if DPGStatus.is_context_enabled():
-        if dpg.does_item_exist("region_line_left"):
-            dpg.delete_item("region_line_left")
-        if dpg.does_item_exist("region_line_right"):
-            dpg.delete_item("region_line_right")
+def _cost(value: float | tuple[float, np.ndarray] | np.ndarray) -> float:
+    """Returns the RMSE of an objective, (RMSE, gradient) or residual return value."""
+    if isinstance(value, tuple):
+        return value[0]
+    if isinstance(value, np.ndarray):
+        return float(np.sqrt(np.dot(value, value) / len(value)))
+    return value
+
+
+def _fit_quadrant_task(
+    spin: Spin,
+    packer: ParameterPacker,
+    region: np.ndarray,
+    init_params: np.ndarray,
+    param_bounds: list[tuple[float, float]],
+    method: str,
+    water_limits: tuple[float, float],
+    broadening: float = 0.0,
+) -> OptimizeResult:
+    """Fits one (2 x points) region in a worker process."""
+    objective = QuadrantObjective(spin, packer, region[0], region[1], broadening)
+    return _fit_quadrant(objective, init_params, param_bounds, method, water_limits)
 
+
+def _fit_quadrants_parallel(
+    spin: Spin,
+    packer: ParameterPacker,
+    regions: list[np.ndarray],
+    init_params: np.ndarray,
+    param_bounds: list[tuple[float, float]],
+    method: str,
+    water_limits: tuple[float, float],
+    workers: int,
+    broadening: float = 0.0,
+    telemetry: Telemetry | None = None,
+) -> list[OptimizeResult]:
+    """
+    Fits every region concurrently on a pool of worker processes, each starting from
+    `init_params`. Workers are spawned rather than forked so that they do not inherit
+    the GUI state of the parent, and results are returned in the order of `regions`
+    regardless of completion order. The result of every region is recorded to
+    `telemetry` as it is collected, and regions that have not started are cancelled
+    when telemetry raises (e.g. a cancelled fit).
+
+    Parameters
+    ----------
+    spin : Spin
+        Initial spin system
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    regions : list[np.ndarray]
+        (2 x points) frequency and intensity arrays of each region
+    init_params : np.ndarray
+        Packed starting parameters shared by every region
+    param_bounds : list[tuple[float, float]]
+        (lower, upper) bound of each packed parameter
+    method : str
+        Fitting engine, one of OPTIMIZATION_METHODS
+    water_limits : tuple[float, float]
+        Lower and upper bound of the water frequency
+    workers : int
+        Maximum number of worker processes
+    broadening : float, optional
+        Width (in Hz) added to every simulated half-height width, by default 0
+    telemetry : Telemetry | None, optional
+        Channel the result of every region is recorded to, by default None
+
+    Returns
+    -------
+    list[OptimizeResult]
+        Result of the scipy optimizer of each region
+    """
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(regions)), mp_context=get_context("spawn")
+    )
+    try:
+        futures = [
+            executor.submit(
+                _fit_quadrant_task,
+                spin,
+                packer,
+                region,
+                init_params,
+                param_bounds,
+                method,
+                water_limits,
+                broadening,
+            )
+            for region in regions
+        ]
+        results = []
+        for region, future in zip(regions, futures):
+            results.append(future.result())
+            if telemetry is not None:
+                # Telemetry cannot be sent to worker processes, so each region is
+                # recorded as one evaluation once it has been fitted
+                telemetry.begin(
+                    QuadrantObjective(spin, packer, region[0], region[1], broadening)
+                )
+                telemetry.record(results[-1].x, _cost(results[-1].fun))
+                telemetry.end()
+        return results
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fit_schedule(
+    nmr_array: np.ndarray,
+    spin: Spin,
+    packer: ParameterPacker,
+    init_params: np.ndarray,
+    water_range: tuple[float, float],
+    method: str = "lbfgsb",
+    workers: int = 1,
+    decomposition: str = "quadrants",
+    levels: int = 1,
+    report: bool = True,
+    telemetry: Telemetry | None = None,
+    checkpoint: Checkpoint | None = None,
+    cache: EvaluationCache | None = None,
+) -> np.ndarray:
+    """
+    Runs section_optimization over the coarse-to-fine schedule of `levels` levels,
+    each level warm-starting the next finer one, and prints the points, broadening,
+    RMSE, iterations, evaluations and time of each level when `report` is set and
+    there is more than one level. `telemetry` records every evaluation of the fits
+    that run in this process, and `checkpoint` saves the state after every completed
+    step, skipping the steps a loaded checkpoint has already completed. The
+    checkpoint is removed once the schedule completes. Objectives built in this
+    process share `cache`.
+
+    Returns
+    -------
+    np.ndarray
+        Optimized packed parameters
+    """
+    optimized_params = init_params
+    if checkpoint is not None and checkpoint.params is not None:
+        optimized_params = checkpoint.params
+    factors = multiresolution_factors(levels, nmr_array.shape[1])
+    for level, factor in enumerate(factors):
+        if checkpoint is not None and level < checkpoint.level:
+            continue
+        level_array, broadening = smooth_spectrum(nmr_array, factor)
+        history: list[OptimizeResult] = []
+        level_start = perf_counter()
+        optimized_params = section_optimization(
+            level_array,
+            spin,
+            packer,
+            optimized_params,
+            water_range,
+            method,
+            workers,
+            decomposition,
+            broadening,
+            history,
+            telemetry,
+            checkpoint,
+            cache,
+        )
+        cost = QuadrantObjective(
+            spin, packer, level_array[0], level_array[1], broadening, cache
+        )(optimized_params)
+        if checkpoint is not None:
+            checkpoint.save(optimized_params, cost, level=level + 1)
+        if report and len(factors) > 1:
+            # least_squares reports jacobian evaluations rather than iterations
+            iterations = sum(
+                result.get("nit", result.get("njev", 0)) for result in history
+            )
+            evaluations = sum(result.nfev for result in history)
+            print(
+                f"Level {level + 1}/{len(factors)}: {level_array.shape[1]} points, "
+                f"+{broadening:.3g} Hz width, RMSE {cost:.6g}, "
+                f"{iterations} iterations, {evaluations} evaluations, "
+                f"{perf_counter() - level_start:.2f} s",
+                file=stderr,
+            )
+    if checkpoint is not None:
+        checkpoint.finish()
     return optimized_params
 
 
@@ -295,9 +482,77 @@ def optimize_simulation(
     spin: Spin,
     water_range: tuple[float, float],
     water: "Water | None" = None,
+    method: str = "lbfgsb",
+    workers: int = 1,
+    decomposition: str = "quadrants",
+    levels: int = 1,
+    starts: int = 1,
+    seed: int | None = None,
+    telemetry: Telemetry | None = None,
+    checkpoint: Checkpoint | None = None,
+    resume: bool = False,
+    ranked: "list[tuple[float, Spin, Water | None]] | None" = None,
 ) -> "Spin | tuple[Spin, Water]":
     from solventspinsim.simulate import Water
 
+    fits: list[tuple[float, Spin, tuple[float, float, float] | None]] = []
+    optimized_spin, optimized_water = fit_simulation(
+        nmr_file,
+        spin,
+        water_range,
+        (water.frequency, water.intensity, water.hhw) if water is not None else None,
+        method,
+        workers,
+        decomposition,
+        levels,
+        starts,
+        seed,
+        telemetry,
+        checkpoint,
+        resume,
+        fits,
+    )
+    if ranked is not None:
+        ranked.extend(
+            (cost, fit, Water(*fit_water, True) if fit_water is not None else None)
+            for cost, fit, fit_water in fits
+        )
+    if optimized_water is not None:
+        return optimized_spin, Water(*optimized_water, True)
+    return optimized_spin
+
+
+def fit_simulation(
+    nmr_file: str,
+    spin: Spin,
+    water_range: tuple[float, float],
+    water: tuple[float, float, float] | None = None,
+    method: str = "lbfgsb",
+    workers: int = 1,
+    decomposition: str = "quadrants",
+    levels: int = 1,
+    starts: int = 1,
+    seed: int | None = None,
+    telemetry: Telemetry | None = None,
+    checkpoint: Checkpoint | None = None,
+    resume: bool = False,
+    ranked: list[tuple[float, Spin, tuple[float, float, float] | None]] | None = None,
+) -> tuple[Spin, tuple[float, float, float] | None]:
+    """
+    Fits `spin` (and the water peak) to an NMRPipe spectrum like
+    `optimize_simulation`, without building any `Water` object. The water peak is
+    passed and returned as a (frequency, intensity, half-height width) tuple, so the
+    fit can run off the GUI thread, whose `Water` setters update the interface.
+    `ranked` receives the (RMSE, spin, water) of every refined start, best first,
+    so the alternatives of a multi-start fit are kept (a single fit adds one entry).
+
+    Returns
+    -------
+    optimized_spin : Spin
+        Fitted spin system
+    optimized_water : tuple[float, float, float] | None
+        Fitted water frequency, intensity and half-height width, None without water
+    """
     df = nmrPype.DataFrame(nmr_file)
 
     if df.array is None:
@@ -326,80 +581,95 @@ def optimize_simulation(
 
     nmr_array = np.vstack((specValHz, df.array))
 
-    if water is not None:
-        simulate_water = True
-        initial_values: list[float] = [
-            water.frequency,
-            water.intensity,
-            water.hhw,
-            init_sw,
-            init_obs,
-        ]
-    else:
-        initial_values: list[float] = [init_sw, init_obs]
-        simulate_water = False
+    simulate_water = water is not None
+    packer = ParameterPacker(spin, simulate_water)
 
     initial_intensities = [1.0] * spin._nuclei_number
-    matrix_shape = spin._couplings.shape
-    matrix_size: int = spin._couplings.size
-
-    init_params: np.ndarray = np.concatenate(
-        (
-            spin._couplings.flatten(),
-            initial_intensities,
-            initial_values,
-            spin._half_height_width,
-        )
-    )
-
-    optimized_params = section_optimization(
-        nmr_array,
-        spin,
-        matrix_shape,
-        matrix_size,
-        init_params,
-        water_range,
-        simulate_water,
+    init_params: np.ndarray = packer.pack(
+        spin._couplings,
+        initial_intensities,
+        spin._half_height_width,
+        water,
     )
 
-    if simulate_water:
-        (
-            new_couplings,
-            new_intensities,
-            new_water_freq,
-            new_water_intensity,
-            new_water_hhw,
-            new_spec_width,
-            new_obs,
-            new_hhw,
-        ) = unpack_params_water(optimized_params, matrix_size, matrix_shape)
-
-        optimized_spin = Spin(
-            spin.spin_names,
-            spin._ppm_nuclei_frequencies,
-            new_couplings,
-            list(new_hhw),
-            spin._field_strength,
-            list(new_intensities),
+    if checkpoint is not None:
+        if starts != 1:
+            raise ValueError("Multi-start fits cannot be checkpointed")
+        signature = fit_signature(
+            nmr_array,
+            spin._nuclei_frequencies,
+            init_params,
+            water_range,
+            method,
+            decomposition,
+            levels,
         )
-        optimized_water = Water(
-            new_water_freq, new_water_intensity, new_water_hhw, True
+        if not (resume and checkpoint.load(signature)):
+            checkpoint.signature = signature
+
+    if starts != 1:
+        results = multistart_optimization(
+            nmr_array,
+            spin,
+            packer,
+            init_params,
+            water_range,
+            starts,
+            seed,
+            method,
+            workers,
+            decomposition,
+            levels,
+            telemetry,
         )
-
-        print("Optimization Complete!", file=stderr)
-        return optimized_spin, optimized_water
+        for rank, (cost, _) in enumerate(results):
+            print(f"Start {rank + 1}/{len(results)}: RMSE {cost:.6g}", file=stderr)
+        optimized_params = results[0][1]
     else:
-        new_couplings, new_intensities, new_spec_width, new_obs, new_hhw = (
-            unpack_params(optimized_params, matrix_size, matrix_shape)
+        cache = EvaluationCache()
+        optimized_params = _fit_schedule(
+            nmr_array,
+            spin,
+            packer,
+            init_params,
+            water_range,
+            method,
+            workers,
+            decomposition,
+            levels,
+            telemetry=telemetry,
+            checkpoint=checkpoint,
+            cache=cache,
         )
-
-        optimized_spin = Spin(
-            spin.spin_names,
-            spin._ppm_nuclei_frequencies,
-            new_couplings,
-            list(new_hhw),
-            spin._field_strength,
-            list(new_intensities),
+        print(cache.summary(), file=stderr)
+        if ranked is not None:
+            objective = QuadrantObjective(spin, packer, nmr_array[0], nmr_array[1])
+            results = [(objective(optimized_params), optimized_params)]
+
+    if ranked is not None:
+        ranked.extend(
+            (cost, *_unpack_fit(spin, packer, params)) for cost, params in results
         )
-        print("Optimization Complete!", file=stderr)
-        return optimized_spin
+    print("Optimization Complete!", file=stderr)
+    return _unpack_fit(spin, packer, optimized_params)
+
+
+def _unpack_fit(
+    spin: Spin, packer: ParameterPacker, params: np.ndarray
+) -> tuple[Spin, tuple[float, float, float] | None]:
+    """Returns the spin and water (frequency, intensity, width) of packed parameters."""
+    new_couplings, new_intensities, new_hhw, new_water = packer.unpack(params)
+    optimized_spin = Spin(
+        spin.spin_names,
+        spin._ppm_nuclei_frequencies,
+        new_couplings,
+        list(new_hhw),
+        spin._field_strength,
+        list(new_intensities),
+        spin.coupling_strength,
+        spin.coupling_tolerance,
+        packer.groups,
+    )
+    if new_water is not None:
+        return optimized_spin, tuple(float(value) for value in new_water)
+    return optimized_spin, None
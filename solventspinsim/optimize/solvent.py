@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class SolventLineshape(ABC):
+    """
+    Shape of the solvent (water) peak. Subclasses evaluate one line of the shape in
+    place on a data axis and project a residual onto its derivatives, and are
+    registered in SOLVENT_LINESHAPES under their `name`.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def add(
+        self,
+        x: np.ndarray,
+        center: float,
+        intensity: float,
+        hhw: float,
+        out: np.ndarray,
+        scratch: np.ndarray,
+    ) -> None:
+        """Adds the line at each point of `x` to `out`, using `scratch` as workspace."""
+
+    @abstractmethod
+    def gradient(
+        self,
+        x: np.ndarray,
+        residual: np.ndarray,
+        center: float,
+        intensity: float,
+        hhw: float,
+        scratch: np.ndarray,
+    ) -> np.ndarray:
+        """Returns sum(residual * dL/dparameter) for the center, intensity and width."""
+
+
+class LorentzianLineshape(SolventLineshape):
+    """Lorentzian solvent line, matching the lines of `simulate.simulate.lorentz`."""
+
+    name: str = "lorentzian"
+
+    def add(
+        self,
+        x: np.ndarray,
+        center: float,
+        intensity: float,
+        hhw: float,
+        out: np.ndarray,
+        scratch: np.ndarray,
+    ) -> None:
+        if hhw == 0.0:
+            hhw = 1e-6
+        quarter_hhw_sq = (0.5 * hhw) ** 2
+        np.subtract(x, center, out=scratch)
+        np.square(scratch, out=scratch)
+        scratch += quarter_hhw_sq
+        np.divide(quarter_hhw_sq, scratch, out=scratch)
+        scratch *= (0.5 / hhw) * intensity
+        out += scratch
+
+    def gradient(
+        self,
+        x: np.ndarray,
+        residual: np.ndarray,
+        center: float,
+        intensity: float,
+        hhw: float,
+        scratch: np.ndarray,
+    ) -> np.ndarray:
+        # Same derivatives as `gradient.line_gradients`, for a single line
+        np.subtract(x, center, out=scratch)
+        distance = scratch.copy()
+        np.square(scratch, out=scratch)
+        scratch *= 4
+        scratch += hhw * hhw
+        np.reciprocal(scratch, out=scratch)
+        weighted = residual * scratch
+        d_intensity = 0.5 * hhw * weighted.sum()
+        weighted *= scratch
+        first = np.dot(weighted, distance)
+        distance *= distance
+        second = np.dot(weighted, distance)
+        d_center = 4 * intensity * hhw * first
+        d_width = 0.5 * intensity * (4 * second - hhw * hhw * weighted.sum())
+        return np.array([d_center, d_intensity, d_width])
+
+
+# Solvent lineshapes by name
+SOLVENT_LINESHAPES: dict[str, type[SolventLineshape]] = {
+    LorentzianLineshape.name: LorentzianLineshape,
+}
+
+
+class SolventModel:
+    """
+    Solvent peak of a fit evaluated directly on the axis of the fit region. The
+    line is added in place to a simulation that already holds the spin system, so
+    an evaluation allocates nothing and never touches points outside the region.
+
+    Attributes
+    ----------
+    lineshape : SolventLineshape
+        Shape of the solvent peak
+    broadening : float
+        Width (in Hz) added to the solvent half-height width
+    """
+
+    def __init__(self, lineshape: str = "lorentzian", broadening: float = 0.0) -> None:
+        if lineshape not in SOLVENT_LINESHAPES:
+            raise ValueError(
+                f"Unknown solvent lineshape '{lineshape}', "
+                f"expected one of {tuple(SOLVENT_LINESHAPES)}"
+            )
+        self.lineshape: SolventLineshape = SOLVENT_LINESHAPES[lineshape]()
+        self.broadening: float = broadening
+        self._scratch: np.ndarray = np.empty(0)
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def add(
+        self,
+        x: np.ndarray,
+        water: np.ndarray | tuple[float, float, float],
+        out: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Adds the solvent peak to a simulation
+
+        Parameters
+        ----------
+        x : np.ndarray
+            Frequency (in Hz) of each point of the region
+        water : np.ndarray | tuple[float, float, float]
+            Water frequency, intensity and half-height width
+        out : np.ndarray
+            Simulation of the region, updated in place
+
+        Returns
+        -------
+        np.ndarray
+            `out`
+        """
+        center, intensity, hhw = water
+        self.lineshape.add(
+            x, center, intensity, hhw + self.broadening, out, self._workspace(x)
+        )
+        return out
+
+    def gradient(
+        self,
+        x: np.ndarray,
+        water: np.ndarray | tuple[float, float, float],
+        residual: np.ndarray,
+    ) -> np.ndarray:
+        """Returns sum(residual * dL/dparameter) for each water parameter."""
+        center, intensity, hhw = water
+        return self.lineshape.gradient(
+            x, residual, center, intensity, hhw + self.broadening, self._workspace(x)
+        )
+
+    # ---------------------------------------------------------------------------- #
+    #                               Helper Functions                               #
+    # ---------------------------------------------------------------------------- #
+
+    def _workspace(self, x: np.ndarray) -> np.ndarray:
+        """Returns a scratch array the length of `x`, reused between calls."""
+        if len(self._scratch) != len(x):
+            self._scratch = np.empty(len(x))
+        return self._scratch
@@ -0,0 +1,162 @@
+from sys import stderr
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .objective import QuadrantObjective, SubsetObjective
+
+# Default maximum number of snapshots published per second
+TELEMETRY_RATE: float = 10.0
+
+
+class OptimizationSnapshot:
+    """
+    State of a running fit published to telemetry subscribers: the region being
+    fitted, the best simulation found so far and the full per-nucleus parameters that
+    produced it.
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        Frequency (in Hz) and measured intensity of each point of the region
+    simulation : np.ndarray
+        Simulated intensity of each point of the region
+    couplings : np.ndarray
+        2D matrix (n x n) of scalar coupling constants (in Hz)
+    intensities, hhw : np.ndarray
+        Relative intensity and half-height width (in Hz) of each nucleus
+    water : tuple[float, float, float] | None
+        Water frequency, intensity and half-height width, or None without water
+    cost : float
+        RMSE of the simulation over the region
+    evaluations : int
+        Number of objective evaluations of the fit so far
+    """
+
+    __slots__ = (
+        "x",
+        "y",
+        "simulation",
+        "couplings",
+        "intensities",
+        "hhw",
+        "water",
+        "cost",
+        "evaluations",
+    )
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        simulation: np.ndarray,
+        couplings: np.ndarray,
+        intensities: np.ndarray,
+        hhw: np.ndarray,
+        water: tuple[float, float, float] | None = None,
+        cost: float = np.nan,
+        evaluations: int = 0,
+    ) -> None:
+        self.x: np.ndarray = x
+        self.y: np.ndarray = y
+        self.simulation: np.ndarray = simulation
+        self.couplings: np.ndarray = couplings
+        self.intensities: np.ndarray = intensities
+        self.hhw: np.ndarray = hhw
+        self.water: tuple[float, float, float] | None = water
+        self.cost: float = cost
+        self.evaluations: int = evaluations
+
+
+class Telemetry:
+    """
+    Rate-limited progress channel of a fit. Every objective evaluation is recorded
+    at the cost of a comparison (and a parameter copy when it improves on the best
+    of its region), while snapshots of the best parameters so far are only built and
+    published to the subscribers at most `rate` times per second, and once more when
+    each region fit ends. Display cost therefore no longer grows with the number of
+    evaluations, including finite-difference probes.
+
+    Attributes
+    ----------
+    rate : float
+        Maximum number of snapshots published per second
+    subscribers : list[Callable[[OptimizationSnapshot], None]]
+        Functions called with every published snapshot
+    evaluations : int
+        Number of evaluations recorded over every region
+    published : int
+        Number of snapshots published
+    """
+
+    def __init__(
+        self,
+        rate: float = TELEMETRY_RATE,
+        subscribers: list[Callable[[OptimizationSnapshot], None]] | None = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Telemetry rate must be positive, got {rate}")
+        self.rate: float = rate
+        self.subscribers: list[Callable[[OptimizationSnapshot], None]] = list(
+            subscribers or []
+        )
+        self.evaluations: int = 0
+        self.published: int = 0
+        self._interval: float = 1.0 / rate
+        self._last: float = -np.inf
+        self._objective: "QuadrantObjective | SubsetObjective | None" = None
+        self._best_cost: float = np.inf
+        self._best_params: np.ndarray | None = None
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def subscribe(self, subscriber: Callable[[OptimizationSnapshot], None]) -> None:
+        """Adds a function called with every published snapshot."""
+        self.subscribers.append(subscriber)
+
+    def begin(self, objective: "QuadrantObjective | SubsetObjective") -> None:
+        """Starts tracking the best parameters of a new region fit."""
+        self._objective = objective
+        self._best_cost = np.inf
+        self._best_params = None
+
+    def record(self, params: np.ndarray, cost: float) -> None:
+        """Records one evaluation, publishing the best so far when one is due."""
+        self.evaluations += 1
+        if cost < self._best_cost:
+            self._best_cost = cost
+            self._best_params = np.array(params, dtype=np.float64)
+        if perf_counter() - self._last >= self._interval:
+            self.publish()
+
+    def end(self) -> None:
+        """Publishes the best parameters of the region fit that just finished."""
+        self.publish()
+        self._objective = None
+
+    def publish(self) -> None:
+        """Sends a snapshot of the best parameters so far to every subscriber."""
+        if self._objective is None or self._best_params is None:
+            return
+        snapshot = self._objective.snapshot(self._best_params)
+        snapshot.cost = self._best_cost
+        snapshot.evaluations = self.evaluations
+        self._last = perf_counter()
+        self.published += 1
+        for subscriber in self.subscribers:
+            subscriber(snapshot)
+
+
+def print_progress(snapshot: OptimizationSnapshot) -> None:
+    """Telemetry subscriber printing the best RMSE so far on one stderr line."""
+    print(
+        f"\rOptimizing: RMSE {snapshot.cost:.6g} "
+        f"after {snapshot.evaluations} evaluations",
+        end="",
+        file=stderr,
+        flush=True,
+    )
@@ -0,0 +1,197 @@
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from solventspinsim.spin import Spin
+
+from .cache import EvaluationCache
+from .checkpoint import Checkpoint
+from .helper import ParameterPacker
+from .objective import QuadrantObjective, SubsetObjective
+from .telemetry import Telemetry
+
+# Half-height widths beyond its multiplet that a fit window extends, a line has fallen
+# below 0.3% of its height at that distance
+WINDOW_REACH_WIDTHS: float = 10.0
+
+# Block-coordinate descent stops after this many sweeps over the windows, or earlier
+# once no parameter changes by more than WINDOW_TOLERANCE of its magnitude
+WINDOW_SWEEPS: int = 5
+WINDOW_TOLERANCE: float = 1e-4
+
+
+def window_clusters(
+    packer: ParameterPacker,
+    frequencies: list[float] | np.ndarray,
+    params: np.ndarray,
+    water_limits: tuple[float, float] | None = None,
+    reach_widths: float = WINDOW_REACH_WIDTHS,
+) -> list[tuple[np.ndarray, bool, tuple[float, float]]]:
+    """
+    Splits the groups of equivalent nuclei into clusters fitted in separate windows.
+    Each group spans its center plus or minus its multiplet half-span and
+    `reach_widths` half-height widths (the extent `zoom_subplots_to_peaks` zooms to).
+    Groups whose spans overlap share a cluster, and the water peak joins the cluster
+    overlapping the water limits.
+
+    Parameters
+    ----------
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    frequencies : list[float] | np.ndarray
+        Resonance frequency (in Hz) of each nucleus
+    params : np.ndarray
+        Packed parameter vector the spans are estimated from
+    water_limits : tuple[float, float] | None, optional
+        Lower and upper bound of the water frequency, required when water is simulated
+    reach_widths : float, optional
+        Number of half-height widths a window extends past a multiplet, by default 10
+
+    Returns
+    -------
+    list[tuple[np.ndarray, bool, tuple[float, float]]]
+        Groups, whether the water peak is included and (low, high) frequency window
+        (in Hz) of each cluster, ordered by frequency
+    """
+    centers, reach = packer.group_reach(frequencies, params, reach_widths)
+    lows, highs = list(centers - reach), list(centers + reach)
+    members: list[int] = list(range(len(centers)))
+    if packer.simulate_water:
+        if water_limits is None:
+            raise ValueError("Water limits are required for water windows")
+        water_hhw = params[packer.water][2]
+        lows.append(min(water_limits) - reach_widths * water_hhw)
+        highs.append(max(water_limits) + reach_widths * water_hhw)
+        # -1 marks the water peak
+        members.append(-1)
+
+    clusters: list[tuple[np.ndarray, bool, tuple[float, float]]] = []
+    current: list[int] = []
+    low = high = 0.0
+    for index in np.argsort(lows, kind="stable"):
+        if current and lows[index] > high:
+            clusters.append(_cluster(current, (low, high)))
+            current = []
+        if not current:
+            low, high = lows[index], highs[index]
+        high = max(high, highs[index])
+        current.append(members[index])
+    if current:
+        clusters.append(_cluster(current, (low, high)))
+    return clusters
+
+
+def fit_windows(
+    nmr_array: np.ndarray,
+    spin: Spin,
+    packer: ParameterPacker,
+    init_params: np.ndarray,
+    param_bounds: list[tuple[float, float]],
+    method: str,
+    water_limits: tuple[float, float],
+    broadening: float = 0.0,
+    history: list[OptimizeResult] | None = None,
+    telemetry: Telemetry | None = None,
+    checkpoint: Checkpoint | None = None,
+    cache: EvaluationCache | None = None,
+    sweeps: int = WINDOW_SWEEPS,
+    tolerance: float = WINDOW_TOLERANCE,
+) -> np.ndarray:
+    """
+    Fits a spin system window by window with block-coordinate descent. Each sweep
+    fits every cluster of `window_clusters` on the points of its window only, varying
+    only the parameters of its groups while every other parameter keeps its current
+    value. Couplings between groups of different clusters are varied by both
+    clusters, so later windows refine them with the latest values of earlier ones.
+    Sweeps repeat until the parameters settle or `sweeps` is reached, and a
+    `checkpoint` is saved after each of them.
+
+    Parameters
+    ----------
+    nmr_array : np.ndarray
+        (2 x points) frequency (in Hz) and intensity of the measured spectrum
+    spin : Spin
+        Initial spin system
+    packer : ParameterPacker
+        Packer defining the layout of the parameter vector
+    init_params : np.ndarray
+        Packed starting parameters
+    param_bounds : list[tuple[float, float]]
+        (lower, upper) bound of each packed parameter
+    method : str
+        Fitting engine, one of OPTIMIZATION_METHODS
+    water_limits : tuple[float, float]
+        Lower and upper bound of the water frequency
+    broadening : float, optional
+        Width (in Hz) added to every simulated half-height width, by default 0
+    history : list[OptimizeResult] | None, optional
+        List the result of every window fit is appended to, by default None
+    telemetry : Telemetry | None, optional
+        Channel every evaluation is recorded to, by default None
+    checkpoint : Checkpoint | None, optional
+        Checkpoint saved after every sweep, whose completed sweeps are skipped, by
+        default None
+    cache : EvaluationCache | None, optional
+        Store of evaluations shared by the window objectives, by default None
+    sweeps : int, optional
+        Maximum number of sweeps over the windows, by default 5
+    tolerance : float, optional
+        Largest relative parameter change of a sweep considered converged, by default 1e-4
+
+    Returns
+    -------
+    np.ndarray
+        Optimized packed parameters
+    """
+    from .optimize import _fit_quadrant
+
+    x, y = nmr_array[0], nmr_array[1]
+    frequencies = np.asarray(spin._nuclei_frequencies, dtype=np.float64)
+    params = np.array(init_params, dtype=np.float64)
+    first_sweep = checkpoint.sweep if checkpoint is not None else 0
+    for sweep in range(first_sweep, sweeps):
+        previous = params.copy()
+        for groups, water, (low, high) in window_clusters(
+            packer, frequencies, params, water_limits
+        ):
+            inside = (x >= low) & (x <= high)
+            if not inside.any():
+                continue
+            free = packer.parameter_indices(groups, water)
+            objective = SubsetObjective(
+                QuadrantObjective(
+                    spin, packer, x[inside], y[inside], broadening, cache
+                ),
+                params,
+                free,
+            )
+            result = _fit_quadrant(
+                objective,
+                params[free],
+                [param_bounds[i] for i in free],
+                method,
+                water_limits,
+                telemetry,
+            )
+            params[free] = result.x
+            if history is not None:
+                history.append(result)
+        if checkpoint is not None:
+            cost = QuadrantObjective(spin, packer, x, y, broadening, cache)(params)
+            checkpoint.save(params, cost, sweep=sweep + 1)
+        change = np.abs(params - previous) / np.maximum(np.abs(previous), 1.0)
+        if change.max(initial=0.0) <= tolerance:
+            break
+    return params
+
+
+# ---------------------------------------------------------------------------- #
+#                               Helper Functions                               #
+# ---------------------------------------------------------------------------- #
+
+
+def _cluster(
+    members: list[int], window: tuple[float, float]
+) -> tuple[np.ndarray, bool, tuple[float, float]]:
+    """Splits cluster members into group indices and the water flag."""
+    groups = np.array(sorted(m for m in members if m >= 0), dtype=np.intp)
+    return groups, -1 in members, window
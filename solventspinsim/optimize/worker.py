@@ -0,0 +1,111 @@
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import Any, Callable
+
+from .telemetry import OptimizationSnapshot, Telemetry
+
+
+class OptimizationCancelled(Exception):
+    """Raised inside a fit once its worker has been cancelled."""
+
+
+class OptimizationWorker:
+    """
+    Runs a fit on a background thread so that the render loop never waits for it.
+    The fit function receives `telemetry` as its `telemetry` keyword. The worker's
+    `observe` method subscribes to it, posting every published snapshot to `messages`
+    and aborting the fit by raising `OptimizationCancelled` once `cancel` has been
+    called.
+
+    Messages are (kind, value) tuples, where kind is one of:
+
+        - "progress": value is an OptimizationSnapshot
+        - "done": value is the return value of the fit function
+        - "cancelled": value is None
+        - "error": value is the exception raised by the fit function
+
+    and the last message of every run is "done", "cancelled" or "error".
+
+    Attributes
+    ----------
+    messages : Queue
+        Thread-safe queue of posted messages
+    telemetry : Telemetry
+        Channel the fit publishes its progress to
+    """
+
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        *args,
+        telemetry: Telemetry | None = None,
+        **kwargs,
+    ) -> None:
+        self.messages: Queue = Queue()
+        self.telemetry: Telemetry = telemetry if telemetry is not None else Telemetry()
+        self.telemetry.subscribe(self.observe)
+        self._function: Callable[..., Any] = function
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel: Event = Event()
+        self._thread: Thread = Thread(
+            target=self._run, name="optimization", daemon=True
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the fit thread is still alive"""
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested"""
+        return self._cancel.is_set()
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def start(self) -> None:
+        """Starts the fit on its thread."""
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Requests the fit to stop at its next published snapshot."""
+        self._cancel.set()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Waits up to `timeout` seconds for the fit thread to finish."""
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def observe(self, snapshot: OptimizationSnapshot) -> None:
+        """Posts a snapshot, raising OptimizationCancelled once cancelled."""
+        if self._cancel.is_set():
+            raise OptimizationCancelled()
+        self.messages.put(("progress", snapshot))
+
+    def drain(self) -> list[tuple[str, Any]]:
+        """Returns every message posted since the last call, oldest first."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except Empty:
+                return messages
+
+    # ---------------------------------------------------------------------------- #
+    #                               Helper Functions                               #
+    # ---------------------------------------------------------------------------- #
+
+    def _run(self) -> None:
+        try:
+            result = self._function(
+                *self._args, telemetry=self.telemetry, **self._kwargs
+            )
+        except OptimizationCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as error:
+            self.messages.put(("error", error))
+        else:
+            self.messages.put(("done", result))
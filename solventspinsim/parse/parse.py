@@ -18,7 +18,10 @@ def build_parser() -> argparse.ArgumentParser:
                 field_strength=None, water_range=None,
                 sim_enabled=False, points=None, intensity=None,
                 hhw=None, sim_use_settings=False, opt_enabled=False,
-                water_bounds=None, plot_enabled=False, plot_height=None,
+                water_bounds=None, opt_method=None, opt_workers=None,
+                opt_decomposition=None, opt_levels=None, opt_starts=None,
+                opt_seed=None, opt_telemetry_rate=None, opt_checkpoint=None,
+                opt_resume=False, plot_enabled=False, plot_height=None,
                 x=None, y=None, water_enable=False, water_frequency=None,
                 water_intensity=None, water_hhw=None, title=None)
     """
@@ -138,6 +141,62 @@ def build_parser() -> argparse.ArgumentParser:
         dest="water_bounds",
         help="Water signal left and right bounds (in Hz)",
     )
+    parser.add_argument(
+        "--opt-method",
+        type=str,
+        choices=["lbfgsb", "least_squares"],
+        dest="opt_method",
+        help="Fitting engine: L-BFGS-B on the RMSE or sparse least squares (trf)",
+    )
+    parser.add_argument(
+        "--opt-workers",
+        type=int,
+        dest="opt_workers",
+        help="Number of processes fitting the water-delimited regions concurrently",
+    )
+    parser.add_argument(
+        "--opt-decomposition",
+        type=str,
+        choices=["quadrants", "windows"],
+        dest="opt_decomposition",
+        help="Fit the water-delimited quadrants or one window per multiplet cluster",
+    )
+    parser.add_argument(
+        "--opt-levels",
+        type=int,
+        dest="opt_levels",
+        help="Number of coarse-to-fine resolution levels of the fit (1 for full only)",
+    )
+    parser.add_argument(
+        "--opt-starts",
+        type=int,
+        dest="opt_starts",
+        help="Number of perturbed starting points of a multi-start fit",
+    )
+    parser.add_argument(
+        "--opt-seed",
+        type=int,
+        dest="opt_seed",
+        help="Seed of the multi-start sampler, for reproducible fits",
+    )
+    parser.add_argument(
+        "--opt-telemetry-rate",
+        type=float,
+        dest="opt_telemetry_rate",
+        help="Maximum number of progress updates per second during a fit",
+    )
+    parser.add_argument(
+        "--opt-checkpoint",
+        type=str,
+        dest="opt_checkpoint",
+        help="File the fit state is saved to after every completed step",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        dest="opt_resume",
+        help="Resume an interrupted fit from its checkpoint file",
+    )
 
     # Plot window settings
     parser.add_argument(
@@ -222,6 +281,15 @@ class SettingsArguments(argparse.Namespace):
         sim_use_settings: bool,
         opt_enabled: bool,
         water_bounds: list[float],
+        opt_method: str | None,
+        opt_workers: int | None,
+        opt_decomposition: str | None,
+        opt_levels: int | None,
+        opt_starts: int | None,
+        opt_seed: int | None,
+        opt_telemetry_rate: float | None,
+        opt_checkpoint: str | None,
+        opt_resume: bool,
         plot_enabled: bool,
         plot_height: int | None,
         plot_x_label: str | None,
@@ -253,6 +321,15 @@ class SettingsArguments(argparse.Namespace):
         # Optimization settings
         self.opt_enabled: bool = opt_enabled
         self.water_bounds: list[float] = water_bounds
+        self.opt_method: str | None = opt_method
+        self.opt_workers: int | None = opt_workers
+        self.opt_decomposition: str | None = opt_decomposition
+        self.opt_levels: int | None = opt_levels
+        self.opt_starts: int | None = opt_starts
+        self.opt_seed: int | None = opt_seed
+        self.opt_telemetry_rate: float | None = opt_telemetry_rate
+        self.opt_checkpoint: str | None = opt_checkpoint
+        self.opt_resume: bool = opt_resume
 
         # Plot window settings
         self.plot_enabled: bool = plot_enabled
@@ -288,6 +365,15 @@ def parse_args(argv: list[str] | None = None) -> SettingsArguments:
         args.sim_use_settings,
         args.opt_enabled,
         args.water_bounds,
+        args.opt_method,
+        args.opt_workers,
+        args.opt_decomposition,
+        args.opt_levels,
+        args.opt_starts,
+        args.opt_seed,
+        args.opt_telemetry_rate,
+        args.opt_checkpoint,
+        args.opt_resume,
         args.plot_enabled,
         args.plot_height,
         args.plot_x_label,
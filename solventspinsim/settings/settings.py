@@ -62,6 +62,21 @@ class Settings:
             self._set_attribute(
                 "opt_settings", "water_right", value=args.water_bounds[1]
             )
+        self._set_attribute("opt_settings", "method", value=args.opt_method)
+        self._set_attribute("opt_settings", "workers", value=args.opt_workers)
+        self._set_attribute(
+            "opt_settings", "decomposition", value=args.opt_decomposition
+        )
+        self._set_attribute("opt_settings", "levels", value=args.opt_levels)
+        self._set_attribute("opt_settings", "starts", value=args.opt_starts)
+        self._set_attribute("opt_settings", "seed", value=args.opt_seed)
+        self._set_attribute(
+            "opt_settings", "telemetry_rate", value=args.opt_telemetry_rate
+        )
+        self._set_attribute("opt_settings", "checkpoint", value=args.opt_checkpoint)
+        # --resume only turns resuming on, so that it keeps a resume set in the file
+        if args.opt_resume:
+            self._set_attribute("opt_settings", "resume", value=True)
 
         # Plot window settings
         if not self.values["plot_window"]:
@@ -117,6 +132,8 @@ class Settings:
             "coupling_strength": "weak"
             if ui.current_spin.coupling_strength.value == 0
             else "strong",
+            "coupling_tolerance": ui.current_spin.coupling_tolerance,
+            "equivalent_groups": ui.current_spin._equivalent_groups,
         }
         spin["couplings"] = [list(c) for c in ui.current_spin._couplings]
 
@@ -138,6 +155,15 @@ class Settings:
             "is_enabled": ui.opt_settings.is_enabled,
             "water_left": ui.opt_settings[OptimizationSettings.water_left_tag],
             "water_right": ui.opt_settings[OptimizationSettings.water_right_tag],
+            "method": ui.opt_settings.method,
+            "workers": ui.opt_settings.workers,
+            "decomposition": ui.opt_settings.decomposition,
+            "levels": ui.opt_settings.levels,
+            "starts": ui.opt_settings.starts,
+            "seed": ui.opt_settings.seed,
+            "telemetry_rate": ui.opt_settings.telemetry_rate,
+            "checkpoint": ui.opt_settings.checkpoint,
+            "resume": ui.opt_settings.resume,
         }
         self.values["opt_settings"] = opt_settings
         # Plot Window Object
@@ -182,6 +208,8 @@ class Settings:
         field_strength = spin.get("field_strength", 500.0)
         intensities = spin.get("intensities", [])
         coupling_strength = spin.get("coupling_strength", "weak")
+        coupling_tolerance = spin.get("coupling_tolerance", 0.0)
+        equivalent_groups = spin.get("equivalent_groups", None)
         loaded_spin = Spin(
             spin_names,
             ppm_nuclei_frequencies,
@@ -190,6 +218,8 @@ class Settings:
             field_strength,
             intensities,
             coupling_strength,
+            coupling_tolerance,
+            equivalent_groups,
         )
         ui.current_spin = loaded_spin
 
@@ -226,6 +256,15 @@ class Settings:
         ui.opt_settings[OptimizationSettings.water_right_tag] = opt_settings.get(
             "water_right", 10.0
         )
+        ui.opt_settings.method = opt_settings.get("method", "lbfgsb")
+        ui.opt_settings.workers = opt_settings.get("workers", 1)
+        ui.opt_settings.decomposition = opt_settings.get("decomposition", "quadrants")
+        ui.opt_settings.levels = opt_settings.get("levels", 1)
+        ui.opt_settings.starts = opt_settings.get("starts", 1)
+        ui.opt_settings.seed = opt_settings.get("seed", None)
+        ui.opt_settings.telemetry_rate = opt_settings.get("telemetry_rate", 10.0)
+        ui.opt_settings.checkpoint = opt_settings.get("checkpoint", None)
+        ui.opt_settings.resume = opt_settings.get("resume", False)
         ui.opt_settings.update_ui_values()
 
         # Plot Window Object
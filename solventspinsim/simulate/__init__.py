@@ -1,4 +1,5 @@
 from .water import Water
 from .simulate import simulate_peaklist
+from .cache import SpectrumCache
 
-__all__ = ["Water", "simulate_peaklist"]
\ No newline at end of file
+__all__ = ["SpectrumCache", "Water", "simulate_peaklist"]
@@ -0,0 +1,124 @@
+import numpy as np
+
+from solventspinsim.simulate.simulate import (
+    frequency_axis,
+    peak_arrays,
+    simulate_lorentzians_batched,
+)
+from solventspinsim.simulate.types import PeakArray, PeakLike, PeakTable
+
+# Incremental updates after which the total is summed again from its components,
+# bounding the rounding error accumulated by subtracting and adding spectra
+SPECTRUM_RESUM_INTERVAL: int = 256
+
+
+class SpectrumCache:
+    """
+    Spectrum of a peaklist kept as one component per nucleus, for interactive edits.
+    Each call compares the lines of every nucleus with those of the previous call and
+    only simulates the components whose lines changed, updating the total by
+    subtracting their old spectrum and adding the new one. Dragging one nucleus, or
+    editing one coupling, therefore simulates the lines of the nuclei it moves
+    instead of the whole system. Changing the frequency axis (the number of points,
+    or the range when the outermost peaks move) resets every component.
+
+    Attributes
+    ----------
+    resum_interval : int
+        Incremental updates after which the total is summed again from its components
+    recomputed : int
+        Number of components simulated by the latest call
+    """
+
+    def __init__(self, resum_interval: int = SPECTRUM_RESUM_INTERVAL) -> None:
+        self.resum_interval: int = resum_interval
+        self.recomputed: int = 0
+        self._x: PeakArray | None = None
+        self._total: PeakArray | None = None
+        self._components: dict[int, tuple[PeakArray, PeakArray]] = {}
+        self._updates: int = 0
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def simulate(
+        self,
+        peaklist: PeakLike,
+        points: int = 800,
+        half_height_width: list[float | int] | float | int = 1,
+        freq_limits: tuple[float, float] | None = None,
+    ) -> PeakArray:
+        """
+        Simulates the NMR spectrum represented by the peaklist, reusing the components
+        of the previous call whose lines did not change
+
+        Parameters
+        ----------
+        peaklist : PeakTable | list[tuple[float,float, int]]
+            A table of peaks representing the simulated NMR spectrum for the given spin system
+        points : int, optional
+            Number of points in the entire spectrum, by default 800
+        half_height_width : list[float | int] | float | int, optional
+            Linewidth at half height (in Hz), either shared or indexed by nucleus
+        freq_limits : tuple[float,float] | None, optional
+            Frequency bounds for the simulation, by default None
+
+        Returns
+        -------
+        2D PeakArray : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+            2D numpy array of shape (2, points) simulated NMR data, matching
+            `simulate_peaklist` up to rounding
+        """
+        table: PeakTable = PeakTable.from_peaks(peaklist).sorted()
+        x = frequency_axis(table, points, freq_limits)
+        if self._x is None or not np.array_equal(x, self._x):
+            self.clear()
+            self._x = x
+            self._total = np.zeros(len(x))
+
+        # (3 x lines) centers, intensities and widths of each nucleus, in frequency order
+        lines = np.vstack(peak_arrays(table, half_height_width))
+        order = np.argsort(table.nucleus, kind="stable")
+        nuclei, starts = np.unique(table.nucleus[order], return_index=True)
+        current = dict(
+            zip(nuclei.tolist(), np.split(lines[:, order], starts[1:], axis=1))
+        )
+
+        self.recomputed = 0
+        for nucleus in [n for n in self._components if n not in current]:
+            self._replace(nucleus, None)
+        for nucleus, component_lines in current.items():
+            cached = self._components.get(nucleus)
+            if cached is None or not np.array_equal(cached[0], component_lines):
+                self._replace(nucleus, component_lines)
+
+        if self._updates >= self.resum_interval:
+            self._total.fill(0.0)
+            for _, spectrum in self._components.values():
+                self._total += spectrum
+            self._updates = 0
+        return np.vstack((x, self._total))
+
+    def clear(self) -> None:
+        """Removes every component."""
+        self._x = None
+        self._total = None
+        self._components.clear()
+        self._updates = 0
+
+    # ---------------------------------------------------------------------------- #
+    #                               Helper Functions                               #
+    # ---------------------------------------------------------------------------- #
+
+    def _replace(self, nucleus: int, lines: PeakArray | None) -> None:
+        """Swaps the component of a nucleus for the spectrum of `lines` (or none)."""
+        previous = self._components.pop(nucleus, None)
+        if previous is not None:
+            self._total -= previous[1]
+        if lines is not None:
+            spectrum = simulate_lorentzians_batched(self._x, *lines)
+            self._total += spectrum
+            self._components[nucleus] = (lines, spectrum)
+            self.recomputed += 1
+        self._updates += 1
@@ -1,27 +1,51 @@
 import numpy as np
 
-from solventspinsim.simulate.types import PeakArray, PeakList
+from solventspinsim.simulate.types import PeakArray, PeakLike, PeakTable
+
+# Maximum size (in bytes) of a single (peaks x points) block of lorentzians
+LORENTZ_MEMORY_BUDGET: int = 1024 * 1024
+# Default maximum absolute error of the whole spectrum for windowed lorentzians
+WINDOW_MAX_ERROR: float = 1e-6
+# Minimum samples per half-height width for a peak to be binned by the FFT engine.
+# Binning errs by up to about (1 / samples)^2 of each peak's height, so 0.1% at 32
+FFT_MIN_WIDTH_SAMPLES: float = 32.0
 
 
 def simulate_peaklist(
-    peaklist: PeakList,
+    peaklist: PeakLike,
     points: int = 800,
     half_height_width: list[float | int] | float | int = 1,
     freq_limits: tuple[float, float] | None = None,
+    method: str = "batched",
+    max_error: float = WINDOW_MAX_ERROR,
+    min_width_samples: float = FFT_MIN_WIDTH_SAMPLES,
 ) -> PeakArray:
     """
     Simulate the NMR spectrum represented by the peaklist
 
     Parameters
     ----------
-    peaklist : list[tuple[float,float, int]]
-        A list of peaks representing the simulated NMR spectrum for the given spin system
+    peaklist : PeakTable | list[tuple[float,float, int]]
+        A table of peaks representing the simulated NMR spectrum for the given spin system
     points : int, optional
         Number of points in the entire spectrum, by default 800
     half_height_width : float | int, optional
         Linewidth at half height (in Hz) for each lorentzian
     freq_limits : tuple[float,float] | None, optional
         Frequency bounds for the simulation, by default None
+    method : str, optional
+        Lorentzian engine used to build the intensity axis, by default "batched"
+
+            - "batched": See documentation at `simulate.simulate.simulate_lorentzians_batched`
+            - "windowed": See documentation at `simulate.simulate.simulate_lorentzians_windowed`
+            - "fft": See documentation at `simulate.simulate.simulate_lorentzians_fft`
+            - "loop": See documentation at `simulate.simulate.simulate_lorentzians`
+    max_error : float, optional
+        Maximum absolute error of the "windowed" method, by default WINDOW_MAX_ERROR
+    min_width_samples : float, optional
+        Minimum samples per half-height width of the peaks the "fft" method bins onto
+        the axis, by default FFT_MIN_WIDTH_SAMPLES. Binned peaks err by up to about
+        (1 / min_width_samples)^2 of their height, narrower peaks are exact
 
     Returns
     -------
@@ -32,7 +56,58 @@ def simulate_peaklist(
     -----
         Adapted from nmrsim's mplplot function in plt.py
     """
-    peaklist.sort()
+    table: PeakTable = PeakTable.from_peaks(peaklist)
+    # Define frequency axis
+    x: PeakArray = frequency_axis(table, points, freq_limits)
+    # Generate intensity axis from peaklist
+    # Peaks are summed in sorted order, as the lorentzian engines are order sensitive
+    table = table.sorted()
+    match method:
+        case "batched":
+            centers, intensities, widths = peak_arrays(table, half_height_width)
+            y: PeakArray = simulate_lorentzians_batched(
+                x, centers, intensities, widths
+            )
+        case "windowed":
+            centers, intensities, widths = peak_arrays(table, half_height_width)
+            y: PeakArray = simulate_lorentzians_windowed(
+                x, centers, intensities, widths, max_error
+            )
+        case "fft":
+            centers, intensities, widths = peak_arrays(table, half_height_width)
+            y: PeakArray = simulate_lorentzians_fft(
+                x, centers, intensities, widths, min_width_samples
+            )
+        case "loop":
+            y: PeakArray = simulate_lorentzians(x, table, half_height_width)
+        case _:
+            raise ValueError(f"Unknown lorentzian simulation method '{method}'")
+
+    return np.vstack((x, y))
+
+
+def frequency_axis(
+    peaklist: PeakLike,
+    points: int = 800,
+    freq_limits: tuple[float, float] | None = None,
+) -> PeakArray:
+    """
+    Returns the frequency axis `simulate_peaklist` simulates a peaklist on
+
+    Parameters
+    ----------
+    peaklist : PeakTable | list[tuple[float,float, int]]
+        A table of peaks, only used when `freq_limits` is not given
+    points : int, optional
+        Number of points in the entire spectrum, by default 800
+    freq_limits : tuple[float,float] | None, optional
+        Frequency bounds of the axis, by default 50 Hz beyond the outermost peaks
+
+    Returns
+    -------
+    PeakArray : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        Evenly spaced frequencies (in Hz)
+    """
     if freq_limits:
         if (
             isinstance(freq_limits, tuple)
@@ -45,19 +120,44 @@ def simulate_peaklist(
                 "freq_limits must be a tuple of two numbers (int or float)"
             )
     else:
-        l_limit = peaklist[0][0] - 50
-        r_limit = peaklist[-1][0] + 50
+        table: PeakTable = PeakTable.from_peaks(peaklist)
+        l_limit = table.freq.min() - 50
+        r_limit = table.freq.max() + 50
+    return np.linspace(l_limit, r_limit, points)
 
-    # Define frequency axis
-    x: PeakArray = np.linspace(l_limit, r_limit, points)
-    # Generate intensity axis from peaklist
-    y: PeakArray = simulate_lorentzians(x, peaklist, half_height_width)
 
-    return np.vstack((x, y))
+def peak_arrays(
+    peaklist: PeakLike, half_height_width: list[float | int] | float | int
+) -> tuple[PeakArray, PeakArray, PeakArray]:
+    """
+    Splits a peak table into center, intensity, and half-height width arrays
+
+    Parameters
+    ----------
+    peaklist : PeakTable | list[tuple[float,float, int]]
+        Table of (frequency, intensity, nuclei_idx) peaks
+    half_height_width : list[float | int] | float | int
+        Linewidth at half height (in Hz), either shared or indexed by nuclei_idx
+
+    Returns
+    -------
+    centers : np.ndarray
+        Center frequency (in Hz) of each peak
+    intensities : np.ndarray
+        Relative intensity of each peak
+    widths : np.ndarray
+        Half-height width (in Hz) of each peak
+    """
+    table: PeakTable = PeakTable.from_peaks(peaklist)
+    if isinstance(half_height_width, (float, int)):
+        widths = np.full(len(table), half_height_width, dtype=np.float64)
+    else:
+        widths = np.asarray(half_height_width, dtype=np.float64)[table.nucleus]
+    return table.freq, table.intensity, widths
 
 
 def simulate_lorentzians(
-    x: PeakArray, peaklist: PeakList, half_height_width: list[float | int] | float | int
+    x: PeakArray, peaklist: PeakLike, half_height_width: list[float | int] | float | int
 ) -> np.ndarray:
     """Simulates the y axis of a peak aray using the x axis, peak frequency and intensities, and half_height_width value.
 
@@ -90,6 +190,248 @@ def simulate_lorentzians(
     return y
 
 
+def simulate_lorentzians_batched(
+    x: PeakArray,
+    centers: PeakArray,
+    intensities: PeakArray,
+    half_height_widths: PeakArray,
+    memory_budget: int = LORENTZ_MEMORY_BUDGET,
+    out: PeakArray | None = None,
+) -> PeakArray:
+    """
+    Simulates the y axis of a peak array by evaluating blocks of lorentzians at once.
+    Each block holds as many peaks as fit in `memory_budget` bytes of (peaks x points)
+    values, and is summed row by row onto the running total, so the result is identical
+    to accumulating `lorentz` one peak at a time.
+
+    Parameters
+    ----------
+    x : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        x-axis (frequencies) of the spectrum (in Hz)
+    centers : np.ndarray
+        Center frequency (in Hz) of each peak
+    intensities : np.ndarray
+        Relative intensity of each peak
+    half_height_widths : np.ndarray
+        Half-height width (in Hz) of each peak
+    memory_budget : int, optional
+        Maximum size (in bytes) of a single block, by default LORENTZ_MEMORY_BUDGET
+    out : np.ndarray | None, optional
+        Preallocated array (same length as x) the spectrum is written to, by default None
+
+    Returns
+    -------
+    PeakArray : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        Returns the y-axis (intensities) of the spectrum
+    """
+    if out is None:
+        y: PeakArray = np.zeros_like(x, dtype=np.float64)
+    else:
+        y = out
+        y.fill(0.0)
+    if len(centers) == 0 or len(x) == 0:
+        return y
+
+    hhw = np.where(half_height_widths == 0.0, 1e-6, half_height_widths)
+    scaled_intensities = (0.5 / hhw) * intensities
+    quarter_hhw_sq = _quarter_square(hhw)
+
+    block_size = min(len(centers), max(1, memory_budget // (x.itemsize * len(x))))
+    buffer = np.empty((block_size, len(x)), dtype=np.float64)
+    for start in range(0, len(centers), block_size):
+        stop = min(start + block_size, len(centers))
+        block = buffer[: stop - start]
+        q = quarter_hhw_sq[start:stop, np.newaxis]
+
+        np.subtract(x, centers[start:stop, np.newaxis], out=block)
+        np.square(block, out=block)
+        block += q
+        np.divide(q, block, out=block)
+        block *= scaled_intensities[start:stop, np.newaxis]
+
+        # Fold running total into the first row so the reduction keeps peak order
+        block[0] += y
+        np.sum(block, axis=0, out=y)
+    return y
+
+
+def simulate_lorentzians_windowed(
+    x: PeakArray,
+    centers: PeakArray,
+    intensities: PeakArray,
+    half_height_widths: PeakArray,
+    max_error: float = WINDOW_MAX_ERROR,
+) -> PeakArray:
+    """
+    Simulates the y axis of a peak array by evaluating each lorentzian only within
+    a window around its center, found with `searchsorted` on the sorted axis.
+    The error budget `max_error` is shared between the peaks, and each window is wide
+    enough that the peak's tail outside of it never exceeds its share. The summed
+    tails of every peak therefore stay below `max_error` at every point of the
+    spectrum, and the work scales with peaks x window rather than peaks x points.
+
+    Parameters
+    ----------
+    x : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        Sorted x-axis (frequencies) of the spectrum (in Hz)
+    centers : np.ndarray
+        Center frequency (in Hz) of each peak
+    intensities : np.ndarray
+        Relative intensity of each peak
+    half_height_widths : np.ndarray
+        Half-height width (in Hz) of each peak
+    max_error : float, optional
+        Maximum absolute error of the simulated spectrum, by default WINDOW_MAX_ERROR
+
+    Returns
+    -------
+    PeakArray : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        Returns the y-axis (intensities) of the spectrum
+    """
+    if max_error <= 0:
+        raise ValueError("max_error must be a positive number")
+
+    y: PeakArray = np.zeros_like(x, dtype=np.float64)
+    if len(centers) == 0 or len(x) == 0:
+        return y
+
+    # searchsorted requires an increasing axis
+    descending: bool = len(x) > 1 and x[0] > x[-1]
+    axis: PeakArray = x[::-1] if descending else x
+
+    hhw = np.where(half_height_widths == 0.0, 1e-6, half_height_widths)
+    scaled_intensities = (0.5 / hhw) * intensities
+    quarter_hhw_sq = _quarter_square(hhw)
+
+    # Split max_error between peaks as (q * height)^(1/3), which minimises the total
+    # window length, then solve |L(center + d)| <= peak_error for the half-width d
+    heights = np.abs(scaled_intensities)
+    weights = np.cbrt(quarter_hhw_sq * heights)
+    if weights.sum() == 0:
+        return y
+    peak_error = max_error * weights / weights.sum()
+    ratio = np.divide(
+        heights, peak_error, out=np.zeros_like(heights), where=peak_error > 0
+    )
+    window = np.sqrt(quarter_hhw_sq * np.maximum(ratio - 1, 0))
+    lower = np.searchsorted(axis, centers - window, side="left").tolist()
+    upper = np.searchsorted(axis, centers + window, side="right").tolist()
+
+    for k in range(len(centers)):
+        start, stop = lower[k], upper[k]
+        if stop <= start:
+            continue
+        q = quarter_hhw_sq[k]
+        segment = axis[start:stop] - centers[k]
+        np.square(segment, out=segment)
+        segment += q
+        np.divide(q, segment, out=segment)
+        segment *= scaled_intensities[k]
+        y[start:stop] += segment
+
+    return y[::-1].copy() if descending else y
+
+
+def simulate_lorentzians_fft(
+    x: PeakArray,
+    centers: PeakArray,
+    intensities: PeakArray,
+    half_height_widths: PeakArray,
+    min_width_samples: float = FFT_MIN_WIDTH_SAMPLES,
+) -> PeakArray:
+    """
+    Simulates the y axis of a peak array as a stick spectrum convolved with a lorentzian.
+    Peaks are grouped by half-height width, and each group's intensities are binned
+    onto the grid with sub-bin linear weighting between the two nearest samples.
+    Each group is then convolved with its unit lorentzian using real FFTs, so the
+    cost is O(points log points) per group instead of O(peaks x points).
+
+    Parameters
+    ----------
+    x : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        Uniformly spaced x-axis (frequencies) of the spectrum (in Hz)
+    centers : np.ndarray
+        Center frequency (in Hz) of each peak
+    intensities : np.ndarray
+        Relative intensity of each peak
+    half_height_widths : np.ndarray
+        Half-height width (in Hz) of each peak
+    min_width_samples : float, optional
+        Minimum samples per half-height width of a binned peak, by default
+        FFT_MIN_WIDTH_SAMPLES
+
+    Returns
+    -------
+    PeakArray : np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+        Returns the y-axis (intensities) of the spectrum
+
+    Notes
+    -----
+        Binning errs by up to about (step / hhw)^2 of a peak's height, at most
+        (1 / min_width_samples)^2. Peaks centered outside of the axis, or narrower than
+        `min_width_samples` axis samples, cannot be binned and are evaluated directly
+        with `simulate.simulate.simulate_lorentzians_batched`
+    """
+    points = len(x)
+    if points < 2 or len(centers) == 0:
+        return simulate_lorentzians_batched(
+            x, centers, intensities, half_height_widths
+        )
+
+    step = (x[-1] - x[0]) / (points - 1)
+    position = (centers - x[0]) / step
+    lower = np.floor(position).astype(np.intp)
+    fraction = position - lower
+    hhw = np.where(half_height_widths == 0.0, 1e-6, half_height_widths)
+    # Linear weighting has a relative error of about (step / hhw)^2 at the peak
+    on_grid = (
+        (lower >= 0)
+        & (lower < points - 1)
+        & (hhw >= min_width_samples * abs(step))
+    )
+
+    # Zero padding of at least points - 1 keeps the convolution from wrapping around
+    fft_size = 1 << (2 * points - 2).bit_length()
+    offsets = np.arange(points) * step
+
+    spectrum = np.zeros(fft_size // 2 + 1, dtype=np.complex128)
+    for width in np.unique(hhw[on_grid]).tolist():
+        group = on_grid & (hhw == width)
+        sticks = np.bincount(
+            lower[group],
+            weights=intensities[group] * (1 - fraction[group]),
+            minlength=points,
+        )
+        sticks += np.bincount(
+            lower[group] + 1,
+            weights=intensities[group] * fraction[group],
+            minlength=points,
+        )
+
+        kernel = np.zeros(fft_size, dtype=np.float64)
+        kernel[:points] = lorentz(offsets, 0.0, 1.0, width)
+        kernel[fft_size - points + 1 :] = kernel[points - 1 : 0 : -1]
+
+        spectrum += np.fft.rfft(sticks, fft_size) * np.fft.rfft(kernel)
+
+    y: PeakArray = np.fft.irfft(spectrum, fft_size)[:points]
+    if not on_grid.all():
+        off_grid = ~on_grid
+        y += simulate_lorentzians_batched(
+            x, centers[off_grid], intensities[off_grid], half_height_widths[off_grid]
+        )
+    return y
+
+
+def _quarter_square(hhw: PeakArray) -> PeakArray:
+    """
+    Returns (0.5 * hhw) ** 2 for every width, computed with scalar arithmetic
+    so that values match `lorentz` exactly (array squaring may differ by one ulp)
+    """
+    unique_hhw, inverse = np.unique(hhw, return_inverse=True)
+    return np.array([(0.5 * h) ** 2 for h in unique_hhw.tolist()])[inverse]
+
+
 def lorentz(freq: PeakArray, center: float, intensity: float, hhw: float) -> PeakArray:
     """
     Calculates a lorentzian value with given parameters
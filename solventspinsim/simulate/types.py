@@ -2,6 +2,10 @@
 from typing import Any
 import numpy as np
 
-Peak = tuple[float,float,int]
-PeakList = list[Peak]
-PeakArray = np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
\ No newline at end of file
+from solventspinsim.table import PeakTable
+from solventspinsim.table.types import Peak, PeakList
+
+PeakArray = np.ndarray[tuple[Any, ...], np.dtype[np.float64]]
+PeakLike = PeakList | PeakTable
+
+__all__ = ["Peak", "PeakArray", "PeakLike", "PeakList", "PeakTable"]
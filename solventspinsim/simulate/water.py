@@ -1,6 +1,6 @@
 import dearpygui.dearpygui as dpg
 
-from solventspinsim.simulate.types import PeakList
+from solventspinsim.simulate.types import PeakTable
 
 
 class Water:
@@ -125,11 +125,11 @@ class Water:
     # --------------------------------- peaklist --------------------------------- #
 
     @property
-    def peaklist(self) -> PeakList:
+    def peaklist(self) -> PeakTable:
         return self._peaklist
 
     def _set_peaklist(self, frequency: float, intensity: float) -> None:
-        self._peaklist: PeakList = [(frequency, intensity, -1)]
+        self._peaklist: PeakTable = PeakTable([frequency], [intensity], [-1])
 
     # ---------------------------------------------------------------------------- #
     #                                Main Functions                                #
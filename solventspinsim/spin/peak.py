@@ -1,10 +1,29 @@
-from collections import Counter
-from typing import Generator, Literal
+from collections import OrderedDict
+from math import comb, prod
+from sys import stderr
+from threading import Lock
+from typing import Iterable
 
 import numpy as np
 from numpy.typing import ArrayLike
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components
 
-from solventspinsim.spin.types import Peak, PeakList
+from solventspinsim.spin.qm import (
+    MAX_STRONG_STATES,
+    qm_composite_transitions,
+    qm_transitions,
+)
+from solventspinsim.table import PeakTable
+from solventspinsim.spin.types import Peak
+
+# Number of simulated fragments kept by `gen_peaklist` for reuse
+FRAGMENT_CACHE_SIZE: int = 256
+
+_fragment_cache: OrderedDict[bytes, PeakTable] = OrderedDict()
+
+# Guards `_fragment_cache`, which the GUI and optimization threads share
+_fragment_cache_lock: Lock = Lock()
 
 # ---------------------------------------------------------------------------- #
 #                              Generate Couplings                              #
@@ -15,7 +34,9 @@ def gen_peaklist_weak(
     nuclei_frequencies: list[float] | list[int],
     J_couplings: np.ndarray,
     intensities: list[float | int],
-) -> PeakList:
+    coupling_tolerance: float = 0.0,
+    group_sizes: list[int] | None = None,
+) -> PeakTable:
     """
     Generate a peak list for a weakly coupled spin system.
     This function simulates the NMR peak list for a set of nuclei with given resonance frequencies and J-coupling constants,
@@ -30,37 +51,275 @@ def gen_peaklist_weak(
             2D matrix (n x n) of scalar coupling constants (in Hz) between nuclei. Each row corresponds to a nucleus,
 
             and each element in the row is the coupling to another nucleus
+        intensities : list[float | int]
+            Relative intensity of each nucleus
+        coupling_tolerance : float, optional
+            Maximum difference (in Hz) between couplings of a nucleus that are grouped
+
+            into a single (J, n) binomial multiplet at their mean coupling, by default 0.0
+
+            (only exactly equal couplings are grouped, which leaves the spectrum unchanged)
+        group_sizes : list[int] | None, optional
+            Number of magnetically equivalent nuclei represented by each entry, by default
+
+            every entry is a single nucleus. A coupling to a group of n nuclei splits the
+
+            multiplet n times, and couplings inside a group are not observed
     Returns
     -------
-        PeakList: list[tuple[float,float,int]]
-            A list of peaks representing the simulated NMR spectrum for the given spin system
+        PeakTable
+            A table of peaks representing the simulated NMR spectrum for the given spin system
 
     Notes
     -----
         Adapted from nmrsim's firstorder.py
     """
-    n = len(nuclei_frequencies)
+    intensities = _pad_intensities(intensities, len(nuclei_frequencies))
 
-    if len(intensities) < n:
-        intensities = intensities + [1] * (n - len(intensities))
-    if len(intensities) > n:
-        intensities = intensities[:n]
-
-    peaklist: PeakList = []
+    signals: list[PeakTable] = []
     for i, nuclei in enumerate(nuclei_frequencies):
-        couplings: Generator[tuple[ArrayLike, int]] = (
-            (j, 1) for j in J_couplings[i] if j != 0
-        )
-        signal: PeakList = _multiplet((nuclei, intensities[i], i), couplings)
-        peaklist += signal
-    return _reduce_peaks(sorted(peaklist))
+        row = J_couplings[i]
+        if group_sizes is not None:
+            row = np.repeat(row, group_sizes)
+        couplings = _group_couplings(row, coupling_tolerance)
+        signals.append(_multiplet((nuclei, intensities[i], i), couplings))
+    if len(signals) == 1:
+        # A multiplet is already sorted, with its coinciding lines collapsed
+        return _reduce_peaks(signals[0], is_sorted=True)
+    return _reduce_peaks(PeakTable.concatenate(signals))
 
 
 def gen_peaklist_strong(
+    nuclei_frequencies: list[float] | list[int],
+    J_couplings: np.ndarray,
+    intensities: list[float | int],
+    group_sizes: list[int] | None = None,
+) -> PeakTable:
+    """
+    Generate a peak list for a strongly coupled spin system.
+    This function diagonalizes the full spin Hamiltonian of the nuclei (second-order
+    simulation), so roofing, additional lines, and shifted line positions of strongly
+    coupled multiplets are reproduced. The Hamiltonian is blocked by total Fz and built
+    from an operator basis that is cached per number of nuclei, so repeated calls with
+    new frequencies and couplings only pay for the eigensolve. Systems with more than
+    MAX_STRONG_STATES states are simulated by `gen_peaklist_weak` instead, with a
+    warning.
+
+    Parameters
+    ----------
+        nuclei_frequencies : list[float] | list[int]
+            List of resonance frequencies (in Hz) for each nucleus
+        J_couplings : np.ndarray
+            2D symmetric matrix (n x n) of scalar coupling constants (in Hz) between nuclei
+        intensities : list[float | int]
+            Relative intensity of each nucleus
+        group_sizes : list[int] | None, optional
+            Number of magnetically equivalent nuclei represented by each entry, by default
+
+            every entry is a single nucleus. Groups are simulated as composite particles
+    Returns
+    -------
+        PeakTable
+            A table of peaks representing the simulated NMR spectrum for the given spin system
+
+    Notes
+    -----
+        Adapted from nmrsim's qm.py, see `spin.qm.qm_transitions` and
+
+        `spin.qm.qm_composite_transitions`
+    """
+    intensities = _pad_intensities(intensities, len(nuclei_frequencies))
+
+    sizes = group_sizes if group_sizes is not None else [1] * len(nuclei_frequencies)
+    states = prod(size + 1 for size in sizes)
+    if states > MAX_STRONG_STATES:
+        print(
+            f"Strong coupling supports at most {MAX_STRONG_STATES} states, simulating "
+            f"a fragment of {sum(sizes)} nuclei ({states} states) with weak coupling",
+            file=stderr,
+        )
+        return gen_peaklist_weak(
+            nuclei_frequencies, J_couplings, intensities, group_sizes=group_sizes
+        )
+
+    if group_sizes is None or max(group_sizes) == 1:
+        transitions = qm_transitions(
+            nuclei_frequencies, J_couplings, np.asarray(intensities)
+        )
+    else:
+        transitions = qm_composite_transitions(
+            nuclei_frequencies, J_couplings, np.asarray(intensities), group_sizes
+        )
+    return _reduce_peaks(transitions)
+
+
+def gen_peaklist(
+    nuclei_frequencies: list[float] | list[int],
+    J_couplings: np.ndarray,
+    intensities: list[float | int],
+    groups: list[list[int]] | None = None,
+    strong: bool = False,
+    coupling_tolerance: float = 0.0,
+) -> PeakTable:
+    """
+    Generate a peak list by simulating each independent fragment of a spin system.
+    Each group of magnetically equivalent nuclei is first replaced by one composite
+    spin carrying the shift and couplings of its first member and the summed intensity
+    of the group. Composite spins in different connected components of the coupling
+    graph share no coupling, so each component is simulated on its own with
+    `gen_peaklist_weak` or `gen_peaklist_strong` and the results are combined. For
+    strong coupling this replaces one 2^N Hamiltonian with several small ones.
+    Fragment peak lists are cached on their parameters, so fragments that did not
+    change since a previous call (e.g. between optimizer iterations) are not
+    simulated again. The cache is shared by every thread and guarded by a lock, which
+    is not held while a fragment is simulated.
+
+    Parameters
+    ----------
+        nuclei_frequencies : list[float] | list[int]
+            List of resonance frequencies (in Hz) for each nucleus
+        J_couplings : np.ndarray
+            2D symmetric matrix (n x n) of scalar coupling constants (in Hz) between nuclei
+        intensities : list[float | int]
+            Relative intensity of each nucleus
+        groups : list[list[int]] | None, optional
+            Partition of the nuclei into groups of magnetically equivalent nuclei (see
+
+            `magnetic_equivalence_groups`), by default every nucleus is its own group
+        strong : bool, optional
+            Simulate fragments with the strong coupling engine, by default False
+        coupling_tolerance : float, optional
+            Coupling grouping tolerance (in Hz) of the weak coupling engine, by default 0.0
+    Returns
+    -------
+        PeakTable
+            A table of peaks with nucleus indices of the full spin system. Peaks of a
+
+            group are assigned to its first member
+    """
+    frequencies = np.asarray(nuclei_frequencies, dtype=np.float64)
+    couplings = np.asarray(J_couplings, dtype=np.float64)
+    weights = np.asarray(_pad_intensities(intensities, len(frequencies)), np.float64)
+    if groups is None:
+        representatives = np.arange(len(frequencies))
+        sizes = np.ones(len(frequencies), dtype=np.intp)
+    else:
+        representatives = np.array([group[0] for group in groups], dtype=np.intp)
+        sizes = np.array([len(group) for group in groups], dtype=np.intp)
+        membership = np.repeat(np.arange(len(groups)), sizes)
+        weights = np.bincount(
+            membership,
+            weights=weights[np.concatenate(groups).astype(np.intp)],
+            minlength=len(groups),
+        )
+        frequencies = frequencies[representatives]
+        couplings = couplings[np.ix_(representatives, representatives)]
+
+    signals: list[PeakTable] = []
+    for indices in coupling_components(couplings):
+        block = np.ix_(indices, indices)
+        key = b"".join(
+            (
+                b"s" if strong else b"w",
+                np.float64(coupling_tolerance).tobytes(),
+                representatives[indices].tobytes(),
+                sizes[indices].tobytes(),
+                frequencies[indices].tobytes(),
+                weights[indices].tobytes(),
+                couplings[block].tobytes(),
+            )
+        )
+        with _fragment_cache_lock:
+            fragment = _fragment_cache.get(key)
+            if fragment is not None:
+                _fragment_cache.move_to_end(key)
+        if fragment is None:
+            group_sizes = sizes[indices].tolist()
+            if strong:
+                fragment = gen_peaklist_strong(
+                    frequencies[indices].tolist(),
+                    couplings[block],
+                    weights[indices].tolist(),
+                    group_sizes,
+                )
+            else:
+                fragment = gen_peaklist_weak(
+                    frequencies[indices].tolist(),
+                    couplings[block],
+                    weights[indices].tolist(),
+                    coupling_tolerance,
+                    group_sizes,
+                )
+            fragment.nucleus = representatives[indices][fragment.nucleus]
+            with _fragment_cache_lock:
+                _fragment_cache[key] = fragment
+                if len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+                    _fragment_cache.popitem(last=False)
+        signals.append(fragment)
+    if len(signals) == 1:
+        # Fragments are already reduced, and the cached table must not be shared
+        return signals[0].copy()
+    return _reduce_peaks(PeakTable.concatenate(signals))
+
+
+def magnetic_equivalence_groups(
     nuclei_frequencies: list[float] | list[int], J_couplings: np.ndarray
-) -> PeakList:
-    # Adapted from nmrsim's qm.py
-    return [(0, 0, 0)]
+) -> list[list[int]]:
+    """
+    Finds the groups of magnetically equivalent nuclei of a spin system. Two nuclei
+    are equivalent when they have the same resonance frequency and the same coupling
+    to every other nucleus, their mutual coupling aside.
+
+    Parameters
+    ----------
+    nuclei_frequencies : list[float] | list[int]
+        List of resonance frequencies (in Hz) for each nucleus
+    J_couplings : np.ndarray
+        2D symmetric matrix (n x n) of scalar coupling constants (in Hz) between nuclei
+
+    Returns
+    -------
+    list[list[int]]
+        Partition of the nuclei into groups of equivalent nuclei, ordered by their
+        first member
+    """
+    frequencies = np.asarray(nuclei_frequencies, dtype=np.float64)
+    couplings = np.asarray(J_couplings, dtype=np.float64)
+    n = len(frequencies)
+    labels = np.arange(n)
+    for i in range(n):
+        if labels[i] != i:
+            continue
+        for j in np.flatnonzero(frequencies[i + 1 :] == frequencies[i]) + i + 1:
+            if labels[j] != j:
+                continue
+            others = np.ones(n, dtype=bool)
+            others[[i, j]] = False
+            if np.array_equal(couplings[i, others], couplings[j, others]):
+                labels[j] = i
+    return [np.flatnonzero(labels == i).tolist() for i in range(n) if labels[i] == i]
+
+
+def coupling_components(J_couplings: np.ndarray) -> list[np.ndarray]:
+    """
+    Finds the connected components of the coupling graph of a spin system, where
+    nuclei are vertices and every nonzero coupling is an edge.
+
+    Parameters
+    ----------
+    J_couplings : np.ndarray
+        2D matrix (n x n) of scalar coupling constants (in Hz) between nuclei
+
+    Returns
+    -------
+    list[np.ndarray]
+        Sorted nucleus indices of each component, ordered by their smallest index
+    """
+    adjacency = csr_array(np.asarray(J_couplings) != 0)
+    count, labels = connected_components(adjacency, directed=False)
+    order = np.argsort(labels, kind="stable")
+    starts = np.searchsorted(labels[order], np.arange(count))
+    return np.split(order, starts[1:])
 
 
 # ---------------------------------------------------------------------------- #
@@ -68,144 +327,210 @@ def gen_peaklist_strong(
 # ---------------------------------------------------------------------------- #
 
 
-def _multiplet(signal: tuple, couplings: Generator[tuple[ArrayLike, int]]) -> PeakList:
+def _pad_intensities(intensities: list[float | int], n: int) -> list[float | int]:
+    """Pads missing nucleus intensities with 1 and drops extra ones."""
+    if len(intensities) < n:
+        intensities = list(intensities) + [1] * (n - len(intensities))
+    if len(intensities) > n:
+        intensities = list(intensities)[:n]
+    return intensities
+
+
+def _group_couplings(
+    couplings: ArrayLike, tolerance: float = 0.0
+) -> list[tuple[float, int]]:
+    """
+    Groups the nonzero couplings of a nucleus into (J, n) pairs of equivalent couplings.
+    Sorted couplings closer than `tolerance` to their neighbour are chained into the same
+    group, which is represented by its mean coupling and its size.
+
+    Parameters
+    ----------
+    couplings : ArrayLike
+        Couplings (in Hz) from one nucleus to every nucleus in the spin system
+    tolerance : float, optional
+        Maximum difference (in Hz) between adjacent couplings of a group, by default 0.0
+
+    Returns
+    -------
+    list[tuple[float, int]]
+        List of (coupling constant, number of equivalent couplings) pairs
+    """
+    values = np.sort(np.asarray(couplings, dtype=np.float64).ravel())
+    values = values[values != 0]
+    if len(values) == 0:
+        return []
+    boundaries = np.flatnonzero(np.diff(values) > tolerance) + 1
+    return [
+        (float(group[0] if group[0] == group[-1] else group.mean()), len(group))
+        for group in np.split(values, boundaries)
+    ]
+
+
+def _multiplet(
+    signal: Peak, couplings: Iterable[tuple[ArrayLike, int]]
+) -> PeakTable:
     """
-    Generate a multiplet peak list by iteratively applying couplings to an initial signal.
+    Generate a multiplet peak list by applying couplings to an initial signal.
+    Each coupling is applied as an outer sum of the current line positions with the
+    coupling's splitting offsets, and coinciding lines are collapsed immediately with
+    `np.unique` and `np.bincount`, keeping the number of splitting paths that end on
+    each line. The table therefore never holds more than the distinct lines of the
+    multiplet, rather than the 2^k lines of repeated doublets.
+
+    Each path carries 1 / 2^k of the signal intensity for k applied couplings, so
+    every line gets its binomial weight in one multiplication. Frequencies and
+    intensities agree with expanding every doublet up to rounding.
 
     Parameters
     ----------
     signal : tuple
         The initial peak signal, typically a tuple representing (position, intensity)
-    couplings : Generator[tuple[ArrayLike, int]]
-        A generator yielding tuples, each containing coupling constants (as an array-like object)
+    couplings : Iterable[tuple[ArrayLike, int]]
+        An iterable yielding tuples, each containing coupling constants (as an array-like object)
         and the number of equivalent couplings to apply
 
     Returns
     -------
-    PeakList: list[tuple[float,float,int]]
-        A sorted list of peaks after applying all couplings
+    PeakTable
+        A sorted table of peaks after applying all couplings
 
     Notes
     -----
         Adapted from nmrsim's firstorder.py
     """
-    peaklist: PeakList = [signal]
-    for coupling in couplings:
-        for _ in range(coupling[1]):
-            peaklist = _doublet(peaklist, coupling[0])
-    return sorted(_reduce_peaks(peaklist))
-
-
-def _doublet(peaklist, coupling_constant) -> PeakList:
+    frequencies = np.array([signal[0]], dtype=np.float64)
+    paths = np.ones(1, dtype=np.float64)
+    intensity = signal[1]
+    for coupling, count in couplings:
+        offsets, splits = _splitting(coupling, count)
+        frequencies = (frequencies[:, np.newaxis] + offsets).ravel()
+        paths = (paths[:, np.newaxis] * splits).ravel()
+        frequencies, inverse = np.unique(frequencies, return_inverse=True)
+        paths = np.bincount(inverse, weights=paths)
+        intensity = intensity / 2**count
+    return PeakTable(
+        frequencies, intensity * paths, np.full(len(frequencies), signal[2])
+    )
+
+
+def _splitting(coupling_constant, count: int) -> tuple[np.ndarray, np.ndarray]:
     """
-    Splits each peak in the input list into a doublet by applying the specified coupling constant.
-    Each peak is split into two: one at (frequency - coupling_constant / 2) and one at (frequency + coupling_constant / 2),
-    with each new peak having half the original intensity.
+    Returns the line offsets and splitting path counts produced by `count` equivalent
+    couplings of `coupling_constant` (Hz). A single coupling splits a line into a doublet
+    at -J/2 and +J/2, and `count` > 1 couplings follow Pascal's triangle, with
+    binomial(count, m) paths ending on the line at J * (m - count / 2). Each path
+    carries 1 / 2^count of the original intensity.
 
     Parameters
     ----------
-    peaklist : list[tuple[float,float,int]]
-        List of (frequency, intensity, nuclei_idx) tuples representing the original peaks
     coupling_constant : float
         The coupling constant (Hz) used to split each peak
+    count : int
+        The number of equivalent couplings to apply
 
     Returns
     -------
-    PeakList :  list[tuple[float,float,int]]
-        A new list of (frequency, intensity, nuclei_idx) tuples representing the doublet peaks
-
-    Notes
-    -----
-        Adapted from nmrsim's firstorder.py
+    offsets : np.ndarray
+        Offset (in Hz) of each line from the original peak
+    splits : np.ndarray
+        Number of splitting paths ending on each line
     """
-    new_peaklist: PeakList = []
-    # For every peak in the list, split the frequency and half the intensity to form doublets
-    for freq, intensity, idx in peaklist:
-        new_peaklist.append((freq - coupling_constant / 2, intensity / 2, idx))
-        new_peaklist.append((freq + coupling_constant / 2, intensity / 2, idx))
-    return new_peaklist
+    if count == 1:
+        half_coupling = coupling_constant / 2
+        return np.array([-half_coupling, half_coupling]), np.ones(2)
+    m = np.arange(count + 1)
+    splits = np.array([comb(count, k) for k in range(count + 1)], dtype=np.float64)
+    return coupling_constant * (m - count / 2), splits
 
 
-def _reduce_peaks(unsorted_peaklist, tolerance=0) -> PeakList:
+def _reduce_peaks(
+    unsorted_peaklist: PeakTable, tolerance=0, is_sorted: bool = False
+) -> PeakTable:
     """
-    Reduces a list of peaks by combining adjacent peaks within a specified tolerance.
-    This function sorts the input peak list and iteratively groups peaks whose positions
-    are within `tolerance` of each other. Each group of adjacent peaks is then combined
-    into a single peak using the `spin.peak.peak_sum` function.
+    Reduces a table of peaks by combining adjacent peaks within a specified tolerance.
+    This function sorts the input peak table by frequency and groups peaks whose
+    positions are within `tolerance` of their neighbour. Each group of adjacent peaks is
+    then combined into a single peak at the average frequency of the group with the
+    total intensity of the group, using array operations only.
 
     Parameters
     ----------
-        unsorted_peaklist : list[tuple[float,float,int]]
-            The list of peaks to be reduced
+        unsorted_peaklist : PeakTable
+            The table of peaks to be reduced
         tolerance : float, optional
             The maximum allowed difference between peak positions
 
             for them to be considered adjacent and combined, Defaults to 0
+        is_sorted : bool, optional
+            Skip sorting when the table is already sorted by frequency, Defaults to False
 
     Returns
     -------
-        PeakList : list[tuple[float,float,int]]
-            A new list of peaks where adjacent peaks within the specified tolerance
+        PeakTable
+            A new table of peaks where adjacent peaks within the specified tolerance
             have been combined
 
     Notes
     -----
         Adapted from nmrsim's math.py
     """
-    new_peaklist: PeakList = []
-    work: PeakList = []  # Peaklist of current peaks to be tested
-    # Ensure peak list is sorted before performing reduction
-    peaklist: PeakList = sorted(unsorted_peaklist)
-
-    for peak in peaklist:
-        if not work:
-            work.append(peak)
-            continue
-        if peak[0] - work[-1][0] <= tolerance:
-            work.append(peak)
-            continue
-        else:
-            parent_idx = _mode_smallest(work)
-            new_peaklist.append(peak_sum(work, parent_idx))
-
-            work = [peak]
-    if work:  # Add the remaining work peaks after loop
-        parent_idx = _mode_smallest(work)
-        new_peaklist.append(peak_sum(work, parent_idx))
-
-    return new_peaklist
-
-
-def peak_sum(peaklist: PeakList, parent_idx: int) -> Peak:
+    if len(unsorted_peaklist) == 0:
+        return PeakTable()
+
+    if is_sorted:
+        peaklist: PeakTable = unsorted_peaklist
+    else:
+        # Peaks of equal frequency always merge, so their order does not matter
+        peaklist = unsorted_peaklist[
+            np.argsort(unsorted_peaklist.freq, kind="stable")
+        ]
+
+    # Start index of every group of adjacent peaks
+    starts = np.flatnonzero(np.diff(peaklist.freq) > tolerance) + 1
+    starts = np.concatenate(([0], starts))
+    if len(starts) == len(peaklist):
+        return peaklist.copy() if is_sorted else peaklist
+
+    sizes = np.diff(np.append(starts, len(peaklist)))
+    return PeakTable(
+        np.add.reduceat(peaklist.freq, starts) / sizes,
+        np.add.reduceat(peaklist.intensity, starts),
+        _mode_smallest(peaklist.nucleus, starts, sizes),
+    )
+
+
+def _mode_smallest(
+    parent_indices: np.ndarray, starts: np.ndarray, sizes: np.ndarray
+) -> np.ndarray:
     """
-    Sums up a peak list by adding intensity and finding the average frequency
+    Returns the mode of parent_idx values in every peak group,
+    breaking ties by choosing the smallest index.
 
     Parameters
     ----------
-    peaklist : list[tuple[float,float]]
-        list of peaks to sum together
+    parent_indices : np.ndarray
+        Parent nuclei index of every peak, ordered by group
+    starts : np.ndarray
+        Index of the first peak of each group
+    sizes : np.ndarray
+        Number of peaks in each group
 
     Returns
     -------
-    Peak : tuple
-        New peak sum with frequency average and intensity total
-
-    Notes
-    -----
-        Adapted from nmrsim's math.py
-    """
-    frequency_total: float | Literal[0] = sum(peak[0] for peak in peaklist)
-    intensity_total: float | Literal[0] = sum(peak[1] for peak in peaklist)
-
-    return (frequency_total / len(peaklist), intensity_total, parent_idx)
-
-
-def _mode_smallest(peak_group: PeakList) -> int:
-    """
-    Returns the mode of parent_idx values in peak_group,
-    breaking ties by choosing the smallest index.
+    np.ndarray
+        Parent nuclei index of each group
     """
-    counts = Counter(p[2] for p in peak_group)
-    max_count = max(counts.values())
-    candidates = [idx for idx, cnt in counts.items() if cnt == max_count]
-    return min(candidates)
+    groups = np.repeat(np.arange(len(starts)), sizes)
+    lowest = parent_indices.min()
+    span = parent_indices.max() - lowest + 1
+
+    # Count every (group, parent_idx) pair, then rank pairs within each group by
+    # descending count and ascending parent_idx
+    pairs, counts = np.unique(
+        groups * span + (parent_indices - lowest), return_counts=True
+    )
+    pair_groups, pair_parents = np.divmod(pairs, span)
+    order = np.lexsort((pair_parents, -counts, pair_groups))
+    first = np.flatnonzero(np.diff(pair_groups[order], prepend=-1))
+    return pair_parents[order][first] + lowest
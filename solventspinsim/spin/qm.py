@@ -0,0 +1,329 @@
+from functools import lru_cache
+from itertools import product
+from math import comb, prod
+
+import numpy as np
+from scipy.sparse import coo_array, csr_array, diags_array
+
+from solventspinsim.table import PeakTable
+
+# Largest Hilbert space handled by the quantum-mechanical engine. The biggest Fz blocks
+# of 12 spin-1/2 nuclei hold 924 and 792 states, so each (block x block) amplitude
+# matrix stays under 6 MB, while 16 nuclei would need gigabytes per eigensolve
+MAX_STRONG_STATES: int = 2**12
+
+# Transitions weaker than this fraction of the largest nucleus intensity are dropped
+INTENSITY_CUTOFF: float = 1e-6
+
+# ---------------------------------------------------------------------------- #
+#                                Operator Basis                                #
+# ---------------------------------------------------------------------------- #
+
+
+class SpinBasis:
+    """
+    Shift-independent operator structure of a system of spin particles, blocked by
+    total Fz. Particle i has `multiplicities[i]` = 2I + 1 levels, so spin-1/2 nuclei
+    have multiplicity 2 and composite particles of equivalent nuclei may have more.
+    Basis states are mixed-radix numbers of level indices l_i (m_i = l_i - I_i), and
+    block k holds every state whose levels sum to k. Only the parts of the Hamiltonian
+    that do not depend on the shifts or couplings are stored, so a basis is built once
+    per set of multiplicities and reused for every parameter set.
+
+    Attributes
+    ----------
+    multiplicities : tuple[int, ...]
+        Number of spin levels (2I + 1) of each particle
+    pairs : tuple[np.ndarray, np.ndarray]
+        Upper-triangle (i, j) indices of every coupled pair
+    magnetization : list[np.ndarray]
+        Per block, the (states x particles) matrix of m values
+    flip_flop : list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+        Per block, the (row, column, pair index, matrix element) of every
+        I+_i I-_j + I-_i I+_j off-diagonal element
+    lowering : list[list[csr_array]]
+        Per block k, the I- matrix of each particle mapping block k + 1 into block k
+    """
+
+    __slots__ = ("multiplicities", "pairs", "magnetization", "flip_flop", "lowering")
+
+    def __init__(self, multiplicities: tuple[int, ...]) -> None:
+        if len(multiplicities) < 1 or min(multiplicities) < 1:
+            raise ValueError("A spin system needs at least one particle")
+        dimension = prod(multiplicities)
+        if dimension > MAX_STRONG_STATES:
+            raise ValueError(
+                f"Strong coupling simulation supports at most {MAX_STRONG_STATES} "
+                f"states, got {dimension}"
+            )
+        self.multiplicities: tuple[int, ...] = tuple(multiplicities)
+        size = len(multiplicities)
+        self.pairs: tuple[np.ndarray, np.ndarray] = np.triu_indices(size, k=1)
+
+        radix = np.array(multiplicities)
+        spin = (radix - 1) / 2
+        strides = np.concatenate(([1], np.cumprod(radix[:-1])))
+        states = np.arange(dimension)
+        levels = (states[:, np.newaxis] // strides) % radix
+        level_sum = levels.sum(axis=1)
+        blocks = [states[level_sum == k] for k in range(int((radix - 1).sum()) + 1)]
+
+        # Position of every state inside its own block
+        position = np.empty(dimension, dtype=np.intp)
+        for block in blocks:
+            position[block] = np.arange(len(block))
+
+        magnetization = levels - spin
+        self.magnetization: list[np.ndarray] = [magnetization[b] for b in blocks]
+
+        # <m + 1| I+ |m> and <m - 1| I- |m> of every particle in every state
+        total = spin * (spin + 1)
+        raising = np.sqrt(np.maximum(total - magnetization * (magnetization + 1), 0))
+        lowering = np.sqrt(np.maximum(total - magnetization * (magnetization - 1), 0))
+
+        self.flip_flop: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        pair_i, pair_j = self.pairs
+        for block in blocks:
+            # I+_i I-_j moves one level from particle j to particle i
+            element = raising[block][:, pair_i] * lowering[block][:, pair_j]
+            rows, pair_index = np.nonzero(element)
+            shift = strides[pair_i[pair_index]] - strides[pair_j[pair_index]]
+            columns = position[block[rows] + shift]
+            values = element[rows, pair_index]
+            self.flip_flop.append(
+                (
+                    np.concatenate((columns, rows)),
+                    np.concatenate((rows, columns)),
+                    np.concatenate((pair_index, pair_index)),
+                    np.concatenate((values, values)),
+                )
+            )
+
+        self.lowering: list[list[csr_array]] = []
+        for k in range(len(blocks) - 1):
+            upper = blocks[k + 1]
+            operators = []
+            for i in range(size):
+                columns = np.flatnonzero(levels[upper, i])
+                rows = position[upper[columns] - strides[i]]
+                operators.append(
+                    csr_array(
+                        (lowering[upper[columns], i], (rows, columns)),
+                        shape=(len(blocks[k]), len(upper)),
+                    )
+                )
+            self.lowering.append(operators)
+
+    def hamiltonian(
+        self, k: int, frequencies: np.ndarray, couplings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Builds the dense Hamiltonian (in Hz) of Fz block `k`
+
+        Parameters
+        ----------
+        k : int
+            Number of alpha spins of the block
+        frequencies : np.ndarray
+            Resonance frequency (in Hz) of each nucleus
+        couplings : np.ndarray
+            Coupling constant (in Hz) of each pair in `pairs`
+
+        Returns
+        -------
+        np.ndarray
+            Real symmetric Hamiltonian of the block
+        """
+        m = self.magnetization[k]
+        pair_i, pair_j = self.pairs
+        zeeman = m @ frequencies
+        zz = (m[:, pair_i] * m[:, pair_j]) @ couplings
+        rows, columns, pair_index, element = self.flip_flop[k]
+        size = len(m)
+        hamiltonian = diags_array(zeeman + zz) + coo_array(
+            (0.5 * couplings[pair_index] * element, (rows, columns)),
+            shape=(size, size),
+        )
+        return hamiltonian.toarray()
+
+
+@lru_cache(maxsize=64)
+def spin_basis(multiplicities: tuple[int, ...]) -> SpinBasis:
+    """Returns the cached operator basis of particles with the given multiplicities."""
+    return SpinBasis(multiplicities)
+
+
+# ---------------------------------------------------------------------------- #
+#                                  Simulation                                  #
+# ---------------------------------------------------------------------------- #
+
+
+def qm_transitions(
+    nuclei_frequencies: np.ndarray,
+    J_couplings: np.ndarray,
+    intensities: np.ndarray,
+    multiplicities: tuple[int, ...] | None = None,
+    scale: float | None = None,
+    cutoff: float = INTENSITY_CUTOFF,
+) -> PeakTable:
+    """
+    Computes every allowed transition of a strongly coupled spin system.
+    Each Fz block of the Hamiltonian is diagonalized separately, and transition
+    amplitudes are only computed between adjacent blocks, since the total I- operator
+    lowers Fz by exactly one.
+
+    Parameters
+    ----------
+    nuclei_frequencies : np.ndarray
+        Resonance frequency (in Hz) of each particle
+    J_couplings : np.ndarray
+        Symmetric (n x n) matrix of scalar coupling constants (in Hz)
+    intensities : np.ndarray
+        Relative intensity of each particle
+    multiplicities : tuple[int, ...] | None, optional
+        Number of spin levels (2I + 1) of each particle, by default all spin-1/2
+    scale : float | None, optional
+        Factor applied to every intensity, by default 1 / 2^(n-1)
+    cutoff : float, optional
+        Fraction of the largest particle intensity below which transitions are dropped,
+
+        by default 1e-6
+
+    Returns
+    -------
+    PeakTable
+        Unreduced table of transitions, each assigned to the particle contributing most
+        to its intensity
+
+    Notes
+    -----
+        A transition with per-particle amplitudes a_i has intensity
+        sum_i(intensity_i * a_i) * sum_j(a_j). The default scale normalizes spin-1/2
+        systems so that each nucleus contributes its own intensity in total, as in the
+        first-order engine.
+    """
+    frequencies = np.asarray(nuclei_frequencies, dtype=np.float64)
+    if multiplicities is None:
+        multiplicities = (2,) * len(frequencies)
+    if scale is None:
+        scale = 0.5 ** (len(frequencies) - 1)
+    basis = spin_basis(tuple(multiplicities))
+    pair_i, pair_j = basis.pairs
+    couplings = np.asarray(J_couplings, dtype=np.float64)[pair_i, pair_j]
+    weights = np.asarray(intensities, dtype=np.float64)
+    threshold = cutoff * np.abs(weights).max(initial=0.0)
+
+    energies = []
+    vectors = []
+    for k in range(len(basis.magnetization)):
+        values, states = np.linalg.eigh(basis.hamiltonian(k, frequencies, couplings))
+        energies.append(values)
+        vectors.append(states)
+
+    signals: list[PeakTable] = []
+    for k, operators in enumerate(basis.lowering):
+        lower, upper = vectors[k], vectors[k + 1]
+        shape = (lower.shape[1], upper.shape[1])
+        # Per-particle amplitudes <b| I-_i |a> are accumulated one particle at a time,
+        # so only a few (block x block) matrices are ever held
+        total, weighted = np.zeros(shape), np.zeros(shape)
+        largest, smallest = np.full(shape, -np.inf), np.full(shape, np.inf)
+        argmax, argmin = np.zeros(shape, np.intp), np.zeros(shape, np.intp)
+        changed = np.empty(shape, dtype=bool)
+        for i, op in enumerate(operators):
+            amplitude = lower.T @ (op @ upper)
+            total += amplitude
+            weighted += weights[i] * amplitude
+            np.greater(amplitude, largest, out=changed)
+            np.copyto(argmax, i, where=changed)
+            np.maximum(largest, amplitude, out=largest)
+            np.less(amplitude, smallest, out=changed)
+            np.copyto(argmin, i, where=changed)
+            np.minimum(smallest, amplitude, out=smallest)
+        intensity = weighted * total * scale
+        keep = np.abs(intensity) > threshold
+        b, a = np.nonzero(keep)
+        # The particle contributing most maximizes amplitude_i * total
+        nucleus = np.where(total[keep] >= 0, argmax[keep], argmin[keep])
+        signals.append(
+            PeakTable(energies[k + 1][a] - energies[k][b], intensity[keep], nucleus)
+        )
+    return PeakTable.concatenate(signals)
+
+
+def qm_composite_transitions(
+    nuclei_frequencies: np.ndarray,
+    J_couplings: np.ndarray,
+    intensities: np.ndarray,
+    group_sizes: list[int],
+    cutoff: float = INTENSITY_CUTOFF,
+) -> PeakTable:
+    """
+    Computes every allowed transition of a strongly coupled spin system whose
+    particles are groups of magnetically equivalent spin-1/2 nuclei. The states of
+    a group of n nuclei decompose into total spins I = n/2, n/2 - 1, ... occurring
+    C(n, n/2 - I) - C(n, n/2 - I - 1) times, and couplings inside a group do not change
+    the spectrum. The spectrum is therefore the multiplicity-weighted sum of the
+    spectra of every combination of total spins, each simulated in a much smaller
+    basis than the 2^N states of the full system.
+
+    Parameters
+    ----------
+    nuclei_frequencies : np.ndarray
+        Resonance frequency (in Hz) of each group
+    J_couplings : np.ndarray
+        Symmetric (n x n) matrix of coupling constants (in Hz) between members of
+        different groups
+    intensities : np.ndarray
+        Relative intensity of each group, shared equally by its members
+    group_sizes : list[int]
+        Number of equivalent nuclei in each group
+    cutoff : float, optional
+        Fraction of the largest nucleus intensity below which transitions are dropped,
+
+        by default 1e-6
+
+    Returns
+    -------
+    PeakTable
+        Unreduced table of transitions, each assigned to the group contributing most
+        to its intensity
+    """
+    sizes = [int(size) for size in group_sizes]
+    weights = np.asarray(intensities, dtype=np.float64) / sizes
+    normalization = 0.5 ** (sum(sizes) - 1)
+    representations = [_total_spins(size) for size in sizes]
+
+    signals: list[PeakTable] = []
+    for combination in product(*representations):
+        multiplicities = tuple(levels for levels, _ in combination)
+        if max(multiplicities) == 1:
+            continue
+        degeneracy = prod(count for _, count in combination)
+        signals.append(
+            qm_transitions(
+                nuclei_frequencies,
+                J_couplings,
+                weights,
+                multiplicities,
+                degeneracy * normalization,
+                cutoff,
+            )
+        )
+    return PeakTable.concatenate(signals)
+
+
+# ---------------------------------------------------------------------------- #
+#                               Helper Functions                               #
+# ---------------------------------------------------------------------------- #
+
+
+def _total_spins(size: int) -> list[tuple[int, int]]:
+    """
+    Returns the (multiplicity 2I + 1, number of occurrences) of every total spin I
+    in the state space of `size` equivalent spin-1/2 nuclei.
+    """
+    return [
+        (size + 1 - 2 * t, comb(size, t) - (comb(size, t - 1) if t else 0))
+        for t in range(size // 2 + 1)
+    ]
@@ -1,11 +1,14 @@
 from enum import Enum
-from sys import stderr
 
 import numpy as np
 from numpy.typing import ArrayLike
 
-from solventspinsim.spin.peak import gen_peaklist_weak
-from solventspinsim.spin.types import PeakList
+from solventspinsim.spin.peak import (
+    coupling_components,
+    gen_peaklist,
+    magnetic_equivalence_groups,
+)
+from solventspinsim.table import PeakTable
 
 
 class CouplingStrength(Enum):
@@ -31,18 +34,28 @@ class Spin:
         Peak width at half height (in Hz) for spectral lines for each peak group
     coupling_strength : CouplingStrength
         Enum indicating the coupling type for simulation (e.g., weak coupling or strong coupling)
+    coupling_tolerance : float
+        Maximum difference (in Hz) between couplings of a nucleus grouped into one binomial multiplet
+    equivalent_groups : list[list[int]]
+        Partition of the nuclei into groups of magnetically equivalent nuclei (composite spins),
+
+        every nucleus is its own group unless groups are given or detected with "auto"
 
     Raises
     ------
     TypeError
-        If input types for nuclei_frequencies, couplings, half_height_width, or coupling_strength are invalid
+        If input types for nuclei_frequencies, couplings, half_height_width, coupling_strength, coupling_tolerance, or equivalent_groups are invalid
     ValueError
-        If couplings is not a square matrix of shape (n, n) or if coupling_strength is not a valid value
+        If couplings is not a square matrix of shape (n, n), if coupling_strength is not a valid value, if coupling_tolerance is negative,
+
+        or if equivalent_groups has out of range or repeated nuclei or is a string other than "auto"
 
     Methods
     -------
-    peaklist() -> list[tuple[float,float]]
-        Generates and returns a PeakList object based on the current coupling strength
+    components : list[np.ndarray]
+        Nucleus indices of each independent fragment (connected component of the couplings)
+    peaklist() -> PeakTable
+        Generates and returns a PeakTable object based on the current coupling strength
     """
 
     def __init__(
@@ -54,6 +67,8 @@ class Spin:
         field_strength: float = 500,
         intensities: list[float | int] | None = None,
         coupling_strength: CouplingStrength | str | int = CouplingStrength.WEAK,
+        coupling_tolerance: float = 0.0,
+        equivalent_groups: list[list[int]] | str | None = None,
     ) -> None:
         """
         Initializes a Spin object with specified nuclear frequencies, coupling matrix, linewidth, and coupling strength.
@@ -74,6 +89,26 @@ class Spin:
                 Enum specifying the coupling regime (e.g., WEAK or STRONG), by default CouplingStrength.WEAK
 
                 Alternatively, input 0 for weak and 1 for strong or "weak"/"strong" strings
+            coupling_tolerance : float, optional
+                Maximum difference (in Hz) between couplings of a nucleus that are grouped
+
+                into a single binomial multiplet, by default 0.0 (only exactly equal couplings,
+
+                which leaves the spectrum unchanged). A nonzero tolerance moves grouped lines
+
+                to their mean coupling, and optimization then simulates every evaluation with
+
+                `gen_peaklist` instead of the weak line model, without an analytic gradient
+            equivalent_groups : list[list[int]] | str | None, optional
+                Groups of magnetically equivalent nuclei simulated as composite spins, by default None
+
+                (every nucleus is simulated on its own). "auto" detects the groups from identical
+
+                shifts and couplings. Each group uses the shift and couplings of its first member,
+
+                and the weak coupling engine ignores couplings inside a group, so a nonzero mutual
+
+                coupling no longer splits the lines of a group (e.g. an A3X system)
 
         Returns
         -------
@@ -87,6 +122,8 @@ class Spin:
         self.half_height_width = half_height_width
         self.coupling_strength = coupling_strength
         self.intensities = intensities
+        self.coupling_tolerance = coupling_tolerance
+        self.equivalent_groups = equivalent_groups
         self.nuclei_peak_indices = []
 
     # ---------------------------------------------------------------------------- #
@@ -134,6 +171,7 @@ class Spin:
         self._nuclei_frequencies: list[float] | list[int] = ppm_to_hz(
             value, self._field_strength
         )
+        self._detected_groups: tuple[bytes, list[list[int]]] | None = None
 
     # --------------------------------- couplings -------------------------------- #
 
@@ -158,6 +196,7 @@ class Spin:
         if not np.issubdtype(arr.dtype, np.number):
             raise TypeError("couplings matrix must contain numeric values")
         self._couplings: np.ndarray = arr
+        self._detected_groups = None
 
     # ----------------------------- half_height_width ---------------------------- #
 
@@ -209,6 +248,60 @@ class Spin:
         else:
             raise TypeError("Invalid type for coupling_strength")
 
+    # ---------------------------- coupling_tolerance ---------------------------- #
+
+    @property
+    def coupling_tolerance(self) -> float:
+        return self._coupling_tolerance
+
+    @coupling_tolerance.setter
+    def coupling_tolerance(self, value: float) -> None:
+        try:
+            tolerance = float(value)
+        except Exception:
+            raise TypeError("coupling_tolerance must be a numeric value.")
+        if tolerance < 0:
+            raise ValueError("coupling_tolerance must not be negative.")
+        self._coupling_tolerance: float = tolerance
+
+    # ----------------------------- equivalent_groups ---------------------------- #
+
+    @property
+    def equivalent_groups(self) -> list[list[int]]:
+        if self._equivalent_groups is None:
+            return [[i] for i in range(self._nuclei_number)]
+        if self._equivalent_groups == "auto":
+            return self._auto_groups()
+        return self._equivalent_groups
+
+    @equivalent_groups.setter
+    def equivalent_groups(self, value: list[list[int]] | str | None) -> None:
+        if value is None or value == "auto":
+            self._equivalent_groups: list[list[int]] | str | None = value
+            return
+        if isinstance(value, str):
+            raise ValueError('equivalent_groups string must be "auto"')
+        try:
+            groups = [sorted(int(nucleus) for nucleus in group) for group in value]
+        except Exception:
+            raise TypeError("equivalent_groups must be a list of lists of ints")
+        members = [nucleus for group in groups for nucleus in group]
+        if any(not 0 <= nucleus < self._nuclei_number for nucleus in members):
+            raise ValueError(
+                f"equivalent_groups indices must be in range [0, {self._nuclei_number})"
+            )
+        if len(set(members)) != len(members) or any(not group for group in groups):
+            raise ValueError("equivalent_groups must be non-empty and disjoint")
+        singles = [[i] for i in range(self._nuclei_number) if i not in set(members)]
+        self._equivalent_groups = sorted(groups + singles)
+
+    # -------------------------------- components -------------------------------- #
+
+    @property
+    def components(self) -> list[np.ndarray]:
+        """Nucleus indices of each connected component of the coupling graph"""
+        return coupling_components(self._couplings)
+
     # -------------------------------- intensities ------------------------------- #
 
     @property
@@ -234,38 +327,56 @@ class Spin:
     #                                   Functions                                  #
     # ---------------------------------------------------------------------------- #
 
-    def peaklist(self, intensities: list[float | int] | None = None) -> PeakList:
+    def peaklist(self, intensities: list[float | int] | None = None) -> PeakTable:
         """
-        Generates and returns a PeakList object based on the current coupling strength.
+        Generates and returns a PeakTable object based on the current coupling strength.
         Depending on whether the coupling strength is strong or not, this method calls the appropriate
         peak list generation function:
 
             - `gen_peaklist_strong`: See documentation at `spin.peak.gen_peaklist_strong`
             - `gen_peaklist_weak`: See documentation at `spin.peak.gen_peaklist_weak`
 
-        Both functions use the nuclei frequencies and couplings associated with the Spin object.
+        Both functions use the nuclei frequencies and couplings associated with the Spin object,
+        and are applied to each connected component of the coupling graph independently,
+        with each group of equivalent nuclei treated as one composite spin (see `spin.peak.gen_peaklist`).
 
         Returns
         -------
-        PeakList : list[tuple[float, float, int]]
-            The generated peak list for the current spin system
+        PeakTable
+            The generated peak table for the current spin system
         """
         if intensities is not None:
             self.intensities = intensities
-        match self._coupling_strength:
-            case CouplingStrength.STRONG:
-                # return gen_peaklist_strong(self._nuclei_frequencies, self._couplings)
-                print(
-                    "Strong coupling peak list generation is still in development. Defaulting to weak coupling.",
-                    file=stderr,
-                )
-                return gen_peaklist_weak(
-                    self._nuclei_frequencies, self._couplings, self.intensities
-                )
-            case _:
-                return gen_peaklist_weak(
-                    self._nuclei_frequencies, self._couplings, self.intensities
-                )
+        return gen_peaklist(
+            self._nuclei_frequencies,
+            self._couplings,
+            self.intensities,
+            self.equivalent_groups,
+            self._coupling_strength == CouplingStrength.STRONG,
+            self._coupling_tolerance,
+        )
+
+    # ---------------------------------------------------------------------------- #
+    #                               Helper Functions                               #
+    # ---------------------------------------------------------------------------- #
+
+    def _auto_groups(self) -> list[list[int]]:
+        """
+        Returns the detected magnetic equivalence groups, cached on the frequencies and
+        couplings they were detected from. The cache is cleared by the setters, and the
+        key also catches edits made in place (e.g. by the coupling matrix and drag
+        callbacks).
+        """
+        key = (
+            np.asarray(self._nuclei_frequencies, dtype=np.float64).tobytes()
+            + np.asarray(self._couplings, dtype=np.float64).tobytes()
+        )
+        if self._detected_groups is None or self._detected_groups[0] != key:
+            groups = magnetic_equivalence_groups(
+                self._nuclei_frequencies, self._couplings
+            )
+            self._detected_groups = (key, groups)
+        return self._detected_groups[1]
 
 
 def loadSpinFromFile(
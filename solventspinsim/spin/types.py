@@ -1,2 +1,3 @@
-Peak = tuple[float, float, int]
-PeakList = list[Peak]
+from solventspinsim.table.types import Peak, PeakList
+
+__all__ = ["Peak", "PeakList"]
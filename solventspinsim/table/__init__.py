@@ -0,0 +1,3 @@
+from .table import PeakTable
+
+__all__ = ["PeakTable"]
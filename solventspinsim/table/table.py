@@ -0,0 +1,129 @@
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+
+from solventspinsim.table.types import Peak, PeakList
+
+
+class PeakTable:
+    """
+    A struct-of-arrays peak list shared by the spin, simulate, and optimize modules.
+    Each peak is stored as one row across three equal-length NumPy columns instead of
+    a (frequency, intensity, nuclei_idx) tuple.
+
+    Attributes
+    ----------
+    freq : np.ndarray
+        Frequency (in Hz) of each peak
+    intensity : np.ndarray
+        Relative intensity of each peak
+    nucleus : np.ndarray
+        Index of the nucleus each peak originates from (-1 for solvent peaks)
+
+    Methods
+    -------
+    from_peaks(peaks) -> PeakTable
+        Compatibility adapter converting a list of tuples (or a PeakTable) to a PeakTable
+    to_peaks() -> list[tuple[float, float, int]]
+        Converts the table back to the list of tuples form
+    """
+
+    __slots__ = ("freq", "intensity", "nucleus")
+
+    def __init__(
+        self,
+        freq: Any = (),
+        intensity: Any = (),
+        nucleus: Any = (),
+    ) -> None:
+        self.freq: np.ndarray = np.asarray(freq, dtype=np.float64).reshape(-1)
+        self.intensity: np.ndarray = np.asarray(intensity, dtype=np.float64).reshape(
+            -1
+        )
+        self.nucleus: np.ndarray = np.asarray(nucleus, dtype=np.intp).reshape(-1)
+        if not (len(self.freq) == len(self.intensity) == len(self.nucleus)):
+            raise ValueError("PeakTable columns must all have the same length")
+
+    # ---------------------------------------------------------------------------- #
+    #                                 Constructors                                 #
+    # ---------------------------------------------------------------------------- #
+
+    @classmethod
+    def from_peaks(cls, peaks: "PeakList | PeakTable") -> "PeakTable":
+        """
+        Converts a list of (frequency, intensity, nuclei_idx) tuples to a PeakTable.
+        PeakTable inputs are copied, so the result never shares columns with them.
+
+        Parameters
+        ----------
+        peaks : list[tuple[float, float, int]] | PeakTable
+            Peaks to convert
+
+        Returns
+        -------
+        PeakTable
+            Peak table holding the same peaks in the same order
+        """
+        if isinstance(peaks, PeakTable):
+            return peaks.copy()
+        count = len(peaks)
+        return cls(
+            np.fromiter((peak[0] for peak in peaks), np.float64, count),
+            np.fromiter((peak[1] for peak in peaks), np.float64, count),
+            np.fromiter((peak[2] for peak in peaks), np.intp, count),
+        )
+
+    @classmethod
+    def concatenate(cls, tables: "list[PeakTable]") -> "PeakTable":
+        """Joins the rows of every table, in order, into a single table."""
+        if not tables:
+            return cls()
+        return cls(
+            np.concatenate([table.freq for table in tables]),
+            np.concatenate([table.intensity for table in tables]),
+            np.concatenate([table.nucleus for table in tables]),
+        )
+
+    # ---------------------------------------------------------------------------- #
+    #                                   Functions                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def to_peaks(self) -> PeakList:
+        """Converts the table to a list of (frequency, intensity, nuclei_idx) tuples."""
+        return list(
+            zip(self.freq.tolist(), self.intensity.tolist(), self.nucleus.tolist())
+        )
+
+    def sorted(self) -> "PeakTable":
+        """
+        Returns a copy of the table sorted by frequency, then intensity, then nucleus,
+        matching the order of `sorted` on the list of tuples form
+        """
+        order = np.lexsort((self.nucleus, self.intensity, self.freq))
+        return self[order]
+
+    def copy(self) -> "PeakTable":
+        return PeakTable(self.freq.copy(), self.intensity.copy(), self.nucleus.copy())
+
+    # ---------------------------------------------------------------------------- #
+    #                                 Magic Methods                                #
+    # ---------------------------------------------------------------------------- #
+
+    def __len__(self) -> int:
+        return len(self.freq)
+
+    def __iter__(self) -> Iterator[Peak]:
+        return iter(self.to_peaks())
+
+    def __getitem__(self, key: Any) -> "Peak | PeakTable":
+        if isinstance(key, (int, np.integer)):
+            return (
+                float(self.freq[key]),
+                float(self.intensity[key]),
+                int(self.nucleus[key]),
+            )
+        return PeakTable(self.freq[key], self.intensity[key], self.nucleus[key])
+
+    def __repr__(self) -> str:
+        return f"PeakTable({self.to_peaks()!r})"
@@ -0,0 +1,2 @@
+Peak = tuple[float, float, int]
+PeakList = list[Peak]
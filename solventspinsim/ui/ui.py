@@ -3,6 +3,7 @@ from pathlib import Path
 import dearpygui.dearpygui as dpg
 
 from solventspinsim.callbacks import (
+    SimulationScheduler,
     fit_axes,
     load_dialog_callback,
     load_settings_dialog,
@@ -20,8 +21,10 @@ from solventspinsim.graphics import (
     SimulationSettings,
     WaterSettings,
 )
+from solventspinsim.optimize import poll_optimization, stop_optimization
+from solventspinsim.optimize.worker import OptimizationWorker
 from solventspinsim.settings import Settings
-from solventspinsim.simulate import Water
+from solventspinsim.simulate import SpectrumCache, Water
 from solventspinsim.spin import Spin
 from solventspinsim.themes import Theme, change_theme_callback
 
@@ -59,6 +62,9 @@ class UI:
         self.opt_settings = OptimizationSettings(**settings["opt_settings"])
         self.plot_window: PlotWindow = PlotWindow(**settings["plot_window"])
         self.water_sim: Water = Water(**settings["water_sim"])
+        self.optimization_worker: OptimizationWorker | None = None
+        self.spectrum_cache: SpectrumCache = SpectrumCache()
+        self.simulation_scheduler: SimulationScheduler = SimulationScheduler()
 
     # ---------------------------------------------------------------------------- #
     #                              Getters and Setters                             #
@@ -242,4 +248,10 @@ class UI:
         self.main_window()
 
         dpg.show_viewport()
-        dpg.start_dearpygui()
+        # Manual render loop, so that optimization progress and the simulation of
+        # the edits made since the previous frame are drawn between frames
+        while dpg.is_dearpygui_running():
+            poll_optimization(self)
+            self.simulation_scheduler.run_pending(self)
+            dpg.render_dearpygui_frame()
+        stop_optimization(self, timeout=5.0)
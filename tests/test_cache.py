@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.cache import EvaluationCache
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.spin import Spin
+
+
+def test_evaluation_cache_evicts_least_recently_used():
+    cache = EvaluationCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    # Peeking neither counts nor refreshes an entry
+    assert cache.peek("a") == 1
+    assert (cache.hits, cache.misses) == (3, 1)
+    cache.put("d", 4)
+    assert cache.peek("a") is None
+
+    with pytest.raises(ValueError):
+        EvaluationCache(maxsize=0)
+
+
+def test_objective_cache_rounds_keys_below_finite_difference_steps():
+    spin = Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    cache = EvaluationCache()
+    objective = QuadrantObjective(spin, packer, x, np.zeros_like(x), cache=cache)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+
+    value = objective(params)
+    assert objective(params + 1e-12) == value
+    assert (cache.hits, objective.evaluations) == (1, 1)
+
+    probe = params.copy()
+    probe[0] += 1e-8
+    assert objective(probe) != value
+    assert objective.evaluations == 2
+
+    # Snapshots read the cache without counting
+    objective.snapshot(params)
+    assert (cache.hits, cache.misses, objective.evaluations) == (1, 2, 2)
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.checkpoint import Checkpoint, fit_signature
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.optimize.optimize import _fit_schedule
+from solventspinsim.spin import Spin
+
+
+def _fit() -> tuple[np.ndarray, Spin, ParameterPacker, np.ndarray]:
+    spin = Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    target = params.copy()
+    target[packer.couplings] = 6.5
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target)
+    return np.vstack((x, y)), spin, packer, params
+
+
+def test_checkpoint_resume_and_signature_mismatch(tmp_path):
+    path = str(tmp_path / "fit.npz")
+    assert not Checkpoint(path).load("fit")
+
+    checkpoint = Checkpoint(path)
+    checkpoint.signature = "fit"
+    checkpoint.save(np.array([1.0, 2.0, 3.0]), 0.5, [np.array([1.0, 2.0, 2.5])], 2)
+
+    resumed = Checkpoint(path)
+    assert resumed.load("fit")
+    np.testing.assert_array_equal(resumed.params, [1.0, 2.0, 3.0])
+    assert resumed.cost == 0.5
+    assert resumed.sweep == 2
+    assert len(resumed.regions) == 1
+
+    with pytest.raises(ValueError, match="different fit"):
+        Checkpoint(path).load("another fit")
+
+
+def test_signature_identifies_data_and_starting_parameters():
+    nmr_array, spin, _, params = _fit()
+    arguments = ((500.0, 510.0), "lbfgsb", "quadrants", 1)
+    signature = fit_signature(nmr_array, spin._nuclei_frequencies, params, *arguments)
+
+    assert signature == fit_signature(
+        nmr_array.copy(), spin._nuclei_frequencies, params.copy(), *arguments
+    )
+    assert signature != fit_signature(
+        nmr_array, spin._nuclei_frequencies, params * 0.5, *arguments
+    )
+    assert signature != fit_signature(
+        nmr_array * 2, spin._nuclei_frequencies, params, *arguments
+    )
+
+
+def test_completed_fit_removes_its_checkpoint(tmp_path):
+    nmr_array, spin, packer, params = _fit()
+    checkpoint = Checkpoint(str(tmp_path / "fit.npz"))
+    checkpoint.signature = "fit"
+
+    first = _fit_schedule(
+        nmr_array, spin, packer, params, (545.0, 555.0), checkpoint=checkpoint
+    )
+    assert not os.path.exists(checkpoint.path)
+    assert checkpoint.params is None
+
+    # A new fit sharing the checkpoint starts over instead of returning `first`
+    second = _fit_schedule(
+        nmr_array, spin, packer, params * 0.5, (545.0, 555.0), checkpoint=checkpoint
+    )
+    assert not Checkpoint(checkpoint.path).load("fit")
+    assert not np.array_equal(first, second)
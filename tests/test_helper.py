@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.spin import Spin
+
+
+def _spin(equivalent_groups: list[list[int]] | None = None) -> Spin:
+    couplings = np.array(
+        [
+            [0.0, 0.0, 7.0, 2.0],
+            [0.0, 0.0, 7.0, 2.0],
+            [7.0, 7.0, 0.0, 0.0],
+            [2.0, 2.0, 0.0, 0.0],
+        ]
+    )
+    return Spin(
+        ["H1", "H2", "H3", "H4"],
+        [1.0, 1.0, 1.2, 1.5],
+        couplings,
+        [1.0, 1.0, 1.5, 0.8],
+        500.0,
+        equivalent_groups=equivalent_groups,
+    )
+
+
+def test_packer_keeps_only_independent_nonzero_couplings():
+    packer = ParameterPacker(_spin())
+
+    # Four nonzero upper-triangle couplings instead of the 16 matrix entries
+    assert packer.couplings == slice(0, 4)
+    assert packer.size == 4 + 4 + 4
+    assert len(packer.bounds()) == packer.size
+    np.testing.assert_array_equal(packer.coupling_pairs[0], [0, 0, 1, 1])
+    np.testing.assert_array_equal(packer.coupling_pairs[1], [2, 3, 2, 3])
+
+
+def test_packer_round_trip():
+    spin = _spin([[0, 1], [2], [3]])
+    packer = ParameterPacker(spin, simulate_water=True)
+    couplings = np.array(spin._couplings, dtype=np.float64)
+    intensities = np.array([2.0, 2.0, 1.0, 3.0])
+    hhw = np.array([1.0, 1.0, 1.5, 0.8])
+    water = (470.0, 5.0, 3.0)
+
+    params = packer.pack(couplings, intensities, hhw, water)
+    # Two packed couplings between the three groups, one intensity and width per group
+    assert params.shape == (2 + 3 + 3 + 3,)
+
+    unpacked = packer.unpack(params)
+    np.testing.assert_array_equal(unpacked[0], couplings)
+    np.testing.assert_array_equal(unpacked[1], intensities)
+    np.testing.assert_array_equal(unpacked[2], hhw)
+    assert unpacked[3] == water
+    np.testing.assert_array_equal(packer.pack(*unpacked), params)
+
+
+def test_unpacked_couplings_stay_symmetric():
+    packer = ParameterPacker(_spin([[0, 1], [2], [3]]))
+    params = np.arange(1.0, packer.size + 1.0)
+
+    couplings = packer.unpack(params)[0]
+    out = np.full((4, 4), np.nan)
+    packer.unpack(params, out)
+
+    np.testing.assert_array_equal(couplings, couplings.T)
+    np.testing.assert_array_equal(couplings[[0, 1], 2], [1.0, 1.0])
+    np.testing.assert_array_equal(couplings[[0, 1], 3], [2.0, 2.0])
+    np.testing.assert_array_equal(np.diag(couplings), 0.0)
+    np.testing.assert_array_equal(out, couplings)
+
+
+def test_water_parameters_are_required_when_packed():
+    packer = ParameterPacker(_spin(), simulate_water=True)
+    spin = _spin()
+    with pytest.raises(ValueError):
+        packer.pack(spin._couplings, [1.0] * 4, spin._half_height_width)
+    with pytest.raises(ValueError):
+        packer.bounds()
@@ -0,0 +1,76 @@
+from io import StringIO
+
+import numpy as np
+import pytest
+
+from solventspinsim.optimize import optimize
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.multires import multiresolution_factors, smooth_spectrum
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.spin import Spin
+
+
+def _fit(
+    points: int,
+) -> tuple[np.ndarray, Spin, ParameterPacker, np.ndarray, np.ndarray]:
+    """Spectrum of a perturbed spin, with its packer, start and target parameters."""
+    spin = Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, points)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    target = params.copy()
+    target[packer.couplings] = 6.5
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target)
+    return np.vstack((x, y)), spin, packer, params, target
+
+
+def test_levels_halve_down_to_the_full_spectrum():
+    assert multiresolution_factors(1, 1000) == [1]
+    assert multiresolution_factors(3, 1000) == [4, 2, 1]
+    # Levels with fewer than MULTIRES_MIN_POINTS points are skipped
+    assert multiresolution_factors(4, 300) == [4, 2, 1]
+    with pytest.raises(ValueError):
+        multiresolution_factors(0, 1000)
+
+
+def test_smoothed_spectrum_matches_broadened_lines():
+    nmr_array, spin, packer, _, target = _fit(4000)
+
+    level_array, broadening = smooth_spectrum(nmr_array, 4)
+    expected = QuadrantObjective(
+        spin, packer, level_array[0], level_array[1], broadening
+    ).simulate(target)
+
+    assert level_array.shape == (2, 1000)
+    np.testing.assert_array_equal(level_array[0], nmr_array[0][::4])
+    # Only the truncated kernel tails are missing
+    error = np.abs(level_array[1] - expected).max()
+    assert error < 0.02 * expected.max()
+    assert smooth_spectrum(nmr_array, 1) == (nmr_array, 0.0)
+
+
+def test_schedule_reports_every_level_and_recovers_the_couplings(monkeypatch):
+    nmr_array, spin, packer, params, target = _fit(2000)
+    report = StringIO()
+    monkeypatch.setattr(optimize, "stderr", report)
+
+    fitted = optimize._fit_schedule(
+        nmr_array, spin, packer, params, (545.0, 555.0), levels=3
+    )
+
+    np.testing.assert_allclose(
+        fitted[packer.couplings], target[packer.couplings], atol=1e-3
+    )
+    lines = report.getvalue().splitlines()
+    assert [line.split(":")[0] for line in lines] == [
+        "Level 1/3",
+        "Level 2/3",
+        "Level 3/3",
+    ]
+    assert "500 points" in lines[0] and "2000 points" in lines[2]
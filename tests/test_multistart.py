@@ -0,0 +1,66 @@
+import numpy as np
+
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.multistart import (
+    MULTISTART_COUPLING_SPREAD,
+    MULTISTART_RELATIVE_SPREAD,
+    multistart_optimization,
+    start_points,
+)
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.spin import Spin
+
+
+def _spin() -> Spin:
+    return Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+
+
+def test_start_points_sample_around_initial_parameters():
+    packer = ParameterPacker(_spin(), simulate_water=True)
+    water = (545.0, 5.0, 3.0)
+    params = packer.pack(_spin()._couplings, [2.0, 2.0], [1.0, 1.0], water)
+    bounds = packer.bounds((540.0, 560.0))
+
+    points = start_points(packer, params, bounds, 9, seed=3)
+
+    assert points.shape == (9, packer.size)
+    np.testing.assert_array_equal(points[0], params)
+    repeated = start_points(packer, params, bounds, 9, seed=3)
+    np.testing.assert_array_equal(points, repeated)
+    lower, upper = np.array(bounds).T
+    assert np.all((points >= lower) & (points <= upper))
+
+    spread = MULTISTART_RELATIVE_SPREAD * np.abs(params)
+    spread[packer.couplings] = MULTISTART_COUPLING_SPREAD
+    spread[packer.water.start] = MULTISTART_RELATIVE_SPREAD * 10.0
+    offsets = (points[1:] - params) / spread
+    assert np.all(np.abs(offsets) <= 1.0)
+    # Latin hypercube: one sample in each of the 8 strata of every parameter
+    strata = np.floor((offsets + 1) / 2 * 8)
+    for column in strata.T:
+        assert sorted(column) == list(range(8))
+
+
+def test_multistart_returns_ranked_alternatives():
+    spin = _spin()
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    target = params.copy()
+    target[packer.couplings] = 6.0
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target)
+
+    ranked = multistart_optimization(
+        np.vstack((x, y)), spin, packer, params, (545.0, 555.0), 8, 0
+    )
+
+    assert len(ranked) == 2
+    costs = [cost for cost, _ in ranked]
+    assert costs == sorted(costs)
+    np.testing.assert_allclose(ranked[0][1][packer.couplings], 6.0, atol=1e-3)
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.simulate.simulate import lorentz, simulate_lorentzians
+from solventspinsim.spin import Spin
+
+
+def _spin(
+    equivalent_groups: list[list[int]] | None = None, coupling_strength: str = "weak"
+) -> Spin:
+    couplings = np.array(
+        [
+            [0.0, 0.0, 7.0, 2.0],
+            [0.0, 0.0, 7.0, 2.0],
+            [7.0, 7.0, 0.0, 0.0],
+            [2.0, 2.0, 0.0, 0.0],
+        ]
+    )
+    return Spin(
+        ["H1", "H2", "H3", "H4"],
+        [1.0, 1.0, 1.2, 1.5],
+        couplings,
+        [1.0, 1.0, 1.5, 0.8],
+        500.0,
+        coupling_strength=coupling_strength,
+        equivalent_groups=equivalent_groups,
+    )
+
+
+def _objective(
+    spin: Spin, broadening: float = 0.0
+) -> tuple[QuadrantObjective, np.ndarray]:
+    """Objective over a spectrum simulated from perturbed parameters, and its start."""
+    packer = ParameterPacker(spin, simulate_water=True)
+    x = np.linspace(800.0, 440.0, 1500)
+    params = packer.pack(
+        spin._couplings, [1.0, 1.0, 1.0, 1.0], spin._half_height_width, (470, 5, 3)
+    )
+    target = params + np.random.default_rng(0).normal(0.0, 0.2, packer.size)
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target).copy()
+    return QuadrantObjective(spin, packer, x, y, broadening), params
+
+
+@pytest.mark.parametrize(
+    "groups, broadening", [(None, 0.0), ([[0, 1], [2], [3]], 0.0), (None, 1.5)]
+)
+def test_analytic_gradient_matches_finite_differences(groups, broadening: float):
+    objective, params = _objective(_spin(groups), broadening)
+    assert objective.has_gradient
+    rmse, gradient = objective.value_and_gradient(params)
+    assert rmse == pytest.approx(objective(params))
+
+    step = 1e-6
+    expected = np.empty(len(params))
+    for k in range(len(params)):
+        shift = np.zeros(len(params))
+        shift[k] = step
+        forward, backward = objective(params + shift), objective(params - shift)
+        expected[k] = (forward - backward) / (2 * step)
+    np.testing.assert_allclose(gradient, expected, rtol=1e-5, atol=1e-8)
+
+
+def test_strong_coupling_has_no_analytic_gradient():
+    objective, params = _objective(_spin(coupling_strength="strong"))
+
+    assert not objective.has_gradient
+    with pytest.raises(ValueError):
+        objective.value_and_gradient(params)
+
+
+@pytest.mark.parametrize("coupling_strength", ["weak", "strong"])
+def test_objective_matches_simulating_a_new_spin(coupling_strength: str):
+    objective, params = _objective(_spin(coupling_strength=coupling_strength))
+    params = params + np.random.default_rng(1).normal(0.0, 0.1, len(params))
+    couplings, intensities, hhw, water = objective.packer.unpack(params)
+
+    spin = _spin(coupling_strength=coupling_strength)
+    spin.couplings = couplings
+    spin.half_height_width = hhw.tolist()
+    expected = simulate_lorentzians(
+        objective.x, spin.peaklist(intensities.tolist()), spin.half_height_width
+    )
+    expected += lorentz(objective.x, *water)
+
+    np.testing.assert_allclose(objective.simulate(params), expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("coupling_strength", ["weak", "strong"])
+def test_evaluations_build_no_spin(monkeypatch, coupling_strength: str):
+    objective, params = _objective(_spin(coupling_strength=coupling_strength))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Spin constructed during an evaluation")
+
+    monkeypatch.setattr(Spin, "__init__", fail)
+    objective(params)
+    objective(params * 1.01)
+    assert objective.evaluations == 2
+
+
+def test_snapshot_leaves_the_fit_buffers_untouched():
+    objective, params = _objective(_spin())
+    objective(params)
+    simulation = objective.simulation.copy()
+
+    snapshot = objective.snapshot(params * 1.1)
+
+    np.testing.assert_array_equal(objective.simulation, simulation)
+    assert objective.evaluations == 1
+    assert snapshot.simulation is not objective.simulation
+    np.testing.assert_allclose(
+        snapshot.simulation, objective.simulate(params * 1.1), rtol=1e-12
+    )
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.optimize import optimize
+from solventspinsim.optimize.optimize import section_optimization
+from solventspinsim.parse.parse import build_parser
+from solventspinsim.spin import Spin
+
+
+def _fit() -> tuple[np.ndarray, Spin, ParameterPacker, np.ndarray, np.ndarray]:
+    """Spectrum of a perturbed spin, with its packer, start and target parameters."""
+    spin = Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    target = params.copy()
+    target[packer.couplings] = 6.5
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target)
+    return np.vstack((x, y)), spin, packer, params, target
+
+
+@pytest.mark.parametrize("method", ["lbfgsb", "least_squares"])
+def test_section_optimization_recovers_the_couplings(method: str):
+    nmr_array, spin, packer, params, target = _fit()
+
+    fitted = section_optimization(
+        nmr_array, spin, packer, params, (545.0, 555.0), method
+    )
+
+    np.testing.assert_allclose(
+        fitted[packer.couplings], target[packer.couplings], atol=1e-3
+    )
+
+
+def test_least_squares_sparsity_covers_the_jacobian():
+    nmr_array, spin, packer, params, _ = _fit()
+    objective = QuadrantObjective(spin, packer, *nmr_array)
+    sparsity = objective.jacobian_sparsity(params).toarray()
+
+    step = 1e-6
+    jacobian = np.empty(sparsity.shape)
+    for k in range(len(params)):
+        shift = np.zeros(len(params))
+        shift[k] = step
+        forward = objective.residuals(params + shift)
+        backward = objective.residuals(params - shift)
+        jacobian[:, k] = (forward - backward) / (2 * step)
+
+    # Lines only reach past the structure through their far lorentzian tails
+    assert np.abs(jacobian[~sparsity]).max() < 1e-3 * np.abs(jacobian).max()
+    assert sparsity.mean() < 1.0
+
+
+def test_unknown_method_is_rejected():
+    nmr_array, spin, packer, params, _ = _fit()
+    with pytest.raises(ValueError, match="Unknown optimization method"):
+        section_optimization(nmr_array, spin, packer, params, (545.0, 555.0), "bfgs")
+
+
+def test_method_is_selectable_from_the_command_line():
+    args = build_parser().parse_args(["--opt-method", "least_squares"])
+    assert args.opt_method == "least_squares"
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--opt-method", "bfgs"])
+
+
+def test_parallel_quadrants_are_deterministic():
+    nmr_array, spin, packer, params, target = _fit()
+    arguments = (nmr_array, spin, packer, params, (545.0, 555.0))
+
+    first = section_optimization(*arguments, workers=2)
+    second = section_optimization(*arguments, workers=4)
+
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(
+        first[packer.couplings], target[packer.couplings], atol=1e-3
+    )
+
+
+def test_parallel_quadrants_fall_back_to_sequential(monkeypatch):
+    nmr_array, spin, packer, params, _ = _fit()
+    arguments = (nmr_array, spin, packer, params, (545.0, 555.0))
+
+    def unavailable(*args, **kwargs):
+        raise OSError("no processes")
+
+    monkeypatch.setattr(optimize, "_fit_quadrants_parallel", unavailable)
+    fitted = section_optimization(*arguments, workers=2)
+
+    np.testing.assert_array_equal(fitted, section_optimization(*arguments))
+    with pytest.raises(ValueError, match="Worker count"):
+        section_optimization(*arguments, workers=0)
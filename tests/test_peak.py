@@ -0,0 +1,248 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from solventspinsim.simulate.simulate import simulate_lorentzians_batched
+from solventspinsim.spin.peak import (
+    _multiplet,
+    _reduce_peaks,
+    coupling_components,
+    gen_peaklist,
+    gen_peaklist_strong,
+    gen_peaklist_weak,
+    magnetic_equivalence_groups,
+)
+from solventspinsim.table import PeakTable
+
+
+def _expanded_multiplet(signal: tuple, couplings: list[float]) -> PeakTable:
+    """Reference multiplet applying every coupling as a doublet of the 2^k lines."""
+    peaks = [signal]
+    for coupling in couplings:
+        peaks = [
+            (frequency + offset, intensity / 2, nucleus)
+            for frequency, intensity, nucleus in peaks
+            for offset in (-coupling / 2, coupling / 2)
+        ]
+    return PeakTable.from_peaks(peaks)
+
+
+def test_multiplet_matches_doublet_expansion():
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        couplings = rng.choice([7.0, 7.1, 3.3, 12.0], size=rng.integers(0, 9)).tolist()
+        couplings += rng.uniform(0.5, 15.0, size=rng.integers(0, 3)).tolist()
+        signal = (rng.uniform(-2000.0, 2000.0), rng.uniform(0.1, 3.0), 2)
+
+        table = _multiplet(signal, [(coupling, 1) for coupling in couplings])
+        expected = _expanded_multiplet(signal, couplings)
+        # Lines a rounding error apart are one line
+        table = _reduce_peaks(table, 1e-9)
+        expected = _reduce_peaks(expected, 1e-9)
+
+        np.testing.assert_allclose(table.freq, expected.freq, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(table.intensity, expected.intensity, rtol=1e-12)
+        assert np.all(table.nucleus == 2)
+
+
+def test_multiplet_of_equivalent_couplings_is_binomial():
+    table = _multiplet((100.0, 8.0, 0), [(7.0, 1)] * 3)
+    grouped = _multiplet((100.0, 8.0, 0), [(7.0, 3)])
+
+    np.testing.assert_allclose(table.freq, [89.5, 96.5, 103.5, 110.5])
+    np.testing.assert_allclose(table.intensity, [1.0, 3.0, 3.0, 1.0])
+    np.testing.assert_allclose(grouped.freq, table.freq)
+    np.testing.assert_allclose(grouped.intensity, table.intensity)
+
+
+@pytest.mark.parametrize("count", [20, 40])
+def test_multiplet_keeps_only_distinct_lines(count: int):
+    table = _multiplet((0.0, 1.0, 0), [(7.0, 1)] * count)
+
+    assert len(table) == count + 1
+    np.testing.assert_allclose(table.intensity.sum(), 1.0)
+
+
+def _reference_reduce(table: PeakTable, tolerance: float) -> list[tuple]:
+    """Reference merge of sorted peaks, one group of adjacent peaks at a time."""
+    peaks = sorted(table.to_peaks())
+    groups = [[peaks[0]]]
+    for peak in peaks[1:]:
+        if peak[0] - groups[-1][-1][0] > tolerance:
+            groups.append([])
+        groups[-1].append(peak)
+    reduced = []
+    for group in groups:
+        nuclei = [peak[2] for peak in group]
+        mode = min(set(nuclei), key=lambda nucleus: (-nuclei.count(nucleus), nucleus))
+        reduced.append(
+            (
+                sum(peak[0] for peak in group) / len(group),
+                sum(peak[1] for peak in group),
+                mode,
+            )
+        )
+    return reduced
+
+
+@pytest.mark.parametrize("tolerance", [0.0, 0.05, 0.5])
+def test_reduce_peaks_matches_reference_merge(tolerance: float):
+    rng = np.random.default_rng(0)
+    table = PeakTable(
+        np.round(rng.uniform(0.0, 50.0, 400), 2),
+        rng.uniform(0.0, 1.0, 400),
+        rng.integers(0, 4, 400),
+    )
+    expected = np.array(_reference_reduce(table, tolerance))
+
+    reduced = _reduce_peaks(table, tolerance)
+    presorted = _reduce_peaks(table[np.argsort(table.freq)], tolerance, is_sorted=True)
+
+    for result in (reduced, presorted):
+        np.testing.assert_allclose(result.freq, expected[:, 0], rtol=1e-12)
+        np.testing.assert_allclose(result.intensity, expected[:, 1], rtol=1e-12)
+        np.testing.assert_array_equal(result.nucleus, expected[:, 2])
+
+
+def test_reduce_peaks_does_not_alias_sorted_input():
+    table = PeakTable([1.0, 2.0], [1.0, 1.0], [0, 1])
+    reduced = _reduce_peaks(table, is_sorted=True)
+    reduced.intensity[0] = 5.0
+    assert table.intensity[0] == 1.0
+
+
+def test_single_fragment_is_not_shared_with_the_cache():
+    couplings = np.array([[0.0, 7.0], [7.0, 0.0]])
+    first = gen_peaklist([100.0, 200.0], couplings, [1.0, 1.0])
+    first.intensity[:] = 0.0
+    second = gen_peaklist([100.0, 200.0], couplings, [1.0, 1.0])
+
+    np.testing.assert_allclose(second.intensity, 0.5)
+
+
+def test_weak_peaklist_groups_equal_couplings_without_changing_lines():
+    couplings = np.array(
+        [
+            [0.0, 7.0, 7.0, 7.0],
+            [7.0, 0.0, 0.0, 0.0],
+            [7.0, 0.0, 0.0, 0.0],
+            [7.0, 0.0, 0.0, 0.0],
+        ]
+    )
+    table = gen_peaklist_weak([100.0, 300.0, 300.0, 300.0], couplings, [1, 1, 1, 1])
+    quartet = table[table.nucleus == 0]
+
+    expected = _reduce_peaks(_expanded_multiplet((100.0, 1.0, 0), [7.0] * 3), 1e-9)
+    np.testing.assert_allclose(quartet.freq, expected.freq)
+    np.testing.assert_allclose(quartet.intensity, expected.intensity)
+
+
+def test_weak_peaklist_tolerance_groups_close_couplings_at_their_mean():
+    couplings = np.array([[0.0, 6.9, 7.1], [6.9, 0.0, 0.0], [7.1, 0.0, 0.0]])
+    exact = gen_peaklist_weak([100.0, 300.0, 400.0], couplings, [1, 1, 1])
+    grouped = gen_peaklist_weak([100.0, 300.0, 400.0], couplings, [1, 1, 1], 0.5)
+
+    assert len(exact[exact.nucleus == 0]) == 4
+    triplet = grouped[grouped.nucleus == 0]
+    np.testing.assert_allclose(triplet.freq, [93.0, 100.0, 107.0])
+    np.testing.assert_allclose(triplet.intensity, [0.25, 0.5, 0.25])
+
+
+def test_fragment_cache_is_shared_safely_between_threads(monkeypatch):
+    monkeypatch.setattr("solventspinsim.spin.peak.FRAGMENT_CACHE_SIZE", 2)
+    couplings = np.array([[0.0, 7.0, 0.0], [7.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+
+    def simulate(seed: int) -> float:
+        frequencies = [100.0 + seed % 5, 200.0, 300.0 + seed % 3]
+        tables = [
+            gen_peaklist(frequencies, couplings, [1.0, 1.0, 1.0]) for _ in range(200)
+        ]
+        return tables[-1].intensity.sum()
+
+    # Switch threads often so that cache updates interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            totals = list(executor.map(simulate, range(32)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    np.testing.assert_allclose(totals, 3.0)
+
+
+def _spectrum(table: PeakTable, x: np.ndarray, hhw: float = 0.5) -> np.ndarray:
+    widths = np.full(len(table), hhw)
+    return simulate_lorentzians_batched(x, table.freq, table.intensity, widths)
+
+
+@pytest.mark.parametrize("strong", [False, True])
+def test_composite_spins_match_full_expansion(strong: bool):
+    frequencies = [100.0, 100.0, 100.0, 125.0]
+    couplings = np.array(
+        [
+            [0.0, 0.0, 0.0, 7.0],
+            [0.0, 0.0, 0.0, 7.0],
+            [0.0, 0.0, 0.0, 7.0],
+            [7.0, 7.0, 7.0, 0.0],
+        ]
+    )
+    if strong:
+        # Couplings inside a group of equivalent nuclei are not observed
+        couplings[:3, :3] = 12.0 - 12.0 * np.eye(3)
+    intensities = [1.0, 1.0, 1.0, 1.0]
+    x = np.linspace(60.0, 165.0, 4000)
+
+    full = gen_peaklist(frequencies, couplings, intensities, strong=strong)
+    composite = gen_peaklist(
+        frequencies, couplings, intensities, [[0, 1, 2], [3]], strong=strong
+    )
+
+    np.testing.assert_allclose(
+        _spectrum(composite, x), _spectrum(full, x), rtol=1e-6, atol=1e-9
+    )
+    np.testing.assert_allclose(composite.intensity.sum(), 4.0)
+    assert set(composite.nucleus.tolist()) == {0, 3}
+
+
+def test_magnetic_equivalence_groups_need_equal_shifts_and_couplings():
+    frequencies = [100.0, 100.0, 100.0, 200.0, 200.0, 300.0]
+    couplings = np.zeros((6, 6))
+    couplings[:3, 3:5] = couplings[3:5, :3] = 7.0
+    # Nucleus 4 couples to 5 but nucleus 3 does not, so they are not equivalent
+    couplings[4, 5] = couplings[5, 4] = 2.0
+
+    groups = magnetic_equivalence_groups(frequencies, couplings)
+
+    assert groups == [[0, 1, 2], [3], [4], [5]]
+
+
+def test_coupling_components_split_uncoupled_fragments():
+    couplings = np.zeros((5, 5))
+    couplings[0, 3] = couplings[3, 0] = 7.0
+    couplings[3, 4] = couplings[4, 3] = 2.0
+
+    components = coupling_components(couplings)
+
+    assert [component.tolist() for component in components] == [[0, 3, 4], [1], [2]]
+
+
+@pytest.mark.parametrize("strong", [False, True])
+def test_fragments_match_simulating_the_whole_system(strong: bool):
+    frequencies = [100.0, 160.0, 112.0, 200.0, 215.0]
+    couplings = np.zeros((5, 5))
+    couplings[0, 2] = couplings[2, 0] = 7.0
+    couplings[3, 4] = couplings[4, 3] = 9.0
+    intensities = [1.0, 2.0, 1.0, 1.0, 0.5]
+    engine = gen_peaklist_strong if strong else gen_peaklist_weak
+
+    fragmented = gen_peaklist(frequencies, couplings, intensities, strong=strong)
+    whole = engine(frequencies, couplings, intensities)
+
+    fragmented = _reduce_peaks(fragmented, 1e-9)
+    whole = _reduce_peaks(whole, 1e-9)
+    np.testing.assert_allclose(fragmented.freq, whole.freq, atol=1e-9)
+    np.testing.assert_allclose(fragmented.intensity, whole.intensity, atol=1e-9)
+    np.testing.assert_array_equal(fragmented.nucleus, whole.nucleus)
@@ -0,0 +1,62 @@
+from io import StringIO
+
+import numpy as np
+import pytest
+
+from solventspinsim.spin import peak
+from solventspinsim.spin.peak import gen_peaklist_strong, gen_peaklist_weak
+from solventspinsim.spin.qm import MAX_STRONG_STATES, SpinBasis
+
+
+def test_strong_ab_quartet_roofing():
+    shift, coupling = 10.0, 8.0
+    couplings = np.array([[0.0, coupling], [coupling, 0.0]])
+    table = gen_peaklist_strong([100.0, 100.0 + shift], couplings, [1, 1]).sorted()
+
+    center = 100.0 + shift / 2
+    d = np.hypot(shift, coupling)
+    offsets = np.array([-d - coupling, -d + coupling, d - coupling, d + coupling])
+    inner, outer = (1 + coupling / d) / 2, (1 - coupling / d) / 2
+
+    np.testing.assert_allclose(table.freq, center + offsets / 2)
+    np.testing.assert_allclose(table.intensity, [outer, inner, inner, outer])
+    # Roofing: the inner lines lean towards each other
+    assert table.intensity[1] > table.intensity[0]
+    assert table.intensity[2] > table.intensity[3]
+
+
+def test_strong_matches_weak_in_the_weak_limit():
+    frequencies = [1000.0, 3000.0, 6000.0]
+    couplings = np.array([[0.0, 7.0, 3.0], [7.0, 0.0, 11.0], [3.0, 11.0, 0.0]])
+    intensities = [1.0, 2.0, 1.0]
+
+    weak = gen_peaklist_weak(frequencies, couplings, intensities).sorted()
+    strong = gen_peaklist_strong(frequencies, couplings, intensities).sorted()
+
+    assert len(strong) == len(weak)
+    # Second-order shifts scale as J^2 / (difference in frequency)
+    np.testing.assert_allclose(strong.freq, weak.freq, atol=0.1)
+    np.testing.assert_allclose(strong.intensity, weak.intensity, rtol=0.02)
+    np.testing.assert_array_equal(strong.nucleus, weak.nucleus)
+
+
+def test_basis_larger_than_the_cap_is_rejected():
+    nuclei = int(np.log2(MAX_STRONG_STATES)) + 1
+    with pytest.raises(ValueError):
+        SpinBasis((2,) * nuclei)
+
+
+def test_strong_falls_back_to_weak_above_the_state_cap(monkeypatch):
+    warnings = StringIO()
+    monkeypatch.setattr(peak, "stderr", warnings)
+    nuclei = int(np.log2(MAX_STRONG_STATES)) + 1
+    frequencies = [100.0 * (i + 1) for i in range(nuclei)]
+    couplings = np.zeros((nuclei, nuclei))
+    couplings[0, 1:] = couplings[1:, 0] = 7.0
+
+    strong = gen_peaklist_strong(frequencies, couplings, [1.0] * nuclei)
+    weak = gen_peaklist_weak(frequencies, couplings, [1.0] * nuclei)
+
+    np.testing.assert_allclose(strong.sorted().freq, weak.sorted().freq)
+    np.testing.assert_allclose(strong.sorted().intensity, weak.sorted().intensity)
+    assert "weak coupling" in warnings.getvalue()
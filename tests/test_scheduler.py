@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import solventspinsim.callbacks.scheduler as scheduler
+from solventspinsim.callbacks.scheduler import SimulationScheduler
+
+
+def _ui(spin_names: list[str]) -> SimpleNamespace:
+    spin = SimpleNamespace(
+        spin_names=spin_names, half_height_width=[1.0], _nuclei_number=1
+    )
+    return SimpleNamespace(
+        current_spin=spin,
+        points=[],
+        water_sim=None,
+        spectrum_cache=None,
+        plot_tags={"main": "main"},
+    )
+
+
+def _count(monkeypatch) -> dict[str, list]:
+    calls = {"simulate": [], "zoom": [], "fit": []}
+
+    def record(name: str):
+        def call(*args, **kwargs) -> None:
+            calls[name].append(args)
+
+        return call
+
+    monkeypatch.setattr(scheduler, "update_simulation_plot", record("simulate"))
+    monkeypatch.setattr(scheduler, "zoom_subplots_to_peaks", record("zoom"))
+    monkeypatch.setattr(scheduler, "fit_axes", record("fit"))
+    return calls
+
+
+def test_requests_coalesce_into_one_run_per_frame(monkeypatch):
+    calls = _count(monkeypatch)
+    ui = _ui(["H1"])
+
+    simulation = SimulationScheduler()
+    assert not simulation.run_pending(ui)
+    for k in range(20):
+        simulation.request(zoom=k == 3)
+
+    assert simulation.run_pending(ui)
+    assert not simulation.run_pending(ui)
+    assert [len(calls[name]) for name in ("simulate", "zoom", "fit")] == [1, 1, 0]
+    assert (simulation.requests, simulation.runs) == (20, 1)
+
+    simulation.request(fit=True)
+    assert simulation.run_pending(ui)
+    assert [len(calls[name]) for name in ("simulate", "zoom", "fit")] == [2, 1, 1]
+
+
+def test_runs_simulate_the_latest_state(monkeypatch):
+    calls = _count(monkeypatch)
+    ui = _ui(["H1"])
+
+    simulation = SimulationScheduler()
+    simulation.request()
+    ui.current_spin.half_height_width = [2.0]
+    simulation.request()
+    simulation.run_pending(ui)
+
+    assert calls["simulate"][0][3] == [2.0]
+
+
+def test_requests_without_a_spin_are_dropped(monkeypatch):
+    calls = _count(monkeypatch)
+
+    simulation = SimulationScheduler()
+    simulation.request(zoom=True)
+
+    assert not simulation.run_pending(_ui([]))
+    assert not simulation.pending and not simulation.zoom
+    assert calls["simulate"] == [] and simulation.runs == 0
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from solventspinsim.simulate.simulate import (
+    FFT_MIN_WIDTH_SAMPLES,
+    peak_arrays,
+    simulate_lorentzians,
+    simulate_lorentzians_batched,
+    simulate_lorentzians_fft,
+    simulate_lorentzians_windowed,
+    simulate_peaklist,
+)
+from solventspinsim.table import PeakTable
+
+
+def _peaks(count: int, seed: int = 0) -> PeakTable:
+    rng = np.random.default_rng(seed)
+    return PeakTable(
+        rng.uniform(-50.0, 1050.0, count),
+        rng.uniform(0.05, 3.0, count),
+        rng.integers(0, 4, count),
+    ).sorted()
+
+
+@pytest.mark.parametrize("memory_budget", [1, 8 * 1000, 1024 * 1024])
+def test_batched_matches_the_peak_loop_exactly(memory_budget: int):
+    x = np.linspace(1000.0, 0.0, 1000)
+    table = _peaks(300)
+    widths = [0.5, 1.0, 0.0, 2.5]
+
+    expected = simulate_lorentzians(x, table, widths)
+    centers, intensities, hhw = peak_arrays(table, widths)
+    batched = simulate_lorentzians_batched(
+        x, centers, intensities, hhw, memory_budget
+    )
+
+    np.testing.assert_array_equal(batched, expected)
+
+
+def test_simulate_peaklist_batched_matches_loop_exactly():
+    peaks = _peaks(200).to_peaks()
+    loop = simulate_peaklist(peaks, 2000, 1.5, method="loop")
+
+    np.testing.assert_array_equal(simulate_peaklist(peaks, 2000, 1.5), loop)
+    np.testing.assert_array_equal(simulate_peaklist(peaks[::-1], 2000, 1.5), loop)
+
+
+@pytest.mark.parametrize("max_error", [1e-2, 1e-4, 1e-6])
+@pytest.mark.parametrize("descending", [False, True])
+def test_windowed_error_stays_below_max_error(max_error: float, descending: bool):
+    x = np.linspace(0.0, 1000.0, 20000)
+    if descending:
+        x = x[::-1]
+    table = _peaks(500, seed=1)
+    centers, intensities, widths = peak_arrays(table, [0.5, 1.0, 3.0, 8.0])
+
+    expected = simulate_lorentzians_batched(x, centers, intensities, widths)
+    windowed = simulate_lorentzians_windowed(
+        x, centers, intensities, widths, max_error
+    )
+
+    assert np.abs(windowed - expected).max() <= max_error
+
+
+def test_windowed_rejects_non_positive_error():
+    with pytest.raises(ValueError):
+        simulate_lorentzians_windowed(
+            np.linspace(0.0, 1.0, 10), np.zeros(1), np.ones(1), np.ones(1), 0.0
+        )
+
+
+@pytest.mark.parametrize("samples", [8.0, FFT_MIN_WIDTH_SAMPLES])
+def test_fft_error_is_bounded_by_the_width_in_samples(samples: float):
+    x = np.linspace(0.0, 1000.0, 65536)
+    step = x[1] - x[0]
+    hhw = samples * step
+    centers = 500.0 + np.linspace(0.0, 1.0, 21) * step
+    for center in centers:
+        arguments = (x, np.array([center]), np.ones(1), np.full(1, hhw))
+        expected = simulate_lorentzians_batched(*arguments)
+        binned = simulate_lorentzians_fft(*arguments, min_width_samples=samples)
+
+        height = 0.5 / hhw
+        assert np.abs(binned - expected).max() <= height / samples**2
+
+
+def test_fft_evaluates_narrow_peaks_directly():
+    x = np.linspace(0.0, 100.0, 1001)
+    centers, intensities = np.array([30.0, 60.05]), np.array([1.0, 2.0])
+    widths = np.full(2, 0.5)
+
+    expected = simulate_lorentzians_batched(x, centers, intensities, widths)
+    simulated = simulate_lorentzians_fft(x, centers, intensities, widths)
+
+    np.testing.assert_allclose(simulated, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_simulate_peaklist_fft_matches_batched():
+    peaks = [(100.0, 1.0, 0), (112.0, 0.5, 1), (180.0, 2.0, 0)]
+    batched = simulate_peaklist(peaks, 4000, [5.0, 8.0], (0.0, 300.0))
+    fft = simulate_peaklist(peaks, 4000, [5.0, 8.0], (0.0, 300.0), "fft")
+
+    np.testing.assert_array_equal(fft[0], batched[0])
+    # Every peak is binned here, each erring by at most its height / samples^2
+    heights = np.array([1.0 / 5.0, 0.5 / 8.0, 2.0 / 5.0]) / 2
+    assert np.abs(fft[1] - batched[1]).max() <= heights.sum() / FFT_MIN_WIDTH_SAMPLES**2
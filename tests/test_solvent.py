@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.solvent import SolventLineshape, SolventModel
+from solventspinsim.simulate.simulate import lorentz
+
+
+def test_solvent_peak_is_added_in_place_on_the_region_axis():
+    full_x = np.linspace(800.0, 400.0, 4000)
+    region = full_x[1000:2000]
+    simulation = np.ones(len(region))
+
+    result = SolventModel().add(region, (470.0, 5.0, 3.0), simulation)
+
+    assert result is simulation
+    expected = 1.0 + lorentz(full_x, 470.0, 5.0, 3.0)[1000:2000]
+    np.testing.assert_allclose(simulation, expected, rtol=1e-14)
+
+
+def test_broadening_widens_the_solvent_peak():
+    x = np.linspace(500.0, 440.0, 600)
+    simulation = SolventModel(broadening=1.5).add(x, (470.0, 5.0, 3.0), np.zeros(600))
+
+    np.testing.assert_allclose(simulation, lorentz(x, 470.0, 5.0, 4.5), rtol=1e-14)
+
+
+def test_solvent_gradient_matches_finite_differences():
+    model = SolventModel()
+    x = np.linspace(500.0, 440.0, 600)
+    residual = np.random.default_rng(0).normal(size=600)
+    water = np.array([470.0, 5.0, 3.0])
+
+    step = 1e-6
+    expected = np.empty(3)
+    for k in range(3):
+        shift = np.zeros(3)
+        shift[k] = step
+        forward = model.add(x, water + shift, np.zeros(600))
+        backward = model.add(x, water - shift, np.zeros(600))
+        expected[k] = np.dot(residual, forward - backward) / (2 * step)
+
+    np.testing.assert_allclose(
+        model.gradient(x, water, residual), expected, rtol=1e-6, atol=1e-9
+    )
+
+
+def test_unknown_lineshapes_are_rejected():
+    with pytest.raises(ValueError, match="Unknown solvent lineshape"):
+        SolventModel("gaussian")
+    with pytest.raises(TypeError):
+        SolventLineshape()
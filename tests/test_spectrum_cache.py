@@ -0,0 +1,64 @@
+import numpy as np
+
+from solventspinsim.simulate import SpectrumCache
+from solventspinsim.simulate.simulate import simulate_peaklist
+from solventspinsim.spin import Spin
+
+
+def _spin() -> Spin:
+    couplings = np.zeros((4, 4))
+    couplings[0, 1] = couplings[1, 0] = 7.0
+    couplings[2, 3] = couplings[3, 2] = 3.0
+    return Spin(
+        ["H1", "H2", "H3", "H4"],
+        [1.0, 1.2, 2.0, 2.3],
+        couplings,
+        [1.0, 1.2, 0.8, 1.5],
+        500.0,
+    )
+
+
+def _simulate(cache: SpectrumCache, spin: Spin) -> tuple[np.ndarray, np.ndarray]:
+    arguments = (spin.peaklist(), 4000, spin.half_height_width, (300.0, 1300.0))
+    return cache.simulate(*arguments), simulate_peaklist(*arguments)
+
+
+def test_edits_only_recompute_the_nuclei_they_move():
+    cache, spin = SpectrumCache(), _spin()
+    cached, expected = _simulate(cache, spin)
+    assert cache.recomputed == 4
+    np.testing.assert_allclose(cached, expected, rtol=1e-12, atol=1e-12)
+
+    spin.half_height_width = [1.0, 1.2, 0.8, 2.5]
+    cached, expected = _simulate(cache, spin)
+    assert cache.recomputed == 1
+    np.testing.assert_allclose(cached, expected, rtol=1e-9, atol=1e-12)
+
+    # A coupling moves the lines of both nuclei it joins
+    spin._couplings[2, 3] = spin._couplings[3, 2] = 5.0
+    cached, expected = _simulate(cache, spin)
+    assert cache.recomputed == 2
+    np.testing.assert_allclose(cached, expected, rtol=1e-9, atol=1e-12)
+
+    _simulate(cache, spin)
+    assert cache.recomputed == 0
+
+
+def test_resummed_total_stays_exact():
+    cache, spin = SpectrumCache(resum_interval=3), _spin()
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        spin.intensities = rng.uniform(0.5, 2.0, 4).tolist()
+        cached, expected = _simulate(cache, spin)
+        np.testing.assert_allclose(cached, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_changing_the_axis_resets_the_components():
+    cache, spin = SpectrumCache(), _spin()
+    _simulate(cache, spin)
+
+    cached = cache.simulate(spin.peaklist(), 2000, spin.half_height_width)
+    expected = simulate_peaklist(spin.peaklist(), 2000, spin.half_height_width)
+
+    assert cache.recomputed == 4
+    np.testing.assert_allclose(cached, expected, rtol=1e-12, atol=1e-12)
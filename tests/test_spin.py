@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from solventspinsim.spin import Spin
+
+
+def _spin(equivalent_groups: list[list[int]] | str | None = None) -> Spin:
+    couplings = np.array(
+        [
+            [0.0, 0.0, 7.0, 2.0],
+            [0.0, 0.0, 7.0, 2.0],
+            [7.0, 7.0, 0.0, 0.0],
+            [2.0, 2.0, 0.0, 0.0],
+        ]
+    )
+    return Spin(
+        ["H1", "H2", "H3", "H4"],
+        [1.0, 1.0, 1.2, 1.5],
+        couplings,
+        [1.0, 1.0, 1.5, 0.8],
+        500.0,
+        equivalent_groups=equivalent_groups,
+    )
+
+
+def test_equivalence_groups_default_to_single_nuclei():
+    assert _spin().equivalent_groups == [[0], [1], [2], [3]]
+
+
+def test_auto_groups_follow_in_place_edits():
+    spin = _spin("auto")
+    assert spin.equivalent_groups == [[0, 1], [2], [3]]
+
+    spin._couplings[0, 3] = spin._couplings[3, 0] = 3.0
+    assert spin.equivalent_groups == [[0], [1], [2], [3]]
+
+
+def test_explicit_groups_are_completed_with_single_nuclei():
+    assert _spin([[1, 0]]).equivalent_groups == [[0, 1], [2], [3]]
+
+
+@pytest.mark.parametrize(
+    "groups, error",
+    [("all", ValueError), ([[0, 4]], ValueError), ([[0, 1], [1]], ValueError)],
+)
+def test_invalid_groups_are_rejected(groups, error):
+    with pytest.raises(error):
+        _spin(groups)
+
+
+def test_composite_peaklist_matches_the_full_system():
+    full = _spin().peaklist().sorted()
+    composite = _spin("auto").peaklist().sorted()
+
+    np.testing.assert_allclose(composite.freq, full.freq)
+    np.testing.assert_allclose(composite.intensity, full.intensity)
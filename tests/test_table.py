@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from solventspinsim.table import PeakTable
+
+
+def test_peaks_round_trip_through_the_table():
+    peaks = [(120.5, 0.25, 1), (80.0, 1.0, 0), (120.5, 0.125, 0)]
+    table = PeakTable.from_peaks(peaks)
+
+    assert len(table) == 3
+    assert table.to_peaks() == peaks
+    assert list(table) == peaks
+    assert table[1] == peaks[1]
+    assert table.sorted().to_peaks() == sorted(peaks)
+
+
+def test_from_peaks_copies_tables():
+    table = PeakTable([1.0, 2.0], [1.0, 1.0], [0, 1])
+    converted = PeakTable.from_peaks(table)
+    converted.intensity[0] = 5.0
+    converted.nucleus[1] = 3
+
+    np.testing.assert_array_equal(table.intensity, [1.0, 1.0])
+    np.testing.assert_array_equal(table.nucleus, [0, 1])
+
+
+def test_concatenate_keeps_row_order():
+    first = PeakTable([1.0], [0.5], [0])
+    second = PeakTable([3.0, 2.0], [1.0, 2.0], [1, 2])
+
+    table = PeakTable.concatenate([first, second])
+
+    assert table.to_peaks() == [(1.0, 0.5, 0), (3.0, 1.0, 1), (2.0, 2.0, 2)]
+    assert len(PeakTable.concatenate([])) == 0
+
+
+def test_columns_must_have_equal_length():
+    with pytest.raises(ValueError):
+        PeakTable([1.0, 2.0], [1.0], [0, 1])
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize import telemetry as telemetry_module
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.optimize.telemetry import Telemetry
+from solventspinsim.spin import Spin
+
+
+def _objective() -> tuple[QuadrantObjective, np.ndarray]:
+    spin = Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    return QuadrantObjective(spin, packer, x, np.zeros_like(x)), params
+
+
+def test_snapshots_are_published_at_most_rate_times_per_second(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(telemetry_module, "perf_counter", lambda: now[0])
+    snapshots = []
+    telemetry = Telemetry(10.0, [snapshots.append])
+    objective, params = _objective()
+
+    telemetry.begin(objective)
+    for time in np.arange(0.0, 1.0, 0.01):
+        now[0] = time
+        telemetry.record(params, 1.0)
+    telemetry.end()
+
+    assert telemetry.evaluations == 100
+    # Ten throttled snapshots and the final one of the region
+    assert telemetry.published == len(snapshots) == 11
+
+
+def test_snapshots_hold_the_best_parameters_so_far(monkeypatch):
+    monkeypatch.setattr(telemetry_module, "perf_counter", lambda: 0.0)
+    snapshots = []
+    telemetry = Telemetry(10.0, [snapshots.append])
+    objective, params = _objective()
+
+    telemetry.begin(objective)
+    telemetry.record(params, 2.0)
+    better = params.copy()
+    better[objective.packer.couplings] = 6.0
+    telemetry.record(better, 1.0)
+    telemetry.record(params * 2, 3.0)
+    telemetry.end()
+
+    snapshot = snapshots[-1]
+    assert snapshot.cost == 1.0
+    assert snapshot.evaluations == 3
+    np.testing.assert_array_equal(snapshot.couplings, [[0.0, 6.0], [6.0, 0.0]])
+    np.testing.assert_allclose(snapshot.simulation, objective.simulate(better))
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        Telemetry(0.0)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.optimize.optimize import section_optimization
+from solventspinsim.optimize.window import window_clusters
+from solventspinsim.spin import Spin
+
+
+def _spin(frequencies: list[float]) -> Spin:
+    return Spin(
+        ["H1", "H2"],
+        frequencies,
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+
+
+def test_separated_multiplets_get_their_own_windows():
+    spin = _spin([1.0, 1.2])
+    packer = ParameterPacker(spin)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+
+    clusters = window_clusters(packer, spin._nuclei_frequencies, params)
+
+    assert [groups.tolist() for groups, _, _ in clusters] == [[0], [1]]
+    assert not any(water for _, water, _ in clusters)
+    # Multiplet half-span of 3.5 Hz plus 10 half-height widths
+    np.testing.assert_allclose(clusters[0][2], (500.0 - 13.5, 500.0 + 13.5))
+
+
+def test_overlapping_multiplets_and_water_share_a_window():
+    spin = _spin([1.0, 1.01])
+    packer = ParameterPacker(spin, simulate_water=True)
+    params = packer.pack(
+        spin._couplings, [1.0, 1.0], spin._half_height_width, (520.0, 1.0, 2.0)
+    )
+
+    clusters = window_clusters(packer, spin._nuclei_frequencies, params, (515, 525))
+
+    assert len(clusters) == 1
+    assert clusters[0][0].tolist() == [0, 1]
+    assert clusters[0][1]
+    with pytest.raises(ValueError):
+        window_clusters(packer, spin._nuclei_frequencies, params)
+
+
+def test_window_decomposition_recovers_the_couplings():
+    spin = _spin([1.0, 1.2])
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    target = params.copy()
+    target[packer.couplings] = 6.5
+    target[packer.intensities] = [1.5, 0.8]
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target)
+    history = []
+
+    fitted = section_optimization(
+        np.vstack((x, y)),
+        spin,
+        packer,
+        params,
+        (545.0, 555.0),
+        decomposition="windows",
+        history=history,
+    )
+
+    np.testing.assert_allclose(fitted, target, atol=1e-3)
+    # Each window fit varies its group's intensity, width and the shared coupling
+    assert all(len(result.x) == 3 for result in history)
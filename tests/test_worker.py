@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from solventspinsim.optimize.helper import ParameterPacker
+from solventspinsim.optimize.objective import QuadrantObjective
+from solventspinsim.optimize.optimize import section_optimization
+from solventspinsim.optimize.telemetry import Telemetry
+from solventspinsim.optimize.worker import OptimizationCancelled, OptimizationWorker
+from solventspinsim.spin import Spin
+
+
+def _fit() -> tuple[np.ndarray, Spin, ParameterPacker, np.ndarray]:
+    spin = Spin(
+        ["H1", "H2"],
+        [1.0, 1.2],
+        np.array([[0.0, 7.0], [7.0, 0.0]]),
+        [1.0, 1.0],
+        500.0,
+    )
+    packer = ParameterPacker(spin)
+    x = np.linspace(620.0, 480.0, 600)
+    params = packer.pack(spin._couplings, [1.0, 1.0], spin._half_height_width)
+    target = params.copy()
+    target[packer.couplings] = 6.5
+    y = QuadrantObjective(spin, packer, x, np.zeros_like(x)).simulate(target)
+    return np.vstack((x, y)), spin, packer, params
+
+
+def _section(telemetry: Telemetry, workers: int = 1) -> np.ndarray:
+    nmr_array, spin, packer, params = _fit()
+    return section_optimization(
+        nmr_array,
+        spin,
+        packer,
+        params,
+        (545.0, 555.0),
+        workers=workers,
+        telemetry=telemetry,
+    )
+
+
+def test_worker_posts_progress_and_result():
+    worker = OptimizationWorker(_section, telemetry=Telemetry(1e6))
+    worker.start()
+    worker.join(60.0)
+
+    messages = worker.drain()
+    kinds = [kind for kind, _ in messages]
+    assert not worker.running
+    assert kinds[-1] == "done"
+    assert "progress" in kinds
+    assert isinstance(messages[-1][1], np.ndarray)
+
+
+def test_cancelled_worker_stops_at_the_next_snapshot():
+    worker = OptimizationWorker(_section, telemetry=Telemetry(1e6))
+    worker.cancel()
+    worker.start()
+    worker.join(60.0)
+
+    assert worker.drain() == [("cancelled", None)]
+
+
+def test_parallel_quadrants_report_to_telemetry():
+    snapshots = []
+    _section(Telemetry(1e6, [snapshots.append]), workers=2)
+
+    # Every region fitted in a worker process is recorded as one evaluation
+    assert {snapshot.evaluations for snapshot in snapshots} == {1, 2, 3, 4}
+
+
+def test_parallel_quadrants_stop_when_telemetry_raises():
+    def cancel(snapshot):
+        raise OptimizationCancelled()
+
+    with pytest.raises(OptimizationCancelled):
+        _section(Telemetry(1e6, [cancel]), workers=2)